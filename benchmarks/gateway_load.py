@@ -0,0 +1,214 @@
+"""Load test for the WebSocket gateway against the local mock Live server.
+
+Run from the repository root:
+
+    python -m benchmarks.gateway_load --clients 1 10 50 --duration 20
+    python -m benchmarks.gateway_load --url ws://127.0.0.1:8765 --clients 20
+
+Each simulated client streams microphone audio in real time, alternating
+silence and a few seconds of speech; the gateway's voice activity detection ends
+each turn after the speech.
+Latency is measured from the last speech chunk to the first response audio, so
+it includes VAD_TRAILING_SILENCE_MS and the mock's think time.
+
+Without ``--url`` a gateway is started in a child process for every client
+count. Its CPU time gives sessions per core: concurrent clients divided by the
+cores the gateway kept busy.
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import resource
+import signal
+import subprocess
+import sys
+import time
+import numpy as np
+from websockets.asyncio.client import connect
+from websockets.exceptions import ConnectionClosed, InvalidStatus
+from benchmarks.null_devices import synthetic_pcm
+from src.config import SEND_SAMPLE_RATE, CHUNK_SIZE
+
+
+class ClientStats:
+    def __init__(self):
+        self.latencies = []
+        self.turns = 0
+        self.response_bytes = 0
+        self.refused = False
+
+
+async def run_client(url, duration, speech_seconds, silence_seconds, stats):
+    chunk_seconds = CHUNK_SIZE / SEND_SAMPLE_RATE
+    speech = synthetic_pcm(chunk_seconds, SEND_SAMPLE_RATE)
+    silence = bytes(len(speech))
+    silence_chunks = int(silence_seconds / chunk_seconds)
+    cycle = silence_chunks + int(speech_seconds / chunk_seconds)
+    speech_ended_at = None
+
+    async def receive(websocket):
+        nonlocal speech_ended_at
+        async for message in websocket:
+            if isinstance(message, bytes):
+                stats.response_bytes += len(message)
+                if speech_ended_at is not None:
+                    stats.latencies.append(time.perf_counter() - speech_ended_at)
+                    speech_ended_at = None
+            elif json.loads(message).get("type") == "turn_complete":
+                stats.turns += 1
+
+    try:
+        async with connect(url) as websocket:
+            receiver = asyncio.create_task(receive(websocket))
+            started = time.perf_counter()
+            index = 0
+            try:
+                while time.perf_counter() - started < duration:
+                    # Silence first, so the detector learns the background level
+                    in_speech = index % cycle >= silence_chunks
+                    await websocket.send(speech if in_speech else silence)
+                    if index % cycle == cycle - 1:
+                        speech_ended_at = time.perf_counter()
+                    index += 1
+                    # Pace on an absolute schedule so timing errors do not accumulate
+                    await asyncio.sleep(max(0.0, started + index * chunk_seconds - time.perf_counter()))
+            finally:
+                receiver.cancel()
+                await asyncio.gather(receiver, return_exceptions=True)
+    except InvalidStatus:
+        stats.refused = True
+    except ConnectionClosed as e:
+        stats.refused = e.rcvd is not None and e.rcvd.code == 1013
+
+
+async def run_load(url, clients, duration, speech_seconds, silence_seconds):
+    stats = [ClientStats() for _ in range(clients)]
+    await asyncio.gather(
+        *(run_client(url, duration, speech_seconds, silence_seconds, s) for s in stats)
+    )
+    return stats
+
+
+def summarise(stats, clients, wall_seconds, cpu_seconds):
+    latencies = np.asarray([latency for s in stats for latency in s.latencies]) * 1000.0
+    served = sum(not s.refused for s in stats)
+    result = {
+        "clients": clients,
+        "served": served,
+        "refused": clients - served,
+        "turns": sum(s.turns for s in stats),
+        "response_kib": sum(s.response_bytes for s in stats) / 1024,
+        "p50_ms": float(np.percentile(latencies, 50)) if len(latencies) else None,
+        "p95_ms": float(np.percentile(latencies, 95)) if len(latencies) else None,
+    }
+    if cpu_seconds is not None:
+        cores_busy = cpu_seconds / wall_seconds
+        result["gateway_cpu_percent"] = 100.0 * cores_busy
+        result["sessions_per_core"] = served / cores_busy if cores_busy else None
+    return result
+
+
+def start_gateway(port, first_response_delay):
+    command = [
+        sys.executable, "-m", "benchmarks.gateway_load", "--serve",
+        "--port", str(port), "--first-response-delay", str(first_response_delay),
+    ]
+    return subprocess.Popen(command, stdout=subprocess.PIPE, text=True)
+
+
+def stop_gateway(process):
+    """Stops the child gateway and returns the CPU seconds it used."""
+    before = resource.getrusage(resource.RUSAGE_CHILDREN)
+    process.send_signal(signal.SIGINT)
+    process.wait(timeout=30)
+    after = resource.getrusage(resource.RUSAGE_CHILDREN)
+    return (after.ru_utime - before.ru_utime) + (after.ru_stime - before.ru_stime)
+
+
+def serve_gateway(port, first_response_delay, max_clients):
+    """Child process: runs the gateway on the mock Live server until interrupted."""
+    from src.handlers.gateway_handler import GatewayHandler
+    from src.utils.logger import setup_logger
+    from src.utils.session_backend import MockLiveServer
+
+    logger = setup_logger("GatewayLoad", log_to_file=False, level="WARNING")
+    handler = GatewayHandler(
+        logger,
+        backend=MockLiveServer(first_response_delay=first_response_delay),
+        port=port,
+        max_clients=max_clients,
+    )
+
+    async def main():
+        task = asyncio.create_task(handler.run())
+        await handler.ready.wait()
+        print("ready", flush=True)
+        await task
+
+    try:
+        asyncio.run(main())
+    except KeyboardInterrupt:
+        pass
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--clients", type=int, nargs="*", default=[1, 10, 50])
+    parser.add_argument("--duration", type=float, default=15.0, help="Seconds each client streams")
+    parser.add_argument("--speech-seconds", type=float, default=2.0)
+    parser.add_argument("--silence-seconds", type=float, default=2.0)
+    parser.add_argument("--url", help="Load an already running gateway instead of starting one")
+    parser.add_argument("--port", type=int, default=8799)
+    parser.add_argument("--first-response-delay", type=float, default=0.3, help="Mock think time in seconds")
+    parser.add_argument("--max-clients", type=int, default=10000, help="Connection limit of the started gateway")
+    parser.add_argument("--output", help="Write results as JSON to this path")
+    parser.add_argument("--serve", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.serve:
+        serve_gateway(args.port, args.first_response_delay, args.max_clients)
+        return 0
+
+    results = []
+    for clients in args.clients:
+        process = None
+        url = args.url
+        if url is None:
+            process = start_gateway(args.port, args.first_response_delay)
+            process.stdout.readline()  # Wait until it is listening
+            url = f"ws://127.0.0.1:{args.port}"
+        started = time.perf_counter()
+        stats = asyncio.run(
+            run_load(url, clients, args.duration, args.speech_seconds, args.silence_seconds)
+        )
+        wall_seconds = time.perf_counter() - started
+        cpu_seconds = stop_gateway(process) if process else None
+        r = summarise(stats, clients, wall_seconds, cpu_seconds)
+        results.append(r)
+        line = (
+            f"{clients:5} clients  served {r['served']:5}  turns {r['turns']:6}  "
+            f"latency p50 {r['p50_ms'] or 0:7.1f} ms  p95 {r['p95_ms'] or 0:7.1f} ms"
+        )
+        if "sessions_per_core" in r:
+            line += f"  gateway CPU {r['gateway_cpu_percent']:5.1f}%  sessions/core {r['sessions_per_core'] or 0:8.1f}"
+        print(line)
+
+    if args.output:
+        report = {
+            "meta": {
+                "python": platform.python_version(),
+                "platform": platform.platform(),
+                "cpus": os.cpu_count(),
+                "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            },
+            "results": results,
+        }
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
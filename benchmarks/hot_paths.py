@@ -0,0 +1,355 @@
+"""Headless microbenchmarks for the capture, encode, queue and playback hot paths.
+
+Run from the repository root:
+
+    python -m benchmarks.hot_paths --output results.json
+    python -m benchmarks.hot_paths --baseline results.json --threshold 15
+
+Every case reports throughput, per-item latency percentiles and the peak bytes
+allocated per operation. With ``--baseline`` the run fails (exit status 1) when
+any metric is worse than the baseline by more than ``--threshold`` percent.
+"""
+import argparse
+import asyncio
+import json
+import platform
+import sys
+import time
+import tracemalloc
+from unittest import mock
+import numpy as np
+import pyaudio
+from benchmarks.null_devices import (
+    NullPyAudio,
+    NullSession,
+    SyntheticCapture,
+    synthetic_pcm,
+    synthetic_screen,
+)
+from src.config import RECEIVE_SAMPLE_RATE, CHUNK_SIZE
+from src.utils.media import MediaMessage, audio_message, media_stats
+from src.utils.playback import PlaybackEngine
+from src.utils.resample import StreamingResampler
+from src.utils.screen_capture import ScreenCaptureEngine
+from src.utils.session_backend import MockLiveServer
+
+# Direction of each metric: +1 when higher is better, -1 when lower is better
+METRICS = {
+    "ops_per_sec": 1,
+    "p50_us": -1,
+    "p95_us": -1,
+    "alloc_bytes_per_op": -1,
+}
+
+CASES = {}
+
+
+def case(name, ops):
+    def register(func):
+        CASES[name] = (func, ops)
+        return func
+
+    return register
+
+
+def make_handler(handler_cls, *args):
+    """Builds a handler on null audio devices and a mock session backend."""
+    with mock.patch.object(pyaudio, "PyAudio", NullPyAudio):
+        return handler_cls(None, *args, backend=MockLiveServer())
+
+
+def _summarise(durations_ns, total_seconds):
+    durations = np.asarray(durations_ns, dtype=np.float64) / 1000.0
+    return {
+        "ops_per_sec": len(durations) / total_seconds if total_seconds else 0.0,
+        "p50_us": float(np.percentile(durations, 50)),
+        "p95_us": float(np.percentile(durations, 95)),
+    }
+
+
+def measure_sync(op, ops):
+    """Times ``op()`` per call, then measures peak allocation per call in a second pass."""
+    op()  # Warm up caches and lazily allocated buffers
+    durations = []
+    started = time.perf_counter()
+    for _ in range(ops):
+        t0 = time.perf_counter_ns()
+        op()
+        durations.append(time.perf_counter_ns() - t0)
+    result = _summarise(durations, time.perf_counter() - started)
+
+    alloc_ops = max(1, ops // 4)
+    tracemalloc.start()
+    peak_total = 0
+    for _ in range(alloc_ops):
+        tracemalloc.reset_peak()
+        baseline = tracemalloc.get_traced_memory()[0]
+        op()
+        peak_total += tracemalloc.get_traced_memory()[1] - baseline
+    tracemalloc.stop()
+    result["alloc_bytes_per_op"] = peak_total / alloc_ops
+    return result
+
+
+def measure_async(run_batch, ops, alloc_batch=500):
+    """``run_batch(n)`` processes ``n`` items and returns per-item completion times (ns).
+
+    Allocation is the peak traced memory of a fixed-size batch divided by its
+    size, so it is comparable between runs with a different ``--scale``.
+    """
+    asyncio.run(run_batch(max(1, ops // 10)))  # Warm up
+    stamps = np.asarray(asyncio.run(run_batch(ops)), dtype=np.int64)
+    result = _summarise(np.diff(stamps), (stamps[-1] - stamps[0]) / 1e9)
+
+    tracemalloc.start()
+    asyncio.run(run_batch(alloc_batch))
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    result["alloc_bytes_per_op"] = peak / alloc_batch
+    return result
+
+
+@case("camera_get_frame", ops=200)
+def bench_camera_get_frame(ops):
+    from src.handlers.camera_handler import CameraHandler
+
+    handler = make_handler(CameraHandler)
+    capture = SyntheticCapture()
+    return measure_sync(lambda: handler._get_frame(capture, handler.encoder, 1024, 75), ops)
+
+
+@case("screen_change_detect", ops=500)
+def bench_screen_change_detect(ops):
+    engine = ScreenCaptureEngine()
+    screens = synthetic_screen()
+    index = iter(range(sys.maxsize))
+    return measure_sync(lambda: engine._has_changed(screens[next(index) % len(screens)]), ops)
+
+
+@case("screen_encode", ops=100)
+def bench_screen_encode(ops):
+    engine = ScreenCaptureEngine()
+    screen = synthetic_screen(frames=1)[0]
+    return measure_sync(lambda: engine._encode(screen), ops)
+
+
+@case("multi_source_encode", ops=50)
+def bench_multi_source_encode(ops):
+    from concurrent.futures import ThreadPoolExecutor
+    from src.utils.frame_pool import FrameEncodePool
+
+    # One op is a camera frame and a screen frame encoded at the same time, as in "multi" mode
+    pool = FrameEncodePool()
+    pool.start()
+    camera, screen = pool.encoder("camera"), pool.encoder("screen")
+    camera_frame = SyntheticCapture().read()[1]
+    screen_frame = synthetic_screen(frames=1)[0]
+    try:
+        with ThreadPoolExecutor(2) as threads:
+
+            def op():
+                encodes = [
+                    threads.submit(camera.encode, camera_frame, 1024, 75),
+                    threads.submit(screen.encode, screen_frame, 1024, 75),
+                ]
+                for encode in encodes:
+                    encode.result()
+
+            return measure_sync(op, ops)
+    finally:
+        pool.close()
+
+
+@case("send_realtime_drain", ops=5000)
+def bench_send_realtime(ops):
+    from src.handlers.camera_handler import CameraHandler
+
+    chunk = synthetic_pcm(CHUNK_SIZE / 16000, 16000)
+    # Encoders hand out a view of their output buffer, as the OpenCV backend does
+    frame = MediaMessage("image/jpeg", memoryview(bytearray(45000)))
+
+    async def run_batch(n):
+        handler = make_handler(CameraHandler)
+        for i in range(n):
+            if i % 10 == 0:
+                handler.send_scheduler.put_video(frame)  # Supersedes the previous frame
+            else:
+                handler.send_scheduler.put_audio(audio_message(chunk))
+        expected = handler.send_scheduler.qsize()
+        stamps = []
+        done = asyncio.Event()
+
+        def on_send():
+            stamps.append(time.perf_counter_ns())
+            if len(stamps) == expected:
+                done.set()
+
+        task = asyncio.create_task(handler.send_realtime(NullSession(on_send=on_send)))
+        await done.wait()
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+        return stamps
+
+    media_stats.reset()
+    result = measure_async(run_batch, ops)
+    result["payload_copies_per_msg"] = media_stats.copies / media_stats.messages
+    return result
+
+
+@case("receive_audio_queue", ops=5000)
+def bench_receive_audio(ops):
+    from src.handlers.audio_handler import AudioOnlyHandler
+
+    chunk = synthetic_pcm(0.04, RECEIVE_SAMPLE_RATE)
+    chunks_per_turn = 50
+
+    async def run_batch(n):
+        handler = make_handler(AudioOnlyHandler)
+        stamps = []
+        done = asyncio.Event()
+        turns = max(1, n // chunks_per_turn)
+
+        class CountingSession(NullSession):
+            def __init__(self):
+                super().__init__([chunk] * chunks_per_turn)
+                self.turns = 0
+
+            async def receive(self):
+                if self.turns == turns:
+                    done.set()
+                    await asyncio.Event().wait()
+                self.turns += 1
+                async for response in super().receive():
+                    stamps.append(time.perf_counter_ns())
+                    yield response
+                await asyncio.sleep(0)
+
+        task = asyncio.create_task(handler.receive_audio(CountingSession()))
+        await done.wait()
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+        return stamps
+
+    return measure_async(run_batch, ops)
+
+
+@case("play_audio_ring", ops=2000)
+def bench_play_audio(ops):
+    chunk = synthetic_pcm(0.04, RECEIVE_SAMPLE_RATE)
+    frames_per_chunk = len(chunk) // 2
+
+    async def run_batch(n):
+        engine = PlaybackEngine(NullPyAudio(), jitter_target_ms=0)
+        engine.open()
+        stamps = []
+        for _ in range(n):
+            await engine.write(chunk)
+            # Drain the chunk the way PortAudio would, one device buffer at a time
+            for _ in range(0, frames_per_chunk, engine.frames_per_buffer):
+                engine._callback(None, engine.frames_per_buffer, None, 0)
+            stamps.append(time.perf_counter_ns())
+        engine.close()
+        return stamps
+
+    return measure_async(run_batch, ops)
+
+
+def _with_budget(result, chunk_seconds):
+    """Adds the p95 cost as a percentage of the audio duration each operation converts."""
+    result["p95_budget_percent"] = result["p95_us"] / (chunk_seconds * 1e6) * 100.0
+    return result
+
+
+@case("resample_mic_capture", ops=2000)
+def bench_resample_mic(ops):
+    # A 48 kHz stereo USB microphone read in CHUNK_SIZE-sized blocks, down to 16 kHz mono
+    chunk_seconds = CHUNK_SIZE / 16000
+    stereo = np.repeat(np.frombuffer(synthetic_pcm(chunk_seconds, 48000), dtype=np.int16), 2).tobytes()
+    resampler = StreamingResampler(48000, 16000, 2, 1)
+    return _with_budget(measure_sync(lambda: resampler.process(stereo).tobytes(), ops), chunk_seconds)
+
+
+@case("resample_playback_buffer", ops=5000)
+def bench_resample_playback(ops):
+    # One 20 ms device buffer of a 44.1 kHz stereo output, converted from 24 kHz mono
+    samples = np.frombuffer(synthetic_pcm(1.0, RECEIVE_SAMPLE_RATE), dtype=np.int16)
+    resampler = StreamingResampler(RECEIVE_SAMPLE_RATE, 44100, 1, 2)
+    frames = 882
+    position = 0
+
+    def op():
+        nonlocal position
+        needed = resampler.input_frames_for(frames)
+        if position + needed > len(samples):
+            position = 0
+        resampler.process(samples[position : position + needed], max_frames=frames)
+        position += needed
+
+    return _with_budget(measure_sync(op, ops), frames / 44100)
+
+
+def compare(results, baseline, threshold):
+    """Returns a list of human-readable regressions beyond ``threshold`` percent."""
+    regressions = []
+    for name, metrics in results.items():
+        reference = baseline.get("results", {}).get(name)
+        if not reference:
+            continue
+        for metric, direction in METRICS.items():
+            old, new = reference.get(metric), metrics.get(metric)
+            if not old or new is None:
+                continue
+            change = 100.0 * (new - old) / old * direction
+            if change < -threshold:
+                regressions.append(f"{name}.{metric}: {old:.1f} -> {new:.1f} ({-change:.1f}% worse)")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--output", help="Write results as JSON to this path")
+    parser.add_argument("--baseline", help="Compare against results saved by an earlier run")
+    parser.add_argument("--threshold", type=float, default=15.0, help="Allowed regression in percent")
+    parser.add_argument("--only", nargs="*", help="Run only these cases")
+    parser.add_argument("--scale", type=float, default=1.0, help="Multiply the number of operations")
+    args = parser.parse_args(argv)
+
+    results = {}
+    for name, (func, ops) in CASES.items():
+        if args.only and name not in args.only:
+            continue
+        results[name] = func(max(1, int(ops * args.scale)))
+        r = results[name]
+        print(
+            f"{name:22} {r['ops_per_sec']:10.1f} ops/s  p50 {r['p50_us']:9.1f} us  "
+            f"p95 {r['p95_us']:9.1f} us  {r['alloc_bytes_per_op']:10.0f} B/op"
+            + (f"  p95 {r['p95_budget_percent']:.2f}% of audio duration" if "p95_budget_percent" in r else "")
+            + (f"  {r['payload_copies_per_msg']:.3f} payload copies/msg" if "payload_copies_per_msg" in r else "")
+        )
+
+    report = {
+        "meta": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        },
+        "results": results,
+    }
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare(results, json.load(f), args.threshold)
+        if regressions:
+            print("Regressions beyond threshold:")
+            for line in regressions:
+                print(f"  {line}")
+            return 1
+        print(f"No regressions beyond {args.threshold:.0f}%.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
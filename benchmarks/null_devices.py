@@ -0,0 +1,109 @@
+import numpy as np
+from src.utils.session_backend import MockResponse
+
+
+class NullStream:
+    """PyAudio stream that accepts writes and returns silence without touching a device."""
+
+    def __init__(self, frames_per_buffer=1024, **kwargs):
+        self.frames_per_buffer = frames_per_buffer
+        self.callback = kwargs.get("stream_callback")
+
+    def read(self, num_frames, exception_on_overflow=False):
+        return bytes(2 * num_frames)
+
+    def write(self, data):
+        pass
+
+    def start_stream(self):
+        pass
+
+    def stop_stream(self):
+        pass
+
+    def close(self):
+        pass
+
+
+class NullPyAudio:
+    """Drop-in for ``pyaudio.PyAudio`` with one fake input and one fake output device."""
+
+    def __init__(self):
+        self.streams = []
+
+    def get_default_input_device_info(self):
+        return {"index": 0, "defaultSampleRate": 16000.0, "maxInputChannels": 1}
+
+    def get_default_output_device_info(self):
+        return {"index": 0, "defaultSampleRate": 24000.0, "maxOutputChannels": 1}
+
+    def open(self, **kwargs):
+        stream = NullStream(**kwargs)
+        self.streams.append(stream)
+        return stream
+
+    def terminate(self):
+        pass
+
+
+class SyntheticCapture:
+    """Stands in for ``cv2.VideoCapture``, cycling through a few pre-rendered frames."""
+
+    def __init__(self, width=1280, height=720, frames=4):
+        rng = np.random.default_rng(0)
+        gradient = np.linspace(0, 255, width, dtype=np.uint8)
+        self.frames = []
+        for i in range(frames):
+            frame = np.empty((height, width, 3), dtype=np.uint8)
+            frame[...] = gradient[None, :, None]
+            top = (i * 97) % (height // 2)
+            frame[top : top + height // 3, width // 4 : width // 2] = rng.integers(
+                0, 256, (height // 3, width // 4, 3), dtype=np.uint8
+            )
+            self.frames.append(frame)
+        self._index = 0
+
+    def read(self):
+        frame = self.frames[self._index % len(self.frames)]
+        self._index += 1
+        return True, frame
+
+    def release(self):
+        pass
+
+
+def synthetic_screen(width=2560, height=1440, frames=4):
+    """BGRA screenshots with a moving block, like an mss grab viewed as an array."""
+    base = np.full((height, width, 4), 235, dtype=np.uint8)
+    screens = []
+    for i in range(frames):
+        screen = base.copy()
+        left = 100 + i * 200
+        screen[300:700, left : left + 600, :3] = (40 * i) % 256
+        screens.append(screen)
+    return screens
+
+
+def synthetic_pcm(seconds, rate, frequency=220.0):
+    """A sine tone as int16 PCM bytes."""
+    t = np.arange(int(seconds * rate)) / rate
+    return (np.sin(2 * np.pi * frequency * t) * 8000).astype(np.int16).tobytes()
+
+
+class NullSession:
+    """Live session stand-in that swallows sends and yields scripted turns instantly."""
+
+    def __init__(self, turn_chunks=(), on_send=None):
+        self.turn_chunks = list(turn_chunks)
+        self.on_send = on_send
+        self.sent = 0
+
+    async def send(self, input=None, end_of_turn=False):
+        self.sent += 1
+        if self.on_send is not None:
+            self.on_send()
+
+    async def receive(self):
+        for chunk in self.turn_chunks:
+            yield MockResponse(data=chunk)
+        yield MockResponse(turn_complete=True)
@@ -0,0 +1,106 @@
+"""Cold-start cost per input mode: module imports, handler construction and audio device init.
+
+Run from the repository root:
+
+    python -m benchmarks.startup
+    python -m benchmarks.startup --modes text audio --repeats 10 --output startup.json
+
+Each sample runs in a fresh interpreter so imports are measured cold (apart from
+the OS file cache). ``--null-devices`` replaces PyAudio with a null device to
+measure the app's own cost without PortAudio.
+"""
+import argparse
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import time
+
+MODES = ("text", "audio", "camera", "screen", "multi")
+HEAVY_MODULES = ("pyaudio", "cv2", "mss", "PIL", "numpy", "google.genai")
+
+# Runs in the child interpreter; prints one JSON line with timings in milliseconds
+CHILD = """
+import json, sys, time
+started = time.perf_counter()
+from src.handlers.registry import load_handler
+cls = load_handler({mode!r})
+imported = time.perf_counter()
+null_devices = {null_devices!r}
+if null_devices:
+    import pyaudio
+    from benchmarks.null_devices import NullPyAudio
+    pyaudio.PyAudio = NullPyAudio
+from src.utils.session_backend import MockLiveServer
+handler = cls(None, backend=MockLiveServer())
+constructed = time.perf_counter()
+modules = [name for name in {heavy!r} if name in sys.modules]
+handler.pya.get()
+devices = time.perf_counter()
+handler.close()
+print(json.dumps({{
+    "import_ms": 1000 * (imported - started),
+    "init_ms": 1000 * (constructed - imported),
+    "device_init_ms": 1000 * (devices - constructed),
+    "modules": modules,
+}}))
+"""
+
+
+def sample(mode, null_devices):
+    code = CHILD.format(mode=mode, null_devices=null_devices, heavy=HEAVY_MODULES)
+    started = time.perf_counter()
+    out = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    ).stdout
+    wall_ms = 1000 * (time.perf_counter() - started)
+    result = json.loads(out.strip().splitlines()[-1])
+    result["process_ms"] = wall_ms
+    return result
+
+
+def measure(mode, repeats, null_devices):
+    samples = [sample(mode, null_devices) for _ in range(repeats)]
+    result = {
+        key: statistics.median(s[key] for s in samples)
+        for key in ("import_ms", "init_ms", "device_init_ms", "process_ms")
+    }
+    result["modules"] = samples[-1]["modules"]
+    return result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--modes", nargs="*", default=list(MODES), choices=MODES)
+    parser.add_argument("--repeats", type=int, default=5, help="Fresh interpreters per mode (median is reported)")
+    parser.add_argument("--null-devices", action="store_true", help="Use a null PyAudio instead of PortAudio")
+    parser.add_argument("--output", help="Write results as JSON to this path")
+    args = parser.parse_args(argv)
+
+    results = {}
+    for mode in args.modes:
+        r = results[mode] = measure(mode, args.repeats, args.null_devices)
+        print(
+            f"{mode:7} import {r['import_ms']:7.1f} ms  init {r['init_ms']:6.1f} ms  "
+            f"devices {r['device_init_ms']:7.1f} ms  process {r['process_ms']:7.1f} ms  "
+            f"loads: {', '.join(r['modules']) or '-'}"
+        )
+
+    if args.output:
+        report = {
+            "meta": {
+                "python": platform.python_version(),
+                "platform": platform.platform(),
+                "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+                "null_devices": args.null_devices,
+            },
+            "results": results,
+        }
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,16 +1,20 @@
 import sys
 import asyncio
-from src.handlers.audio_handler import AudioOnlyHandler
-from src.handlers.text_handler import TextOnlyHandler
-from src.handlers.camera_handler import CameraHandler
-from src.handlers.screen_handler import ScreenHandler
 from src.config import (
     INPUT_MODE_AUDIO,
     INPUT_MODE_TEXT,
     INPUT_MODE_CAMERA,  
     INPUT_MODE_SCREEN,
+    INPUT_MODE_GATEWAY,
+    INPUT_MODE_MULTI,
+    LIVE_CONFIG,
+    DIAGNOSTICS,
 )
+from src.handlers.registry import create_handler, is_supported
 from src.config import DEFAULT_MONITOR_INDEX 
+from src.utils.metrics import MetricsExporter
+from src.utils.session_backend import create_backend
+from src.utils.session_manager import SessionManager
 
 class GeminiLiveApp:
     def __init__(
@@ -19,8 +23,10 @@ class GeminiLiveApp:
         monitor_index=DEFAULT_MONITOR_INDEX, 
         enable_file_logging=True,
         log_level="INFO",
+        diagnostics=DIAGNOSTICS,
     ):
         self.input_mode = input_mode
+        self.diagnostics = diagnostics
         self.monitor_index = monitor_index 
         self.logger = None
         if enable_file_logging:
@@ -34,21 +40,33 @@ class GeminiLiveApp:
         if self.logger:
             self.logger.info("Gemini Live Application Started.")
 
-        if self.input_mode == INPUT_MODE_AUDIO:
-            self.handler = AudioOnlyHandler(self.logger)
-        elif self.input_mode == INPUT_MODE_TEXT:
-            self.handler = TextOnlyHandler(self.logger)
-        elif self.input_mode == INPUT_MODE_CAMERA:
-            self.handler = CameraHandler(self.logger)
-        elif self.input_mode == INPUT_MODE_SCREEN:
-            self.handler = ScreenHandler(self.logger, self.monitor_index)  # Pass monitor_index
-        else:
+        if not is_supported(self.input_mode):
             if self.logger:
                 self.logger.error(f"Unsupported input mode: {self.input_mode}")
             raise ValueError(f"Unsupported input mode: {self.input_mode}")
+        self.handler = None
 
     async def run(self):
+        background_tasks = []
+        if self.diagnostics:
+            from src.utils.diagnostics import Diagnostics
+
+            # Started first so that every to_thread job is timed by its executor
+            background_tasks.append(asyncio.create_task(Diagnostics(logger=self.logger).run()))
+            await asyncio.sleep(0)
+        background_tasks.append(asyncio.create_task(MetricsExporter(logger=self.logger).run()))
+        # Start the Live handshake first so it overlaps with opening the audio/video devices
+        session_manager = SessionManager(create_backend(), LIVE_CONFIG, logger=self.logger)
+        session_manager.start()
         try:
+            # Imports only the selected mode's modules (OpenCV, mss, ...) off the event loop
+            self.handler = await asyncio.to_thread(
+                create_handler,
+                self.input_mode,
+                self.logger,
+                monitor_index=self.monitor_index,  # Pass monitor_index
+                session_manager=session_manager,
+            )
             await self.handler.run()
         except KeyboardInterrupt:
             if self.logger:
@@ -56,7 +74,12 @@ class GeminiLiveApp:
             else:
                 print("User initiated shutdown.")
         finally:
-            self.handler.close()
+            for task in background_tasks:
+                task.cancel()
+            await asyncio.gather(*background_tasks, return_exceptions=True)
+            await session_manager.close()
+            if self.handler:
+                self.handler.close()
             if self.logger:
                 self.logger.info("Gemini Live Application Exited.")
 
@@ -65,12 +88,14 @@ def main(
     monitor_index=DEFAULT_MONITOR_INDEX,
     enable_file_logging=True,
     log_level="INFO",
+    diagnostics=DIAGNOSTICS,
 ):
     app = GeminiLiveApp(
         input_mode=input_mode,
         monitor_index=monitor_index,
         enable_file_logging=enable_file_logging,
-        log_level=log_level
+        log_level=log_level,
+        diagnostics=diagnostics,
     )
     asyncio.run(app.run())
 
@@ -85,5 +110,11 @@ if __name__ == "__main__":
     # To run camera mode:
     # main(input_mode=INPUT_MODE_CAMERA)
 
+    # To send the camera and the screen together:
+    # main(input_mode=INPUT_MODE_MULTI, monitor_index=DEFAULT_MONITOR_INDEX)
+
+    # To serve many clients over WebSocket:
+    # main(input_mode=INPUT_MODE_GATEWAY)
+
     # To run screen mode with monitor index:
     main(input_mode=INPUT_MODE_SCREEN, monitor_index=DEFAULT_MONITOR_INDEX)
\ No newline at end of file
@@ -1,5 +1,4 @@
 import os
-import pyaudio
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -8,22 +7,151 @@ load_dotenv()
 API_VERSION = "v1alpha"
 MODEL = "models/gemini-2.0-flash-exp"
 
+# Session Backend Configuration
+SESSION_BACKEND = os.getenv("SESSION_BACKEND", "genai")  # "genai" or "mock" (local stand-in, no network)
+MOCK_SCRIPT_PATH = os.getenv("MOCK_SCRIPT_PATH")  # Recorded turns to replay; a test tone when unset
+MOCK_FIRST_RESPONSE_DELAY = 0.3  # Seconds before the mock's first response message of a turn
+MOCK_THROUGHPUT_BYTES_PER_SECOND = 0  # Pacing of mock response audio; 0 means unlimited
+MOCK_AUDIO_SECONDS_PER_TURN = 5.0  # Mic audio after which the mock answers without end_of_turn
+SESSION_RECORD_PATH = os.getenv("SESSION_RECORD_PATH")  # Record received turns here for replay
+SESSION_CAPTURE_PATH = os.getenv("SESSION_CAPTURE_PATH")  # Record all sent and received traffic here (.glrec)
+RECORDING_BUFFER_BYTES = 1 << 20  # Write buffer of the session capture file
+SESSION_STANDBY_COUNT = 1  # Extra sessions kept connected for instant failover
+SESSION_RECONNECT_DELAY = 0.5  # First retry delay after a failed connect; doubles per failure
+SESSION_RECONNECT_MAX_DELAY = 10.0
+SESSION_HEALTHY_SECONDS = 10.0  # A session that lasts this long resets the reconnect delay
+LIVE_CONFIG = {"generation_config": {"response_modalities": ["AUDIO"]}}
+
 # Audio Configuration
-FORMAT = pyaudio.paInt16
+FORMAT = 8  # pyaudio.paInt16, spelled out so importing the config does not load PortAudio
 CHANNELS = 1
 SEND_SAMPLE_RATE = 16000
 RECEIVE_SAMPLE_RATE = 24000
 CHUNK_SIZE = 1024
+AUDIO_SEND_LATENCY_BUDGET = 1.0  # Seconds a mic chunk may wait to be sent before it is dropped
+
+# Playback Configuration
+PLAYBACK_FRAMES_PER_BUFFER = 480  # Device buffer size (20 ms at 24 kHz); bounds flush latency
+PLAYBACK_BUFFER_SECONDS = 10.0  # Capacity of the playback ring buffer
+PLAYBACK_JITTER_TARGET_MS = 100  # Audio buffered before playback starts or resumes
+RESPONSE_AUDIO_BUFFER_SECONDS = 30.0  # Response audio held between receiving and playback (1.4 MB at 24 kHz)
+RESPONSE_AUDIO_HIGH_WATER = 0.9  # Fraction of that buffer at which RESPONSE_AUDIO_POLICY applies
+RESPONSE_AUDIO_LOW_WATER = 0.5  # With "pause", receiving resumes once playback drains to this fraction
+RESPONSE_AUDIO_POLICY = "pause"  # "pause", "drop_oldest" or "drop_newest"
+RESPONSE_AUDIO_READ_MS = 100  # Audio handed to playback per read
+
+# Response Cache Configuration (text mode)
+RESPONSE_CACHE_DIR = os.getenv("RESPONSE_CACHE_DIR")  # Cache answers to repeated prompts here; off when unset
+RESPONSE_CACHE_MAX_BYTES = 256 << 20  # Least recently used answers are evicted beyond this size
+RESPONSE_CACHE_TTL = 24 * 3600.0  # Seconds a cached answer stays valid
+
+# Audio I/O Configuration
+AUDIO_INPUT = os.getenv("AUDIO_INPUT", "pyaudio")  # "pyaudio" or a WAV/raw PCM file used as the microphone
+AUDIO_OUTPUT = os.getenv("AUDIO_OUTPUT", "pyaudio")  # "pyaudio", "null" or a WAV/raw PCM file for responses
+AUDIO_REALTIME = os.getenv("AUDIO_REALTIME", "1") != "0"  # 0 processes file/null audio as fast as possible
+AUDIO_INPUT_TRAILING_SILENCE = 1.0  # Seconds of silence after an input file so its last turn ends
+AUDIO_DEVICE_NATIVE_FORMAT = os.getenv("AUDIO_DEVICE_NATIVE_FORMAT", "1") != "0"  # 0 opens devices at the API rates
+AUDIO_DEVICE_MAX_CHANNELS = 2  # Channels opened on multi-channel devices; mixed down to mono
+RESAMPLE_FILTER_TAPS = 31  # Anti-aliasing filter length used when downsampling
+
+# Voice Activity Detection Configuration (audio mode)
+VAD_FRAME_MS = 20  # Analysis frame length
+VAD_SPEECH_MARGIN_DB = 10.0  # Level above the noise floor that counts as speech
+VAD_MIN_SPEECH_DBFS = -50.0  # Frames quieter than this are never speech
+VAD_NOISE_ADAPT_RATE = 0.05  # How fast the noise floor follows louder backgrounds
+VAD_SEGMENT_MS = 256  # Speech is coalesced into segments of about this length
+VAD_PRE_ROLL_MS = 192  # Silence kept in front of an utterance so its onset is not clipped
+VAD_TRAILING_SILENCE_MS = 700  # Silence after speech that ends the turn
+
+# Full-Duplex / Echo Suppression Configuration
+FULL_DUPLEX = True  # Keep listening while the assistant speaks so the user can interrupt
+ECHO_MAX_DELAY_MS = 300  # Longest speaker-to-microphone delay searched for echo
+ECHO_REFERENCE_SILENCE_DBFS = -60.0  # Playback quieter than this cannot cause echo
+ECHO_SUPPRESSION_GAIN = 0.05  # Gain applied to chunks that are only echo
+BARGE_IN_MIN_DBFS = -40.0  # Residual level (after echo removal) that can be user speech
+BARGE_IN_MARGIN_DB = 6.0  # Residual within this many dB of the echo counts as the user talking
+BARGE_IN_CHUNKS = 2  # Consecutive user-speech chunks needed to interrupt playback
 
 # Logging Configuration
 LOG_FILE_PATH = os.path.join(os.path.dirname(os.path.dirname(__file__)), "src/logs", "app.log")
 DEFAULT_LOG_LEVEL = "INFO"
+LOG_QUEUE_SIZE = 10000  # Records buffered for the log writer thread; further records are dropped
+LOG_EVENT_SAMPLE_EVERY = {"audio_sent": 10, "response_chunk": 10}  # Keep one in N of these events
+LOG_EVENT_MAX_PER_SECOND = 20  # Cap per telemetry event name; 0 disables the cap
+
+# Metrics Configuration
+METRICS_RESERVOIR_SIZE = 2048  # Recent samples kept per histogram for percentiles
+METRICS_EXPORT_INTERVAL = 30.0  # Seconds between metric dumps to the log and metrics file
+METRICS_FILE_PATH = os.path.join(os.path.dirname(os.path.dirname(__file__)), "src/logs", "metrics.prom")
+
+# Diagnostics Configuration (event-loop lag and blocking-call monitoring)
+DIAGNOSTICS = os.getenv("DIAGNOSTICS", "0") == "1"
+LOOP_LAG_INTERVAL = 0.05  # Seconds between event-loop lag probes
+SLOW_CALLBACK_THRESHOLD = 0.1  # Blocking the event loop longer than this captures the stack doing it
+DIAGNOSTICS_MAX_STACKS = 20  # Distinct blocking stacks kept for the report
+DIAGNOSTICS_REPORT_INTERVAL = 30.0  # Seconds between diagnostics reports
+DIAGNOSTICS_REPORT_PATH = os.path.join(os.path.dirname(os.path.dirname(__file__)), "src/logs", "diagnostics.txt")
 
 # Input Modes
 INPUT_MODE_AUDIO = "audio"
 INPUT_MODE_TEXT = "text"
 INPUT_MODE_CAMERA = "camera"
 INPUT_MODE_SCREEN = "screen"
+INPUT_MODE_GATEWAY = "gateway"
+INPUT_MODE_MULTI = "multi"  # Camera and screen together in one session
+
+# Gateway Configuration (serves many clients over WebSocket)
+GATEWAY_HOST = os.getenv("GATEWAY_HOST", "127.0.0.1")
+GATEWAY_PORT = int(os.getenv("GATEWAY_PORT", "8765"))
+GATEWAY_MAX_CLIENTS = 100  # Further connections are refused with close code 1013
+GATEWAY_CLIENT_QUEUE_SIZE = 64  # Per-client messages buffered in each direction
+GATEWAY_MAX_CONCURRENT_SENDS = 32  # Live sends in flight across all clients, granted in turn
+
+# Camera Capture Configuration
+CAMERA_DEVICE_INDEX = 0
+CAMERA_CAPTURE_WIDTH = 1280  # Requested from the device; the largest FRAME_QUALITY_LADDER size
+CAMERA_CAPTURE_HEIGHT = 720
+CAMERA_CAPTURE_FPS = 10  # Device frame rate; a requested frame waits at most one frame period
 
 # Screen Capture Configuration
-DEFAULT_MONITOR_INDEX = 1  # Default monitor index (1-based indexing)
\ No newline at end of file
+DEFAULT_MONITOR_INDEX = 1  # Default monitor index (1-based indexing)
+SCREEN_CAPTURE_INTERVAL = 1.0  # Shortest time between screen grabs; FRAME_QUALITY_LADDER may lengthen it
+SCREEN_DIFF_SAMPLE_STEP = 16  # Compare every Nth pixel in each direction
+SCREEN_DIFF_PIXEL_TOLERANCE = 8  # Per-channel difference ignored as noise
+SCREEN_CHANGE_THRESHOLD = 0.0005  # Fraction of sampled pixels that must change to send a frame
+SCREEN_CAPTURE_MODE = os.getenv("SCREEN_CAPTURE_MODE", "full")  # "full", "dirty", "region" or "window"
+SCREEN_REGION = (0, 0, 1280, 720)  # Left, top, width, height (monitor-relative) sent in "region" mode
+SCREEN_TILE_SIZE = 128  # Tile edge in pixels for change tracking in "dirty", "region" and "window" modes
+SCREEN_TILE_SAMPLE_STEP = 4  # Compare every Nth pixel for tile change tracking; fine enough to see a cursor
+SCREEN_TILE_CHANGE_THRESHOLD = 4  # Sampled pixels that must change in one tile to send it
+SCREEN_DIRTY_FULL_FRACTION = 0.5  # Send the whole monitor when more than this fraction of tiles changed
+SCREEN_FULL_FRAME_INTERVAL = 10.0  # Seconds between downscaled whole-monitor frames outside "full" mode
+SCREEN_FULL_FRAME_MAX_SIZE = 768  # Longest side of those whole-monitor frames
+
+# Frame Encoding Configuration
+FRAME_ENCODER_BACKEND = "auto"  # "auto", "turbojpeg", "opencv" or "pil"
+FRAME_IMAGE_FORMAT = "jpeg"  # "jpeg" or "webp"
+
+# Multi-Source Configuration (camera and screen in one session)
+MULTI_SOURCES = ("camera", "screen")  # Frame sources captured at once in "multi" mode
+FRAME_ENCODE_WORKERS = 2  # Worker processes encoding frames in "multi" mode; one per source scales across cores
+MULTI_SOURCE_REPORT_INTERVAL = 30.0  # Seconds between per-source fps and CPU reports
+
+# Adaptive Frame Quality Configuration
+# Each step is (capture interval in seconds, max image side in pixels, JPEG quality),
+# ordered from the cheapest to the richest setting.
+FRAME_QUALITY_LADDER = [
+    (2.0, 512, 50),
+    (1.5, 768, 60),
+    (1.0, 1024, 75),
+    (0.5, 1024, 80),
+    (0.25, 1280, 85),
+]
+FRAME_QUALITY_START_LEVEL = 2
+FRAME_QUALITY_MIN_LEVEL = 0
+FRAME_QUALITY_MAX_LEVEL = None  # None allows the top of the ladder
+FRAME_SEND_SLOW_SECONDS = 0.25  # Smoothed send time that counts as congestion
+FRAME_SEND_FAST_SECONDS = 0.05  # Smoothed send time that counts as a fast link
+FRAME_QUEUE_HIGH_WATER = 3  # Outgoing queue depth that counts as congestion
+FRAME_QUALITY_UPGRADE_AFTER = 20  # Consecutive healthy sends before stepping up
+FRAME_QUALITY_HOLD_SAMPLES = 5  # Sends to wait after a change before stepping down again
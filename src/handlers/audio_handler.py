@@ -1,135 +1,64 @@
 import asyncio
-import pyaudio
-import traceback
-from google import genai
-from src.config import (
-    FORMAT,
-    CHANNELS,
-    SEND_SAMPLE_RATE,
-    RECEIVE_SAMPLE_RATE,
-    CHUNK_SIZE,
-    MODEL,
-    API_VERSION
-)
+from src.utils.logger import log_event
+from src.utils.media import audio_message
+from src.utils.metrics import metrics
+from src.utils.vad import TurnSegmenter
+from src.handlers.live_handler import VoiceHandler
 
-# Import taskgroup for compatibility with Python versions below 3.11
-try:
-    from asyncio import TaskGroup
-except ImportError:
-    from taskgroup import TaskGroup
-
-class AudioOnlyHandler:
-    def __init__(self, logger):
-        self.logger = logger
+class AudioOnlyHandler(VoiceHandler):
+    def __init__(self, logger, backend=None, session_manager=None):
+        super().__init__(logger, backend=backend, session_manager=session_manager)
         self.audio_in_queue = asyncio.Queue()
-        self.audio_out_queue = asyncio.Queue()
-        self.ai_speaking = False
-        self.client = genai.Client(http_options={"api_version": API_VERSION})
-        self.CONFIG = {"generation_config": {"response_modalities": ["AUDIO"]}}
-        self.pya = pyaudio.PyAudio()
+        self.turns_sent = 0
+        self.turns_answered = 0
+        self.progress = asyncio.Event()  # Set whenever a turn is answered or playback drains
 
     async def send_audio(self, session):
-        """Continuously captures audio from the microphone and sends it to the AI session."""
-        try:
-            while True:
-                audio_data = await self.audio_in_queue.get()
-                if audio_data is None:
-                    break  # Exit signal received
-                await session.send({"data": audio_data, "mime_type": "audio/pcm"}, end_of_turn=True)
-        except Exception as e:
-            traceback.print_exc()
-
-    async def receive_audio(self, session):
-        """Receives audio responses from the AI session and queues them for playback."""
+        """Sends detected speech to the AI session, ending the turn after trailing silence."""
+        segmenter = TurnSegmenter()
         try:
             while True:
-                turn = session.receive()
-                async for response in turn:
-                    if data := response.data:
-                        await self.audio_out_queue.put(data)
-                    if text := response.text:
-                        print(f"Assistant: {text}")
-                # After the turn is complete, clear the audio queue to stop any ongoing playback
-                while not self.audio_out_queue.empty():
-                    self.audio_out_queue.get_nowait()
+                item = await self.audio_in_queue.get()
+                if item is None:
+                    # The input file has ended: finish once every turn has been answered
+                    await self.wait_until_answered()
+                    self.session_manager.stop()
+                    break
+                audio_data, captured_at = item
+                for data, end_of_turn in segmenter.process(audio_data):
+                    await session.send(audio_message(data).to_input(), end_of_turn=end_of_turn)
+                    self.turns_sent += end_of_turn
+                    log_event(self.logger, "audio_sent", bytes=len(data), end_of_turn=end_of_turn)
+                    metrics.observe_since("mic_capture_to_send", captured_at)
+                    self.turn_timer.mark_sent()
         except Exception as e:
-            traceback.print_exc()
-
-    async def listen_audio(self):
-        """Listens to the microphone input and places audio data into the queue for sending."""
-        mic_info = self.pya.get_default_input_device_info()
-        audio_stream = self.pya.open(
-            format=FORMAT,
-            channels=CHANNELS,
-            rate=SEND_SAMPLE_RATE,
-            input=True,
-            input_device_index=mic_info["index"],
-            frames_per_buffer=CHUNK_SIZE,
-        )
-        try:
-            print("Listening... You can speak now.")
-            while True:
-                if not self.ai_speaking:
-                    data = await asyncio.to_thread(
-                        audio_stream.read, CHUNK_SIZE, exception_on_overflow=False
-                    )
-                    await self.audio_in_queue.put(data)
-                else:
-                    await asyncio.sleep(0.1)
-        except Exception as e:
-            traceback.print_exc()
+            self.logger.exception("Error in send_audio")
         finally:
-            audio_stream.stop_stream()
-            audio_stream.close()
-            print("Stopped Listening.")
+            self.logger.info(f"Voice activity: {segmenter.summary()}")
 
-    async def play_audio(self):
-        """Plays audio data received from the AI session."""
-        audio_stream = self.pya.open(
-            format=FORMAT,
-            channels=CHANNELS,
-            rate=RECEIVE_SAMPLE_RATE,
-            output=True,
-        )
-        try:
-            while True:
-                data = await self.audio_out_queue.get()
-                if not self.ai_speaking:
-                    self.ai_speaking = True  # AI starts speaking
-                    print("Assistant is speaking...")
-                await asyncio.to_thread(audio_stream.write, data)
-                if self.audio_out_queue.empty():
-                    self.ai_speaking = False  # AI has finished speaking
-                    print("You can speak now.")
-        except Exception as e:
-            traceback.print_exc()
-        finally:
-            audio_stream.stop_stream()
-            audio_stream.close()
+    async def _on_mic_audio(self, data, captured_at):
+        await self.audio_in_queue.put((data, captured_at))
 
-    async def run(self):
-        """Initializes the AI session and starts all asynchronous tasks."""
-        try:
-            async with (
-                self.client.aio.live.connect(model=MODEL, config=self.CONFIG) as session,
-                TaskGroup() as tg,
-            ):
-                self.session = session
+    async def _on_mic_ended(self):
+        await self.audio_in_queue.put(None)
 
-                # Create asynchronous tasks
-                tg.create_task(self.listen_audio())
-                tg.create_task(self.send_audio(session))
-                tg.create_task(self.receive_audio(session))
-                tg.create_task(self.play_audio())
+    async def _on_turn_end(self):
+        self.turns_answered += 1
+        self.progress.set()
 
-                # Keep the main coroutine alive
-                await asyncio.Event().wait()
+    def _on_playback_drained(self):
+        super()._on_playback_drained()
+        self.progress.set()
 
-        except asyncio.CancelledError:
-            pass
-        except Exception as e:
-            traceback.print_exc()
+    async def wait_until_answered(self):
+        """Waits until every turn sent has been answered and its audio has been played."""
+        while True:
+            self.progress.clear()
+            if self.turns_answered >= self.turns_sent and not self.ai_speaking and self.audio_out_queue.empty():
+                return
+            await self.progress.wait()
 
-    def close(self):
-        """Closes PyAudio instance."""
-        self.pya.terminate()
\ No newline at end of file
+    def _session_tasks(self, session):
+        """Coroutines that use the Live session; restarted on every session swap."""
+        self.session = session
+        return [self.send_audio(session), self.receive_audio(session)]
\ No newline at end of file
@@ -0,0 +1,253 @@
+import asyncio
+import collections
+import itertools
+import json
+import time
+from websockets.asyncio.server import serve
+from websockets.exceptions import ConnectionClosed
+from src.config import (
+    LIVE_CONFIG,
+    GATEWAY_HOST,
+    GATEWAY_PORT,
+    GATEWAY_MAX_CLIENTS,
+    GATEWAY_CLIENT_QUEUE_SIZE,
+    GATEWAY_MAX_CONCURRENT_SENDS,
+)
+from src.utils.logger import get_logger, log_event
+from src.utils.media import audio_message
+from src.utils.metrics import metrics, TurnTimer
+from src.utils.session_backend import create_backend
+from src.utils.session_manager import SessionManager
+from src.utils.vad import TurnSegmenter
+
+TURN_COMPLETE = json.dumps({"type": "turn_complete"})
+INTERRUPTED = json.dumps({"type": "interrupted"})
+
+_client_ids = itertools.count(1)
+
+
+class FairSendGate:
+    """Limits Live sends in flight across all clients and grants slots in arrival order.
+
+    Each client sends one message at a time, so first-come-first-served means the
+    clients take turns: one with a deep backlog cannot starve the others.
+    """
+
+    def __init__(self, slots=GATEWAY_MAX_CONCURRENT_SENDS):
+        self.slots = slots
+        self._free = slots
+        self._waiters = collections.deque()
+
+    async def __aenter__(self):
+        started = time.perf_counter()
+        if self._free and not self._waiters:
+            self._free -= 1
+        else:
+            waiter = asyncio.get_running_loop().create_future()
+            self._waiters.append(waiter)
+            try:
+                await waiter
+            except asyncio.CancelledError:
+                if waiter in self._waiters:
+                    self._waiters.remove(waiter)
+                elif not waiter.cancelled():
+                    self._release()  # A slot was handed over just before the cancellation
+                raise
+        metrics.observe("gateway_send_wait", time.perf_counter() - started)
+
+    async def __aexit__(self, *exc_info):
+        self._release()
+
+    def _release(self):
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                return
+        self._free += 1
+
+
+class GatedSession:
+    """Live session wrapper whose sends take turns through a ``FairSendGate``."""
+
+    def __init__(self, session, gate):
+        self.session = session
+        self.gate = gate
+
+    async def send(self, *args, **kwargs):
+        async with self.gate:
+            await self.session.send(*args, **kwargs)
+
+    def receive(self):
+        return self.session.receive()
+
+
+class GatewayClient:
+    """Bridges one WebSocket connection to a Live session.
+
+    Binary messages from the client are 16 kHz PCM microphone audio, segmented
+    into turns by voice activity as in audio mode. Text messages are JSON, and
+    ``{"type": "text", "text": ...}`` sends a typed turn. The gateway answers with
+    binary 24 kHz PCM response audio and JSON ``text``, ``interrupted`` and
+    ``turn_complete`` messages.
+
+    Both directions are bounded. When microphone audio arrives faster than it can
+    be sent, the oldest chunk is dropped. When the client reads response audio
+    slower than it arrives, receiving from its Live session waits.
+    """
+
+    def __init__(self, websocket, gate, logger, queue_size=GATEWAY_CLIENT_QUEUE_SIZE):
+        self.client_id = next(_client_ids)
+        self.websocket = websocket
+        self.gate = gate
+        self.logger = logger
+        self.audio_in_queue = asyncio.Queue(maxsize=queue_size)
+        self.out_queue = asyncio.Queue(maxsize=queue_size)
+        self.disconnected = asyncio.Event()
+        self.turn_timer = TurnTimer()
+        self.audio_dropped = 0
+        self.turns = 0
+
+    def session_tasks(self, session):
+        """Coroutines that use the Live session; restarted on every session swap."""
+        session = GatedSession(session, self.gate)
+        return [
+            self.read_client(session),
+            self.send_audio(session),
+            self.receive_audio(session),
+            self.write_client(),
+        ]
+
+    def _queue_audio(self, data, captured_at):
+        if self.audio_in_queue.full():
+            self.audio_in_queue.get_nowait()  # Drop the oldest chunk; it is already late
+            self.audio_dropped += 1
+        self.audio_in_queue.put_nowait((data, captured_at))
+
+    async def read_client(self, session):
+        """Reads microphone audio and typed turns from the client."""
+        try:
+            async for message in self.websocket:
+                if isinstance(message, bytes):
+                    self._queue_audio(message, time.perf_counter())
+                    continue
+                try:
+                    request = json.loads(message)
+                except ValueError:
+                    self.logger.warning(f"Client {self.client_id} sent invalid JSON; ignored.")
+                    continue
+                if request.get("type") == "text":
+                    await session.send(request.get("text") or ".", end_of_turn=True)
+                    self.turn_timer.mark_sent()
+        except ConnectionClosed:
+            pass
+        self.disconnected.set()
+
+    async def send_audio(self, session):
+        """Sends detected speech to the Live session, ending the turn after trailing silence."""
+        segmenter = TurnSegmenter()
+        while True:
+            audio_data, captured_at = await self.audio_in_queue.get()
+            for data, end_of_turn in segmenter.process(audio_data):
+                await session.send(audio_message(data).to_input(), end_of_turn=end_of_turn)
+                log_event(self.logger, "audio_sent", client=self.client_id, bytes=len(data))
+                metrics.observe_since("mic_capture_to_send", captured_at)
+                self.turn_timer.mark_sent()
+
+    async def receive_audio(self, session):
+        """Forwards every response of the Live session to the client, in order."""
+        while True:
+            async for response in session.receive():
+                self.turn_timer.mark_response(bool(response.data))
+                if data := response.data:
+                    log_event(self.logger, "response_chunk", client=self.client_id, bytes=len(data))
+                    await self.out_queue.put(data)
+                if text := response.text:
+                    await self.out_queue.put(json.dumps({"type": "text", "text": text}))
+                content = response.server_content
+                if content is not None and content.interrupted:
+                    await self.out_queue.put(INTERRUPTED)
+            self.turn_timer.end_turn()
+            self.turns += 1
+            await self.out_queue.put(TURN_COMPLETE)
+
+    async def write_client(self):
+        """Sends queued responses to the client; waits while the client is slow to read."""
+        try:
+            while True:
+                message = await self.out_queue.get()
+                await self.websocket.send(message)
+                if isinstance(message, bytes):
+                    self.turn_timer.mark_played()
+        except ConnectionClosed:
+            self.disconnected.set()
+
+    def summary(self):
+        return f"client {self.client_id}: {self.turns} turns, {self.audio_dropped} mic chunks dropped"
+
+
+class GatewayHandler:
+    """Serves many WebSocket clients from one process, each with its own Live session.
+
+    Sessions come from a shared ``SessionManager``, so a new client is usually
+    handed a standby that is already connected.
+    """
+
+    def __init__(
+        self,
+        logger,
+        backend=None,
+        session_manager=None,
+        host=GATEWAY_HOST,
+        port=GATEWAY_PORT,
+        max_clients=GATEWAY_MAX_CLIENTS,
+    ):
+        self.logger = logger or get_logger()
+        self.CONFIG = LIVE_CONFIG
+        self.session_manager = session_manager or SessionManager(
+            backend or create_backend(), self.CONFIG, logger=self.logger
+        )
+        self.host = host
+        self.port = port
+        self.max_clients = max_clients
+        self.gate = FairSendGate()
+        self.clients = set()
+        self.accepted = 0
+        self.rejected = 0
+        self.ready = asyncio.Event()  # Set once the server is listening
+
+    async def handle_client(self, websocket):
+        if len(self.clients) >= self.max_clients:
+            self.rejected += 1
+            await websocket.close(1013, "Gateway is at its connection limit")
+            return
+        client = GatewayClient(websocket, self.gate, self.logger)
+        self.clients.add(client)
+        self.accepted += 1
+        self.logger.info(f"Client {client.client_id} connected ({len(self.clients)} active).")
+        try:
+            await self.session_manager.serve(client.session_tasks, stopped=client.disconnected)
+        except Exception as e:
+            self.logger.exception(f"Error serving client {client.client_id}")
+        finally:
+            self.clients.discard(client)
+            self.logger.info(f"Client {client.client_id} disconnected: {client.summary()}")
+
+    async def run(self):
+        """Accepts clients until cancelled."""
+        self.session_manager.start()
+        try:
+            async with serve(self.handle_client, self.host, self.port) as server:
+                self.logger.info(f"Gateway listening on ws://{self.host}:{self.port}")
+                self.ready.set()
+                await server.serve_forever()
+        except asyncio.CancelledError:
+            pass
+        except Exception as e:
+            self.logger.exception("Error in run")
+        finally:
+            await self.session_manager.close()
+            self.logger.info(f"Gateway: {self.accepted} clients served, {self.rejected} refused.")
+
+    def close(self):
+        """Nothing to release; sessions are closed when ``run`` ends."""
@@ -0,0 +1,214 @@
+import asyncio
+import time
+from src.config import (
+    CHUNK_SIZE,
+    FULL_DUPLEX,
+    LIVE_CONFIG,
+)
+from src.utils.echo_suppression import EchoSuppressor
+from src.utils.audio_devices import LazyPyAudio
+from src.utils.logger import get_logger, log_event
+from src.utils.metrics import TurnTimer
+from src.utils.audio_buffer import ResponseAudioBuffer
+from src.utils.audio_io import create_source, create_sink
+from src.utils.session_backend import create_backend
+from src.utils.session_manager import SessionManager
+
+# Import taskgroup for compatibility with Python versions below 3.11
+try:
+    from asyncio import TaskGroup
+except ImportError:
+    from taskgroup import TaskGroup
+
+class LiveHandler:
+    """Response half shared by every local handler: receiving, buffering and playing the AI's audio.
+
+    Each turn's audio is tagged with a buffer generation, so a new turn or an
+    interruption drops stale audio at once. ``run`` starts ``device_tasks``
+    once and keeps ``_session_tasks``, which subclasses define, running across
+    session swaps. Subclasses hook into a turn with ``_on_response`` and
+    ``_on_turn_end``.
+    """
+
+    READY_MESSAGE = "You can speak now."
+    OPEN_OUTPUT_ON_FIRST_REPLY = False  # Defer opening the output device until audio arrives
+
+    def __init__(self, logger, backend=None, session_manager=None):
+        self.logger = logger or get_logger()
+        self.audio_out_queue = ResponseAudioBuffer()
+        self.ai_speaking = False
+        self.mic_open = asyncio.Event()  # Cleared while the assistant speaks in half-duplex mode
+        self.mic_open.set()
+        self.CONFIG = LIVE_CONFIG
+        self.session_manager = session_manager or SessionManager(backend or create_backend(), self.CONFIG)
+        self.turn_timer = TurnTimer()
+        self.pya = LazyPyAudio()  # PortAudio is initialised when a stream is first opened
+        self.playback = create_sink(pya=self.pya)
+
+    async def receive_audio(self, session):
+        """Receives audio responses from the AI session and queues them for playback.
+
+        Each turn's audio is tagged with the buffer generation current when the
+        turn started, so audio still arriving after an interruption or a newer
+        turn is dropped on arrival instead of being played.
+        """
+        try:
+            while True:
+                turn = session.receive()
+                generation = None
+                async for response in turn:
+                    self.turn_timer.mark_response(bool(response.data))
+                    if generation is None:
+                        generation = self.start_response_turn()
+                    if data := response.data:
+                        log_event(self.logger, "response_chunk", bytes=len(data))
+                        await self.audio_out_queue.put(data, generation)
+                    if text := response.text:
+                        self.logger.info(f"Assistant: {text}")
+                    content = response.server_content
+                    if content is not None and content.interrupted and self.ai_speaking:
+                        self.interrupt_playback()
+                    self._on_response(response)
+                self.turn_timer.end_turn()
+                await self._on_turn_end()
+        except Exception as e:
+            self.logger.exception("Error in receive_audio")
+
+    def _on_response(self, response):
+        """Called with every message of a turn after it has been queued for playback."""
+
+    async def _on_turn_end(self):
+        """Called once the server has finished a turn."""
+
+    async def play_audio(self):
+        """Feeds audio received from the AI session to the callback-driven playback engine."""
+        self.playback.on_played = self._on_audio_played
+        self.playback.on_drained = self._on_playback_drained
+        started = False
+        try:
+            if not self.OPEN_OUTPUT_ON_FIRST_REPLY:
+                await self.playback.start()
+                started = True
+            while True:
+                data = await self.audio_out_queue.get()
+                if not started:
+                    await self.playback.start()
+                    started = True
+                if not self.ai_speaking:
+                    self.ai_speaking = True  # AI starts speaking
+                    self.mic_open.clear()
+                    self.logger.info("Assistant is speaking...")
+                await self.playback.write(data)
+        except Exception as e:
+            self.logger.exception("Error in play_audio")
+        finally:
+            self.playback.close()
+            self.logger.info(f"Playback: {self.playback.summary()}")
+            self.logger.info(f"Response audio buffer: {self.audio_out_queue.summary()}")
+
+    def _on_audio_played(self, data):
+        self.turn_timer.mark_played()
+
+    def _on_playback_drained(self):
+        if self.ai_speaking and self.audio_out_queue.empty():
+            self.ai_speaking = False  # AI has finished speaking
+            self.mic_open.set()
+            self.logger.info(self.READY_MESSAGE)
+
+    def start_response_turn(self):
+        """Stops audio left over from earlier turns and returns the generation for the new one."""
+        if not self.audio_out_queue.empty() or self.ai_speaking:
+            self.audio_out_queue.invalidate()
+            self.playback.flush()
+        return self.audio_out_queue.generation
+
+    def interrupt_playback(self):
+        """Stops local playback at once when the user talks over the assistant."""
+        # The rest of the interrupted turn still streaming in carries the old generation
+        self.audio_out_queue.invalidate()
+        self.playback.flush()
+        self.ai_speaking = False
+        self.mic_open.set()
+        self.logger.info("Assistant interrupted.")
+
+    def device_tasks(self):
+        """Coroutines that use local devices; started once and kept across session swaps."""
+        return [self.play_audio()]
+
+    def _session_tasks(self, session):
+        """Coroutines that use the Live session; restarted on every session swap."""
+        raise NotImplementedError
+
+    async def run(self):
+        """Starts the device tasks once and keeps the session tasks running across reconnects."""
+        self.session_manager.start()
+        try:
+            async with TaskGroup() as tg:
+                device_tasks = [tg.create_task(coro) for coro in self.device_tasks()]
+                await self.session_manager.serve(self._session_tasks)
+                for task in device_tasks:
+                    task.cancel()
+
+        except asyncio.CancelledError:
+            pass
+        except Exception as e:
+            self.logger.exception("Error in run")
+        finally:
+            await self.session_manager.close()
+
+    def close(self):
+        """Closes resources."""
+        self.pya.terminate()
+
+
+class VoiceHandler(LiveHandler):
+    """Adds the microphone to ``LiveHandler``, with echo suppression and barge-in in full-duplex mode.
+
+    Subclasses decide where captured audio goes with ``_on_mic_audio`` and
+    ``_on_mic_ended``.
+    """
+
+    def __init__(self, logger, backend=None, session_manager=None):
+        super().__init__(logger, backend=backend, session_manager=session_manager)
+        self.echo_suppressor = EchoSuppressor()
+        self.audio_source = create_source(pya=self.pya)
+
+    async def listen_audio(self):
+        """Listens to the microphone input and hands each chunk to ``_on_mic_audio``."""
+        await self.audio_source.start()
+        try:
+            self.logger.info("Listening... You can speak now.")
+            while True:
+                if not FULL_DUPLEX:
+                    await self.mic_open.wait()
+                data = await self.audio_source.read(CHUNK_SIZE)
+                if not data:
+                    self.logger.info(f"Audio input ended: {self.audio_source.summary()}")
+                    await self._on_mic_ended()
+                    break
+                captured_at = time.perf_counter()
+                if FULL_DUPLEX:
+                    data, barge_in = self.echo_suppressor.process(data)
+                    if barge_in and self.ai_speaking:
+                        self.interrupt_playback()
+                await self._on_mic_audio(data, captured_at)
+        except Exception as e:
+            self.logger.exception("Error in listen_audio")
+        finally:
+            self.audio_source.close()
+            self.logger.info("Stopped Listening.")
+            if FULL_DUPLEX:
+                self.logger.info(f"Echo suppression: {self.echo_suppressor.summary()}")
+
+    async def _on_mic_audio(self, data, captured_at):
+        raise NotImplementedError
+
+    async def _on_mic_ended(self):
+        """Called when the audio source has no more input (e.g. the end of an input file)."""
+
+    def _on_audio_played(self, data):
+        self.echo_suppressor.push_reference(data)
+        super()._on_audio_played(data)
+
+    def device_tasks(self):
+        return [self.listen_audio()] + super().device_tasks()
@@ -0,0 +1,134 @@
+import asyncio
+import time
+from src.utils.logger import log_event
+from src.utils.metrics import metrics
+from src.utils.adaptive_quality import AdaptiveQualityController
+from src.utils.send_scheduler import SendScheduler
+from src.utils.media import MediaMessage, audio_message, media_stats
+from src.handlers.live_handler import VoiceHandler
+
+class MediaHandler(VoiceHandler):
+    """Audio and video pipeline shared by the camera, screen and multi-source modes.
+
+    Microphone audio and frames go to the Live session through the send
+    scheduler. ``get_camera_frames`` and ``get_screen_frames`` capture one
+    source each with a given encoder; subclasses pick theirs in
+    ``frame_tasks``.
+    """
+
+    def __init__(self, logger, backend=None, session_manager=None):
+        super().__init__(logger, backend=backend, session_manager=session_manager)
+        self.send_scheduler = SendScheduler()
+        self.quality = AdaptiveQualityController()
+        self.captures = {}  # Source name -> (capture thread owner with cpu_seconds, its encoder)
+
+    def frame_tasks(self):
+        """Coroutines that capture frames for the video lane; started once, like the audio devices."""
+        raise NotImplementedError
+
+    def device_tasks(self):
+        return self.frame_tasks() + super().device_tasks()
+
+    def _get_frame(self, cap, encoder, max_size, jpeg_quality):
+        ret, frame = cap.read()
+        if not ret:
+            return None
+        image_bytes = encoder.encode(frame, max_size, jpeg_quality)
+        return MediaMessage(encoder.mime_type, image_bytes)
+
+    async def get_camera_frames(self, encoder, source="camera"):
+        """Sends the camera's latest frame, encoded by ``encoder``, every ladder interval."""
+        from src.utils.camera_capture import CameraGrabber  # Imported per source so screen mode skips it
+
+        grabber = CameraGrabber(logger=self.logger)
+        self.captures[source] = (grabber, encoder)
+        grabber.start()
+        try:
+            self.logger.info("Camera is on. Capturing images...")
+            while True:
+                frame = await asyncio.to_thread(
+                    self._get_frame, grabber, encoder, self.quality.max_size, self.quality.jpeg_quality
+                )
+                if frame is None:
+                    continue
+                self.send_scheduler.put_video(frame, grabber.last_captured_at, source=source)
+                log_event(
+                    self.logger,
+                    "frame_captured",
+                    source=source,
+                    bytes=encoder.stats.last_bytes,
+                    encode_ms=round(1000 * encoder.stats.last_seconds, 2),
+                    max_size=self.quality.max_size,
+                )
+                await asyncio.sleep(self.quality.interval)
+        except Exception as e:
+            self.logger.exception("Error in get_camera_frames")
+        finally:
+            await asyncio.to_thread(grabber.stop)
+            self.logger.info("Stopped capturing images.")
+            self.logger.info(f"Camera: {grabber.summary()}")
+            self.logger.info(f"Camera frame encoder ({encoder.backend}): {encoder.stats.summary()}")
+
+    async def get_screen_frames(self, monitor_index, encoder=None, source="screen"):
+        """Sends changed screenshots of ``monitor_index``; ``encoder`` defaults to the engine's own."""
+        from src.utils.screen_capture import ScreenCaptureEngine  # Imported per source so camera mode skips mss
+
+        engine = ScreenCaptureEngine(monitor_index, quality_controller=self.quality, encoder=encoder, logger=self.logger)
+        encoder = engine.encoder
+        self.captures[source] = (engine, encoder)
+        try:
+            self.logger.info(f"Capturing screenshots from monitor {monitor_index}...")
+            engine.start()
+            while True:
+                frame, captured_at = await engine.next_frame()
+                self.send_scheduler.put_video(frame, captured_at, source=source)
+                log_event(
+                    self.logger,
+                    "frame_captured",
+                    source=source,
+                    bytes=encoder.stats.last_bytes,
+                    encode_ms=round(1000 * encoder.stats.last_seconds, 2),
+                    skipped=engine.frames_skipped,
+                    region=engine.last_region,
+                )
+        except Exception as e:
+            self.logger.exception("Error in get_screen_frames")
+        finally:
+            await asyncio.to_thread(engine.stop)
+            self.logger.info("Stopped capturing screenshots.")
+            self.logger.info(f"Screen capture: {engine.summary()}")
+            self.logger.info(f"Screen frame encoder ({encoder.backend}): {encoder.stats.summary()}")
+
+    async def send_realtime(self, session):
+        try:
+            while True:
+                msg = await self.send_scheduler.get()
+                started = time.perf_counter()
+                await session.send(msg.to_input())
+                send_seconds = time.perf_counter() - started
+                self.quality.record_send(send_seconds, self.send_scheduler.qsize())
+                log_event(
+                    self.logger,
+                    f"{self.send_scheduler.last_lane}_sent",
+                    send_ms=round(1000 * send_seconds, 2),
+                    queued=self.send_scheduler.qsize(),
+                    quality_level=self.quality.level,
+                )
+                if self.send_scheduler.last_lane == "audio":
+                    metrics.observe_since("mic_capture_to_send", self.send_scheduler.last_captured_at)
+                    self.turn_timer.mark_sent()
+                else:
+                    metrics.observe_since("frame_capture_to_send", self.send_scheduler.last_captured_at)
+        except Exception as e:
+            self.logger.exception("Error in send_realtime")
+        finally:
+            self.logger.info(f"Send scheduler: {self.send_scheduler.summary()}")
+            self.logger.info(f"Media: {media_stats.summary()}")
+
+    async def _on_mic_audio(self, data, captured_at):
+        self.send_scheduler.put_audio(audio_message(data), captured_at)
+
+    def _session_tasks(self, session):
+        """Coroutines that use the Live session; restarted on every session swap."""
+        self.session = session
+        return [self.send_realtime(session), self.receive_audio(session)]
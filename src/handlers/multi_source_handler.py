@@ -0,0 +1,86 @@
+import asyncio
+import time
+from src.config import (
+    MULTI_SOURCES,
+    MULTI_SOURCE_REPORT_INTERVAL,
+)
+from src.utils.frame_pool import FrameEncodePool
+from src.handlers.media_handler import MediaHandler
+
+class MultiSourceHandler(MediaHandler):
+    """Sends several frame sources (camera and screen) to one Live session at the same time.
+
+    Each source captures on its own thread and encodes its frames in a shared
+    ``FrameEncodePool`` of worker processes, so the sources' JPEG encoding runs
+    on separate cores instead of taking turns on the GIL. Their frames share the
+    send scheduler's video lane round-robin, and each source's frame rate and
+    CPU use are logged every ``MULTI_SOURCE_REPORT_INTERVAL`` seconds.
+    """
+
+    def __init__(self, logger, monitor_index=1, backend=None, session_manager=None, sources=MULTI_SOURCES):
+        unsupported = set(sources) - {"camera", "screen"}
+        if unsupported:
+            raise ValueError(f"Unsupported frame sources: {sorted(unsupported)}")
+        super().__init__(logger, backend=backend, session_manager=session_manager)
+        self.monitor_index = monitor_index
+        self.sources = sources
+        self.encode_pool = FrameEncodePool()  # Worker processes start when run() does
+        self._last_report = None
+
+    async def report_sources(self):
+        """Logs each source's frame rate and CPU use every ``MULTI_SOURCE_REPORT_INTERVAL`` seconds."""
+        self._last_report = (time.perf_counter(), {})
+        try:
+            while True:
+                await asyncio.sleep(MULTI_SOURCE_REPORT_INTERVAL)
+                self.log_source_report()
+        finally:
+            self.log_source_report()
+
+    def log_source_report(self):
+        """Logs frames sent per second and CPU use per source since the previous report.
+
+        Capture CPU is the source's capture thread; encode CPU is the time the
+        worker processes spent on its frames.
+        """
+        now = time.perf_counter()
+        last_time, last_counts = self._last_report
+        elapsed = max(now - last_time, 1e-9)
+        counts = {}
+        parts = []
+        for name, (capture, encoder) in self.captures.items():
+            stats = self.send_scheduler.sources.get(name)
+            sent = stats.sent if stats is not None else 0
+            counts[name] = (sent, encoder.stats.frames, capture.cpu_seconds, encoder.cpu_seconds)
+            last_sent, last_encoded, last_capture_cpu, last_encode_cpu = last_counts.get(name, (0, 0, 0.0, 0.0))
+            encoded = encoder.stats.frames - last_encoded
+            encode_cpu = encoder.cpu_seconds - last_encode_cpu
+            per_frame = 1000.0 * encode_cpu / encoded if encoded else 0.0
+            parts.append(
+                f"{name} {(sent - last_sent) / elapsed:.2f} fps sent, "
+                f"capture CPU {100.0 * (capture.cpu_seconds - last_capture_cpu) / elapsed:.1f}%, "
+                f"encode CPU {100.0 * encode_cpu / elapsed:.1f}% ({per_frame:.1f} ms/frame)"
+            )
+        self._last_report = (now, counts)
+        if parts:
+            self.logger.info(f"Frame sources: {'; '.join(parts)}")
+
+    def frame_tasks(self):
+        tasks = []
+        for source in self.sources:
+            encoder = self.encode_pool.encoder(source)
+            if source == "camera":
+                tasks.append(self.get_camera_frames(encoder, source))
+            else:
+                tasks.append(self.get_screen_frames(self.monitor_index, encoder, source))
+        return tasks + [self.report_sources()]
+
+    async def run(self):
+        """Starts the encode worker processes, then runs the shared pipeline."""
+        await asyncio.to_thread(self.encode_pool.start)
+        await super().run()
+
+    def close(self):
+        """Closes resources."""
+        super().close()
+        self.encode_pool.close()
@@ -0,0 +1,40 @@
+import importlib
+from src.config import (
+    INPUT_MODE_AUDIO,
+    INPUT_MODE_TEXT,
+    INPUT_MODE_CAMERA,
+    INPUT_MODE_SCREEN,
+    INPUT_MODE_GATEWAY,
+    INPUT_MODE_MULTI,
+)
+
+# Module and class per input mode. Modules are imported only when their mode is
+# selected, so text mode never loads OpenCV, mss or PIL.
+HANDLERS = {
+    INPUT_MODE_AUDIO: ("src.handlers.audio_handler", "AudioOnlyHandler"),
+    INPUT_MODE_TEXT: ("src.handlers.text_handler", "TextOnlyHandler"),
+    INPUT_MODE_CAMERA: ("src.handlers.camera_handler", "CameraHandler"),
+    INPUT_MODE_SCREEN: ("src.handlers.screen_handler", "ScreenHandler"),
+    INPUT_MODE_GATEWAY: ("src.handlers.gateway_handler", "GatewayHandler"),
+    INPUT_MODE_MULTI: ("src.handlers.multi_source_handler", "MultiSourceHandler"),
+}
+
+
+def is_supported(input_mode):
+    return input_mode in HANDLERS
+
+
+def load_handler(input_mode):
+    """Imports and returns the handler class for ``input_mode``."""
+    if input_mode not in HANDLERS:
+        raise ValueError(f"Unsupported input mode: {input_mode}")
+    module_name, class_name = HANDLERS[input_mode]
+    return getattr(importlib.import_module(module_name), class_name)
+
+
+def create_handler(input_mode, logger, monitor_index=None, **kwargs):
+    """Builds the handler for ``input_mode``; ``monitor_index`` only applies to the modes that capture the screen."""
+    handler_cls = load_handler(input_mode)
+    if input_mode in (INPUT_MODE_SCREEN, INPUT_MODE_MULTI) and monitor_index is not None:
+        return handler_cls(logger, monitor_index, **kwargs)
+    return handler_cls(logger, **kwargs)
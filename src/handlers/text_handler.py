@@ -1,107 +1,121 @@
 import asyncio
-import traceback
-import pyaudio
-from google import genai
-from src.config import (
-    FORMAT,
-    CHANNELS,
-    RECEIVE_SAMPLE_RATE,
-    MODEL,
-    API_VERSION
-)
+import threading
+import time
+from collections import deque
+from src.utils.logger import log_event
+from src.utils.metrics import metrics
+from src.utils.response_cache import create_response_cache
+from src.handlers.live_handler import LiveHandler
 
-# Import taskgroup for compatibility with Python versions below 3.11
-try:
-    from asyncio import TaskGroup
-except ImportError:
-    from taskgroup import TaskGroup
+class TextOnlyHandler(LiveHandler):
+    READY_MESSAGE = "You can type your message now."
+    OPEN_OUTPUT_ON_FIRST_REPLY = True  # Text mode only needs the output device once the first reply arrives
 
-class TextOnlyHandler:
-    def __init__(self, logger):
-        self.logger = logger
-        self.audio_in_queue = asyncio.Queue()
-        self.ai_speaking = False
-        self.client = genai.Client(http_options={"api_version": API_VERSION})
-        self.CONFIG = {"generation_config": {"response_modalities": ["AUDIO"]}}
-        self.pya = pyaudio.PyAudio()
+    def __init__(self, logger, backend=None, session_manager=None):
+        super().__init__(logger, backend=backend, session_manager=session_manager)
+        self.response_cache = create_response_cache(logger=self.logger)
+        self.pending_cache_keys = deque()  # Keys of the prompts sent, in the order their turns will complete
+        self.text_in_queue = asyncio.Queue()  # Lines typed by the user; None once input has ended
+        self._reset_turn()
 
-    async def send_text(self, session):
-        """Continuously reads text input from the user and sends it to the AI session."""
+    def read_input(self, loop):
+        """Reads lines from the user on a daemon thread and queues them on ``loop``.
+
+        One reader serves every session, so a swap never leaves a second
+        ``input()`` waiting for the user's next line, and the blocked read does
+        not hold up interpreter exit. "q" or the end of input queues None.
+        """
+        text = None
         try:
             while True:
-                text = await asyncio.to_thread(
-                    input,
-                    "You: ",
-                )
-                if text.lower() == "q":
+                try:
+                    text = input("You: ")
+                except EOFError:
+                    text = None
+                if text is not None and text.lower() == "q":
+                    text = None
+                loop.call_soon_threadsafe(self.text_in_queue.put_nowait, text)
+                if text is None:
                     break
-                await session.send(text or ".", end_of_turn=True)
+        except RuntimeError:
+            pass  # The event loop has closed
         except Exception as e:
-            traceback.print_exc()
+            self.logger.exception("Error in read_input")
+            if not loop.is_closed():
+                loop.call_soon_threadsafe(self.text_in_queue.put_nowait, None)
 
-    async def receive_audio(self, session):
-        """Receives audio responses from the AI session and queues them for playback."""
+    async def send_text(self, session):
+        """Sends the user's lines to the AI session until input ends."""
         try:
             while True:
-                turn = session.receive()
-                async for response in turn:
-                    if data := response.data:
-                        await self.audio_in_queue.put(data)
-                        continue  # Continue to the next response
-                    if text := response.text:
-                        print(f"Assistant: {text}")
-                # After the turn is complete, clear the audio queue to stop any ongoing playback
-                while not self.audio_in_queue.empty():
-                    self.audio_in_queue.get_nowait()
+                text = await self.text_in_queue.get()
+                if text is None:
+                    self.session_manager.stop()
+                    break
+                if self.response_cache is not None:
+                    key = self.response_cache.key(text)
+                    if key is not None:
+                        started = time.perf_counter()
+                        cached = await asyncio.to_thread(self.response_cache.get, key)
+                        metrics.observe_since("response_cache_lookup", started)
+                        if cached is not None:
+                            await self.play_cached(cached)
+                            continue
+                    self.pending_cache_keys.append(key)
+                await session.send(text or ".", end_of_turn=True)
+                self.turn_timer.mark_sent()
         except Exception as e:
-            traceback.print_exc()
+            self.logger.exception("Error in send_text")
+
+    def _reset_turn(self):
+        self._turn_audio = bytearray()
+        self._turn_texts = []
+        self._turn_interrupted = False
+
+    def _on_response(self, response):
+        # With the response cache on, each complete answer is stored under its prompt
+        if self.response_cache is None:
+            return
+        content = response.server_content
+        self._turn_interrupted = self._turn_interrupted or (content is not None and content.interrupted)
+        if response.data:
+            self._turn_audio += response.data
+        if response.text:
+            self._turn_texts.append(response.text)
+
+    async def _on_turn_end(self):
+        audio, texts, interrupted = self._turn_audio, self._turn_texts, self._turn_interrupted
+        self._reset_turn()
+        if self.pending_cache_keys:
+            key = self.pending_cache_keys.popleft()
+            if key is not None and audio and not interrupted:
+                await asyncio.to_thread(self.response_cache.put, key, audio, "".join(texts))
 
     async def play_audio(self):
-        """Plays audio data received from the AI session."""
-        audio_stream = self.pya.open(
-            format=FORMAT,
-            channels=CHANNELS,
-            rate=RECEIVE_SAMPLE_RATE,
-            output=True,
-        )
         try:
-            while True:
-                data = await self.audio_in_queue.get()
-                if not self.ai_speaking:
-                    self.ai_speaking = True  # AI starts speaking
-                    print("Assistant is speaking...")
-                await asyncio.to_thread(audio_stream.write, data)
-                if self.audio_in_queue.empty():
-                    self.ai_speaking = False  # AI has finished speaking
-                    print("You can type your message now.")
-        except Exception as e:
-            traceback.print_exc()
+            await super().play_audio()
         finally:
-            audio_stream.stop_stream()
-            audio_stream.close()
-
-    async def run(self):
-        """Initializes the AI session and starts all asynchronous tasks."""
-        try:
-            async with (
-                self.client.aio.live.connect(model=MODEL, config=self.CONFIG) as session,
-                TaskGroup() as tg,
-            ):
-                self.session = session
-
-                # Create asynchronous tasks
-                send_text_task = tg.create_task(self.send_text(session))
-                tg.create_task(self.receive_audio(session))
-                tg.create_task(self.play_audio())
+            if self.response_cache is not None:
+                self.logger.info(f"Response cache: {self.response_cache.summary()}")
 
-                # Keep the main coroutine alive until send_text completes
-                await send_text_task
+    async def play_cached(self, cached):
+        """Plays a cached answer as a new turn, without a round trip to the Live session."""
+        generation = self.start_response_turn()
+        log_event(self.logger, "response_cache_hit", bytes=len(cached.audio))
+        if cached.text:
+            self.logger.info(f"Assistant: {cached.text}")
+        await self.audio_out_queue.put(cached.audio, generation)
 
-        except asyncio.CancelledError:
-            pass
-        except Exception as e:
-            traceback.print_exc()
+    def _session_tasks(self, session):
+        """Coroutines that use the Live session; restarted on every session swap."""
+        self.session = session
+        self.pending_cache_keys.clear()  # Turns still open on the previous session will never complete
+        self._reset_turn()
+        return [self.send_text(session), self.receive_audio(session)]
 
-    def close(self):
-        """Closes PyAudio instance."""
-        self.pya.terminate()
\ No newline at end of file
+    async def run(self):
+        """Starts the input reader, then the device and session tasks."""
+        threading.Thread(
+            target=self.read_input, args=(asyncio.get_running_loop(),), name="TextInput", daemon=True
+        ).start()
+        await super().run()
\ No newline at end of file
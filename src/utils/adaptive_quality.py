@@ -0,0 +1,91 @@
+from src.config import (
+    FRAME_QUALITY_LADDER,
+    FRAME_QUALITY_START_LEVEL,
+    FRAME_QUALITY_MIN_LEVEL,
+    FRAME_QUALITY_MAX_LEVEL,
+    FRAME_SEND_SLOW_SECONDS,
+    FRAME_SEND_FAST_SECONDS,
+    FRAME_QUEUE_HIGH_WATER,
+    FRAME_QUALITY_UPGRADE_AFTER,
+    FRAME_QUALITY_HOLD_SAMPLES,
+)
+
+
+class AdaptiveQualityController:
+    """Moves frame interval, size and JPEG quality along a ladder based on link health.
+
+    ``send_realtime`` reports how long each ``session.send`` took and how deep the
+    outgoing queue is. A slow smoothed send time or a backed-up queue steps the
+    ladder down at once; a run of fast sends on an empty queue steps it back up.
+    Each ladder step is ``(interval_seconds, max_image_side, jpeg_quality)``.
+    """
+
+    def __init__(
+        self,
+        ladder=FRAME_QUALITY_LADDER,
+        start_level=FRAME_QUALITY_START_LEVEL,
+        min_level=FRAME_QUALITY_MIN_LEVEL,
+        max_level=FRAME_QUALITY_MAX_LEVEL,
+        slow_seconds=FRAME_SEND_SLOW_SECONDS,
+        fast_seconds=FRAME_SEND_FAST_SECONDS,
+        queue_high_water=FRAME_QUEUE_HIGH_WATER,
+        upgrade_after=FRAME_QUALITY_UPGRADE_AFTER,
+        hold_samples=FRAME_QUALITY_HOLD_SAMPLES,
+        smoothing=0.3,
+    ):
+        self.ladder = list(ladder)
+        self.min_level = max(0, min_level)
+        self.max_level = len(self.ladder) - 1 if max_level is None else min(max_level, len(self.ladder) - 1)
+        self.level = min(max(start_level, self.min_level), self.max_level)
+        self.slow_seconds = slow_seconds
+        self.fast_seconds = fast_seconds
+        self.queue_high_water = queue_high_water
+        self.upgrade_after = upgrade_after
+        self.hold_samples = hold_samples
+        self.smoothing = smoothing
+        self.send_time_ewma = None
+        self.downgrades = 0
+        self.upgrades = 0
+        self._healthy_samples = 0
+        self._samples_since_change = 0
+
+    @property
+    def interval(self):
+        return self.ladder[self.level][0]
+
+    @property
+    def max_size(self):
+        return self.ladder[self.level][1]
+
+    @property
+    def jpeg_quality(self):
+        return self.ladder[self.level][2]
+
+    def record_send(self, duration, queue_depth):
+        """Feeds one ``session.send`` measurement into the controller."""
+        if self.send_time_ewma is None:
+            self.send_time_ewma = duration
+        else:
+            self.send_time_ewma += self.smoothing * (duration - self.send_time_ewma)
+        self._samples_since_change += 1
+
+        congested = self.send_time_ewma > self.slow_seconds or queue_depth >= self.queue_high_water
+        if congested:
+            self._healthy_samples = 0
+            if self._samples_since_change >= self.hold_samples and self.level > self.min_level:
+                self._set_level(self.level - 1)
+                self.downgrades += 1
+            return
+
+        if self.send_time_ewma < self.fast_seconds and queue_depth == 0:
+            self._healthy_samples += 1
+            if self._healthy_samples >= self.upgrade_after and self.level < self.max_level:
+                self._set_level(self.level + 1)
+                self.upgrades += 1
+        else:
+            self._healthy_samples = 0
+
+    def _set_level(self, level):
+        self.level = level
+        self._healthy_samples = 0
+        self._samples_since_change = 0
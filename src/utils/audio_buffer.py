@@ -0,0 +1,142 @@
+import asyncio
+from src.config import (
+    RECEIVE_SAMPLE_RATE,
+    RESPONSE_AUDIO_BUFFER_SECONDS,
+    RESPONSE_AUDIO_HIGH_WATER,
+    RESPONSE_AUDIO_LOW_WATER,
+    RESPONSE_AUDIO_POLICY,
+    RESPONSE_AUDIO_READ_MS,
+)
+
+POLICIES = ("pause", "drop_oldest", "drop_newest")
+
+
+class ResponseAudioBuffer:
+    """Fixed-size, byte-accounted buffer for response audio between receiving and playback.
+
+    Chunks are copied into one preallocated ``bytearray`` ring instead of being
+    queued as separate ``bytes`` objects, so a session's response audio never
+    takes more than ``capacity`` bytes. Once ``high_water`` bytes are buffered the
+    policy applies:
+
+    - ``"pause"``: ``put`` waits until playback has drained the buffer to
+      ``low_water``, which in turn stops reading from the Live session.
+    - ``"drop_oldest"``: the oldest audio is discarded to make room.
+    - ``"drop_newest"``: the incoming chunk is discarded.
+
+    Sizes are kept to whole 16-bit samples. ``nbytes`` and ``peak_bytes`` give
+    the current and largest amount buffered.
+
+    ``generation`` identifies the response whose audio is current. Producers tag
+    each ``put`` with the generation their turn started in; ``invalidate`` moves
+    to a new generation and empties the buffer in O(1), after which audio still
+    arriving for older turns is discarded on ``put`` instead of being played.
+    """
+
+    def __init__(
+        self,
+        rate=RECEIVE_SAMPLE_RATE,
+        seconds=RESPONSE_AUDIO_BUFFER_SECONDS,
+        high_water=RESPONSE_AUDIO_HIGH_WATER,
+        low_water=RESPONSE_AUDIO_LOW_WATER,
+        policy=RESPONSE_AUDIO_POLICY,
+        read_ms=RESPONSE_AUDIO_READ_MS,
+    ):
+        if policy not in POLICIES:
+            raise ValueError(f"Unsupported response audio policy: {policy}")
+        self.capacity = int(rate * seconds) * 2
+        self.high_water = int(self.capacity * high_water) // 2 * 2
+        self.low_water = int(self.capacity * low_water) // 2 * 2
+        self.policy = policy
+        self.read_bytes = max(2, rate * read_ms // 1000 * 2)
+        self.peak_bytes = 0
+        self.dropped_bytes = 0
+        self.pauses = 0
+        self.generation = 0
+        self.stale_bytes = 0
+        self._buffer = bytearray(self.capacity)
+        self._view = memoryview(self._buffer)
+        self._write_index = 0  # Both indices only grow; the ring position is index % capacity
+        self._read_index = 0
+        self._readable = asyncio.Event()
+        self._writable = asyncio.Event()
+        self._writable.set()
+
+    @property
+    def nbytes(self):
+        return self._write_index - self._read_index
+
+    def empty(self):
+        return self._write_index == self._read_index
+
+    async def put(self, data, generation=None):
+        """Appends PCM, applying the high-water policy. Audio of an older ``generation`` is discarded."""
+        view = memoryview(data).cast("B")
+        if generation is not None and generation != self.generation:
+            self.stale_bytes += len(view)
+            return
+        if self.policy == "drop_newest" and self.nbytes + len(view) > self.high_water:
+            self.dropped_bytes += len(view)
+            return
+        if self.policy == "drop_oldest" and self.nbytes + len(view) > self.high_water:
+            if len(view) > self.high_water:
+                self.dropped_bytes += len(view) - self.high_water
+                view = view[len(view) - self.high_water :]
+            excess = self.nbytes + len(view) - self.high_water
+            self._read_index += excess
+            self.dropped_bytes += excess
+        while len(view):
+            if self.nbytes >= self.high_water:
+                self.pauses += 1
+                self._writable.clear()
+                await self._writable.wait()
+                if generation is not None and generation != self.generation:
+                    self.stale_bytes += len(view)  # Invalidated while waiting for room
+                    return
+                continue
+            count = min(len(view), self.high_water - self.nbytes)
+            self._copy_in(view[:count])
+            view = view[count:]
+
+    def _copy_in(self, view):
+        count = len(view)
+        start = self._write_index % self.capacity
+        first = min(count, self.capacity - start)
+        self._view[start : start + first] = view[:first]
+        self._view[: count - first] = view[first:]
+        self._write_index += count
+        self.peak_bytes = max(self.peak_bytes, self.nbytes)
+        self._readable.set()
+
+    async def get(self):
+        """Waits for audio and returns up to ``read_bytes`` of it as ``bytes``."""
+        while self.empty():
+            self._readable.clear()
+            await self._readable.wait()
+        count = min(self.nbytes, self.read_bytes)
+        start = self._read_index % self.capacity
+        first = min(count, self.capacity - start)
+        data = bytes(self._view[start : start + first])
+        if first < count:
+            data += self._view[: count - first]
+        self._read_index += count
+        if self.nbytes <= self.low_water:
+            self._writable.set()
+        return data
+
+    def clear(self):
+        """Discards everything buffered, in O(1)."""
+        self._read_index = self._write_index
+        self._writable.set()
+
+    def invalidate(self):
+        """Starts a new generation: drops buffered audio and any still arriving for older turns."""
+        self.generation += 1
+        self.clear()
+
+    def summary(self):
+        return (
+            f"{self.nbytes / 1024:.1f} KiB buffered, peak {self.peak_bytes / 1024:.1f} KiB of "
+            f"{self.capacity / 1024:.0f} KiB, {self.dropped_bytes / 1024:.1f} KiB dropped, {self.pauses} pauses, "
+            f"{self.generation} invalidations ({self.stale_bytes / 1024:.1f} KiB of stale audio skipped)"
+        )
@@ -0,0 +1,82 @@
+import threading
+import time
+from src.config import FORMAT, CHANNELS, AUDIO_DEVICE_NATIVE_FORMAT, AUDIO_DEVICE_MAX_CHANNELS
+from src.utils.metrics import metrics
+
+
+class LazyPyAudio:
+    """Stands in for ``pyaudio.PyAudio`` and initialises PortAudio on first use.
+
+    ``pyaudio.PyAudio()`` scans every host API and device, which dominates cold
+    start. Deferring it means a mode that never opens a stream never pays for it,
+    and the others pay for it on a worker thread (via ``get``) rather than at
+    construction time.
+    """
+
+    def __init__(self, factory=None):
+        self._factory = factory  # None means ``pyaudio.PyAudio``, imported on first use
+        self._pya = None
+        self._lock = threading.Lock()
+
+    @property
+    def initialized(self):
+        return self._pya is not None
+
+    def get(self):
+        """Returns the PyAudio instance, creating it if needed. Safe to call from any thread."""
+        if self._pya is None:
+            with self._lock:
+                if self._pya is None:
+                    started = time.perf_counter()
+                    if self._factory is None:
+                        import pyaudio
+
+                        self._factory = pyaudio.PyAudio
+                    self._pya = self._factory()
+                    metrics.observe("audio_device_init", time.perf_counter() - started)
+        return self._pya
+
+    def __getattr__(self, name):
+        return getattr(self.get(), name)
+
+    def terminate(self):
+        if self._pya is not None:
+            self._pya.terminate()
+            self._pya = None
+
+
+def open_stream(pya, rate, frames_per_buffer, output=False, native=AUDIO_DEVICE_NATIVE_FORMAT, **kwargs):
+    """Opens a 16-bit stream on the default device. Returns ``(stream, rate, channels)``.
+
+    With ``native`` the device is opened at its own default rate and channel
+    count, and ``frames_per_buffer`` is scaled to keep the same buffer duration;
+    the caller converts with a ``StreamingResampler``. If the device refuses its
+    native format, the stream is opened at ``rate`` in mono instead.
+    """
+    info = pya.get_default_output_device_info() if output else pya.get_default_input_device_info()
+    formats = [(rate, CHANNELS)]
+    if native:
+        max_channels = info["maxOutputChannels"] if output else info["maxInputChannels"]
+        device_rate = int(info["defaultSampleRate"])
+        device_channels = max(1, min(max_channels, AUDIO_DEVICE_MAX_CHANNELS))
+        if (device_rate, device_channels) != (rate, CHANNELS):
+            formats.insert(0, (device_rate, device_channels))
+    if output:
+        device = {"output": True, "output_device_index": info["index"]}
+    else:
+        device = {"input": True, "input_device_index": info["index"]}
+    for i, (device_rate, channels) in enumerate(formats):
+        try:
+            stream = pya.open(
+                format=FORMAT,
+                channels=channels,
+                rate=device_rate,
+                frames_per_buffer=round(frames_per_buffer * device_rate / rate),
+                **device,
+                **kwargs,
+            )
+        except OSError:
+            if i == len(formats) - 1:
+                raise
+            continue
+        return stream, device_rate, channels
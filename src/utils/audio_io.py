@@ -0,0 +1,298 @@
+import asyncio
+import time
+import wave
+from src.config import (
+    CHANNELS,
+    SEND_SAMPLE_RATE,
+    RECEIVE_SAMPLE_RATE,
+    CHUNK_SIZE,
+    AUDIO_INPUT,
+    AUDIO_OUTPUT,
+    AUDIO_REALTIME,
+    AUDIO_INPUT_TRAILING_SILENCE,
+)
+from src.utils.audio_devices import open_stream
+from src.utils.playback import PlaybackEngine
+from src.utils.resample import StreamingResampler
+
+SAMPLE_WIDTH = 2  # Bytes per 16-bit mono frame
+
+
+class RealtimePacer:
+    """Sleeps so audio passes at its real-time rate, like a sound card would clock it.
+
+    The schedule is absolute, so timing errors do not accumulate. After an idle
+    gap it restarts from now rather than trying to catch up.
+    """
+
+    def __init__(self, rate):
+        self.rate = rate
+        self._due = None
+
+    async def wait(self, frames):
+        now = time.perf_counter()
+        if self._due is None or self._due < now:
+            self._due = now
+        self._due += frames / self.rate
+        await asyncio.sleep(self._due - now)
+
+
+class PyAudioSource:
+    """Reads microphone audio from the default PyAudio input device.
+
+    The device is opened in its native format and converted to ``rate`` mono on
+    the reading thread.
+    """
+
+    def __init__(self, pya, rate=SEND_SAMPLE_RATE, frames_per_buffer=CHUNK_SIZE):
+        self.pya = pya
+        self.rate = rate
+        self.frames_per_buffer = frames_per_buffer
+        self.device_rate = rate
+        self.device_channels = CHANNELS
+        self._stream = None
+        self._resampler = None
+
+    async def start(self):
+        await asyncio.to_thread(self.pya.get)  # PortAudio init scans devices; keep it off the loop
+        self._stream, self.device_rate, self.device_channels = open_stream(
+            self.pya, self.rate, self.frames_per_buffer
+        )
+        self._resampler = StreamingResampler(self.device_rate, self.rate, self.device_channels, CHANNELS)
+
+    async def read(self, frames):
+        return await asyncio.to_thread(self._read, frames)
+
+    def _read(self, frames):
+        if self._resampler.passthrough:
+            return self._stream.read(frames, exception_on_overflow=False)
+        device_frames = self._resampler.input_frames_for(frames)
+        data = self._stream.read(device_frames, exception_on_overflow=False)
+        return self._resampler.process(data).tobytes()
+
+    def close(self):
+        if self._stream is not None:
+            self._stream.stop_stream()
+            self._stream.close()
+            self._stream = None
+
+    def summary(self):
+        return f"PyAudio input at {self.device_rate} Hz, {self.device_channels} channel(s)"
+
+
+class FileSource:
+    """Reads 16-bit PCM from a WAV file, converted to ``rate`` mono, or a raw mono PCM file at ``rate``.
+
+    With ``realtime`` each read takes as long as the audio it returns, like a
+    microphone; without it the file is read as fast as the pipeline consumes it.
+    After the file, ``trailing_silence`` seconds of silence are returned so voice
+    activity detection can end the last turn; then ``read`` returns ``b""``.
+    """
+
+    def __init__(
+        self,
+        path,
+        rate=SEND_SAMPLE_RATE,
+        realtime=AUDIO_REALTIME,
+        trailing_silence=AUDIO_INPUT_TRAILING_SILENCE,
+    ):
+        self.path = path
+        self.rate = rate
+        self.frames_read = 0
+        self._pacer = RealtimePacer(rate) if realtime else None
+        self._silence_frames = int(trailing_silence * rate)
+        self._file = None
+        self._wav = None
+        self._resampler = None
+
+    async def start(self):
+        if self.path.lower().endswith(".wav"):
+            self._wav = wave.open(self.path, "rb")
+            params = self._wav.getparams()
+            if params.sampwidth != SAMPLE_WIDTH:
+                self._wav.close()
+                raise ValueError(f"{self.path}: expected 16-bit audio, got {8 * params.sampwidth}-bit")
+            if params.framerate != self.rate or params.nchannels != CHANNELS:
+                self._resampler = StreamingResampler(params.framerate, self.rate, params.nchannels, CHANNELS)
+        else:
+            self._file = open(self.path, "rb")
+
+    def _read(self, frames):
+        if self._resampler is not None:
+            data = self._wav.readframes(self._resampler.input_frames_for(frames))
+            return self._resampler.process(data).tobytes() if data else b""
+        if self._wav is not None:
+            return self._wav.readframes(frames)
+        return self._file.read(frames * SAMPLE_WIDTH)
+
+    async def read(self, frames):
+        data = self._read(frames)
+        if not data and self._silence_frames:
+            count = min(frames, self._silence_frames)
+            self._silence_frames -= count
+            data = bytes(count * SAMPLE_WIDTH)
+        self.frames_read += len(data) // SAMPLE_WIDTH
+        if data and self._pacer is not None:
+            await self._pacer.wait(len(data) // SAMPLE_WIDTH)
+        return data
+
+    def close(self):
+        for f in (self._wav, self._file):
+            if f is not None:
+                f.close()
+        self._wav = self._file = None
+
+    def summary(self):
+        return f"{self.frames_read / self.rate:.1f} s read from {self.path}"
+
+
+class CaptureSource(FileSource):
+    """Replays the microphone audio a session capture (``.glrec``) sent.
+
+    Only detected speech was sent, so ``trailing_silence`` seconds of silence are
+    inserted wherever the capture ended a turn, letting voice activity detection
+    end the replayed turns at the same points.
+    """
+
+    def __init__(self, path, **kwargs):
+        super().__init__(path, **kwargs)
+        self._chunks = None
+        self._pending = bytearray()
+
+    async def start(self):
+        from src.utils.session_recording import SessionRecording, MIC_AUDIO, TURN_END_SENT
+
+        self._recording = SessionRecording(self.path)
+        turn_gap = bytes(self._silence_frames * SAMPLE_WIDTH)
+        self._chunks = (
+            record.payload if record.kind == MIC_AUDIO else turn_gap
+            for record in self._recording.records((MIC_AUDIO, TURN_END_SENT))
+        )
+
+    def _read(self, frames):
+        wanted = frames * SAMPLE_WIDTH
+        while len(self._pending) < wanted:
+            chunk = next(self._chunks, None)
+            if chunk is None:
+                break
+            self._pending += chunk
+        data = bytes(self._pending[:wanted])
+        del self._pending[:wanted]
+        return data
+
+    def close(self):
+        if self._chunks is not None:
+            self._chunks.close()
+            self._chunks = None
+            self._recording.close()
+
+
+class NullSink:
+    """Accepts response audio and discards it, counting what was written.
+
+    ``on_played``/``on_drained`` are called like ``PlaybackEngine`` does. With
+    ``realtime`` a write takes as long as the audio lasts; without it the
+    pipeline runs as fast as responses arrive.
+    """
+
+    def __init__(self, rate=RECEIVE_SAMPLE_RATE, realtime=AUDIO_REALTIME):
+        self.rate = rate
+        self.frames_written = 0
+        self.on_played = None
+        self.on_drained = None
+        self._pacer = RealtimePacer(rate) if realtime else None
+        self._drain_handle = None
+
+    async def start(self):
+        self.open()
+
+    def open(self):
+        pass
+
+    def close(self):
+        if self._drain_handle is not None:
+            self._drain_handle.cancel()
+            self._drain_handle = None
+
+    @property
+    def buffered_seconds(self):
+        return 0.0
+
+    async def write(self, data):
+        if self._drain_handle is not None:
+            self._drain_handle.cancel()
+        self._write(data)
+        self.frames_written += len(data) // SAMPLE_WIDTH
+        if self.on_played is not None:
+            self.on_played(data)
+        if self._pacer is not None:
+            await self._pacer.wait(len(data) // SAMPLE_WIDTH)
+        # Written audio has finished "playing"; report it unless more arrives first
+        self._drain_handle = asyncio.get_running_loop().call_soon(self._drained)
+
+    def _write(self, data):
+        pass
+
+    def _drained(self):
+        self._drain_handle = None
+        if self.on_drained is not None:
+            self.on_drained()
+
+    def flush(self):
+        """Nothing is buffered; written audio counts as played."""
+
+    def summary(self):
+        return f"{self.frames_written / self.rate:.1f} s of audio written"
+
+
+class FileSink(NullSink):
+    """Writes response audio to a WAV file, or raw PCM for any other extension."""
+
+    def __init__(self, path, rate=RECEIVE_SAMPLE_RATE, realtime=AUDIO_REALTIME):
+        super().__init__(rate, realtime)
+        self.path = path
+        self._file = None
+        self._wav = None
+
+    def open(self):
+        if self.path.lower().endswith(".wav"):
+            self._wav = wave.open(self.path, "wb")
+            self._wav.setnchannels(1)
+            self._wav.setsampwidth(SAMPLE_WIDTH)
+            self._wav.setframerate(self.rate)
+        else:
+            self._file = open(self.path, "wb")
+
+    def close(self):
+        super().close()
+        for f in (self._wav, self._file):
+            if f is not None:
+                f.close()
+        self._wav = self._file = None
+
+    def _write(self, data):
+        if self._wav is not None:
+            self._wav.writeframesraw(data)
+        else:
+            self._file.write(data)
+
+    def summary(self):
+        return f"{super().summary()} to {self.path}"
+
+
+def create_source(spec=AUDIO_INPUT, pya=None, realtime=AUDIO_REALTIME):
+    """Builds the microphone source: "pyaudio", a session capture (.glrec) or the path of a WAV/raw PCM file."""
+    if spec == "pyaudio":
+        return PyAudioSource(pya)
+    if spec.endswith(".glrec"):
+        return CaptureSource(spec, realtime=realtime)
+    return FileSource(spec, realtime=realtime)
+
+
+def create_sink(spec=AUDIO_OUTPUT, pya=None, realtime=AUDIO_REALTIME):
+    """Builds the response audio sink: "pyaudio", "null" or the path of a WAV/raw PCM file."""
+    if spec == "pyaudio":
+        return PlaybackEngine(pya)
+    if spec == "null":
+        return NullSink(realtime=realtime)
+    return FileSink(spec, realtime=realtime)
@@ -0,0 +1,135 @@
+import threading
+import time
+import cv2
+from src.config import (
+    CAMERA_DEVICE_INDEX,
+    CAMERA_CAPTURE_WIDTH,
+    CAMERA_CAPTURE_HEIGHT,
+    CAMERA_CAPTURE_FPS,
+)
+from src.utils.logger import get_logger
+
+
+class CameraGrabber:
+    """Drains a camera on a dedicated thread so the frame handed out is always current.
+
+    ``cv2.VideoCapture`` queues frames inside the driver, so reading once a second
+    returns a frame that is seconds old. The grabber thread calls ``grab()`` for
+    every frame the device produces, which only dequeues it, and decodes with
+    ``retrieve()`` only when ``read`` has asked for a frame. The device is asked
+    for the resolution and frame rate that are actually sent rather than its
+    (often much larger) default.
+
+    ``read`` has the same contract as ``VideoCapture.read`` and is called from a
+    worker thread; it blocks until the next frame has been grabbed.
+    """
+
+    def __init__(
+        self,
+        device_index=CAMERA_DEVICE_INDEX,
+        width=CAMERA_CAPTURE_WIDTH,
+        height=CAMERA_CAPTURE_HEIGHT,
+        fps=CAMERA_CAPTURE_FPS,
+        logger=None,
+    ):
+        self.device_index = device_index
+        self.width = width
+        self.height = height
+        self.fps = fps
+        self.logger = logger or get_logger()
+        self.frames_grabbed = 0
+        self.frames_decoded = 0
+        self.grab_failures = 0
+        self.cpu_seconds = 0.0  # CPU time of the grabber thread
+        self.last_captured_at = None  # time.perf_counter() of the frame last returned by read
+        self._cap = None
+        self._thread = None
+        self._error = None
+        self._stop_event = threading.Event()
+        self._opened = threading.Event()
+        self._cond = threading.Condition()
+        self._wanted = False
+        self._frame = None
+
+    def start(self):
+        """Starts the grabber thread; the device is opened on that thread."""
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name="CameraGrabber", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Signals the grabber thread to exit, waits for it and releases the device."""
+        self._stop_event.set()
+        with self._cond:
+            self._cond.notify_all()
+        if self._thread is not None:
+            self._thread.join(timeout=2.0)
+            self._thread = None
+
+    def read(self):
+        """Returns ``(True, frame)`` with the next frame from the device, or ``(False, None)`` once stopped."""
+        with self._cond:
+            self._wanted = True
+            self._frame = None
+            while self._frame is None and self._error is None and not self._stop_event.is_set():
+                self._cond.wait(timeout=0.5)
+            if self._error is not None:
+                raise self._error
+            frame, self._frame = self._frame, None
+        if frame is None:
+            return False, None
+        self.last_captured_at, image = frame
+        return True, image
+
+    def release(self):
+        self.stop()
+
+    def _open(self):
+        cap = cv2.VideoCapture(self.device_index)
+        if not cap.isOpened():
+            raise RuntimeError(f"Could not open camera {self.device_index}")
+        cap.set(cv2.CAP_PROP_FRAME_WIDTH, self.width)
+        cap.set(cv2.CAP_PROP_FRAME_HEIGHT, self.height)
+        cap.set(cv2.CAP_PROP_FPS, self.fps)
+        cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)  # Honoured by some backends only; draining covers the rest
+        self.logger.info(
+            f"Camera opened at {int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))}x"
+            f"{int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))}, {cap.get(cv2.CAP_PROP_FPS):.0f} fps."
+        )
+        return cap
+
+    def _run(self):
+        cap = None
+        try:
+            cpu_started = time.thread_time()
+            cap = self._open()
+            while not self._stop_event.is_set():
+                self.cpu_seconds = time.thread_time() - cpu_started
+                if not cap.grab():
+                    self.grab_failures += 1
+                    self._stop_event.wait(0.1)
+                    continue
+                captured_at = time.perf_counter()
+                self.frames_grabbed += 1
+                if not self._wanted:
+                    continue  # Nobody asked for this frame; skip decoding it
+                ret, image = cap.retrieve()
+                if not ret:
+                    continue
+                self.frames_decoded += 1
+                with self._cond:
+                    self._wanted = False
+                    self._frame = (captured_at, image)
+                    self._cond.notify_all()
+        except Exception as e:
+            # read() re-raises it with this traceback, and the handler logs it there
+            with self._cond:
+                self._error = e
+                self._cond.notify_all()
+        finally:
+            if cap is not None:
+                cap.release()
+
+    def summary(self):
+        decoded = 100.0 * self.frames_decoded / self.frames_grabbed if self.frames_grabbed else 0.0
+        return f"{self.frames_grabbed} frames grabbed, {self.frames_decoded} decoded ({decoded:.0f}%)"
@@ -0,0 +1,245 @@
+import asyncio
+import functools
+import os
+import sys
+import threading
+import time
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+from src.config import (
+    LOOP_LAG_INTERVAL,
+    SLOW_CALLBACK_THRESHOLD,
+    DIAGNOSTICS_MAX_STACKS,
+    DIAGNOSTICS_REPORT_INTERVAL,
+    DIAGNOSTICS_REPORT_PATH,
+)
+from src.utils.logger import get_logger
+from src.utils.metrics import metrics
+
+STACK_DEPTH = 12  # Innermost frames kept per captured stack
+ASYNCIO_DIR = os.path.dirname(asyncio.__file__)
+
+
+def _format_stack(frame):
+    """Formats the stack of the loop thread from the callback the loop is running, without asyncio's frames."""
+    frames = traceback.extract_stack(frame)
+    for i in range(len(frames) - 1, -1, -1):
+        if frames[i].filename.startswith(ASYNCIO_DIR):
+            if i < len(frames) - 1:
+                frames = frames[i + 1 :]
+            break
+    return "".join(traceback.format_list(frames[-STACK_DEPTH:]))
+
+
+class LoopLagMonitor:
+    """Measures event-loop scheduling lag and captures the stack of whatever blocks the loop.
+
+    A probe task sleeps ``interval`` seconds at a time; how much later than that
+    it wakes is the loop's lag, recorded as the ``event_loop_lag`` metric. A
+    watchdog thread checks the probe's heartbeat, and once the loop has been
+    blocked for ``threshold`` seconds it samples the loop thread's stack with
+    ``sys._current_frames``, while the blocking call is still running. When the
+    probe wakes again, the full stall duration is attributed to that stack.
+    """
+
+    def __init__(self, registry=metrics, interval=LOOP_LAG_INTERVAL, threshold=SLOW_CALLBACK_THRESHOLD, max_stacks=DIAGNOSTICS_MAX_STACKS, logger=None):
+        self.registry = registry
+        self.interval = interval
+        self.threshold = threshold
+        self.max_stacks = max_stacks
+        self.logger = logger
+        self.probes = 0
+        self.stalls = 0
+        self.max_lag = 0.0
+        self.stacks = {}  # Stack text -> [stalls, total seconds, longest seconds]
+        self._beat = None
+        self._sampled_stack = None
+        self._loop_thread_id = None
+        self._stop_event = threading.Event()
+        self._thread = None
+        self._task = None
+
+    def start(self):
+        """Starts the probe task on the running loop and the watchdog thread."""
+        self._loop_thread_id = threading.get_ident()
+        self._stop_event.clear()
+        self._task = asyncio.get_running_loop().create_task(self._probe())
+        self._thread = threading.Thread(target=self._watch, name="LoopWatchdog", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop_event.set()
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+        if self._thread is not None:
+            self._thread.join(timeout=1.0)
+            self._thread = None
+
+    async def _probe(self):
+        while True:
+            self._beat = time.perf_counter()
+            await asyncio.sleep(self.interval)
+            lag = max(0.0, time.perf_counter() - self._beat - self.interval)
+            self.probes += 1
+            self.max_lag = max(self.max_lag, lag)
+            self.registry.observe("event_loop_lag", lag)
+            if lag >= self.threshold:
+                self._record_stall(lag, self._sampled_stack)
+            self._sampled_stack = None
+
+    def _watch(self):
+        sampled_beat = None
+        while not self._stop_event.wait(self.threshold / 4):
+            beat = self._beat
+            if beat is None or beat == sampled_beat:
+                continue
+            if time.perf_counter() - beat - self.interval >= self.threshold:
+                frame = sys._current_frames().get(self._loop_thread_id)
+                if frame is not None:
+                    self._sampled_stack = _format_stack(frame)
+                sampled_beat = beat
+
+    def _record_stall(self, lag, stack):
+        self.stalls += 1
+        stack = stack or "(no stack captured: the stall ended before the watchdog sampled it)\n"
+        entry = self.stacks.get(stack)
+        if entry is None:
+            if len(self.stacks) >= self.max_stacks:
+                return
+            entry = self.stacks[stack] = [0, 0.0, 0.0]
+            if self.logger:
+                self.logger.warning(f"Event loop blocked for {1000 * lag:.0f} ms in:\n{stack.rstrip()}")
+        entry[0] += 1
+        entry[1] += lag
+        entry[2] = max(entry[2], lag)
+
+    def summary(self):
+        stats = self.registry.histogram("event_loop_lag").percentiles()
+        return (
+            f"lag p50={1000 * stats[0.5]:.1f}ms p99={1000 * stats[0.99]:.1f}ms max={1000 * self.max_lag:.1f}ms "
+            f"over {self.probes} probes, {self.stalls} stalls of {1000 * self.threshold:.0f} ms or more"
+        )
+
+
+def _job_name(fn):
+    """Name of the function behind an executor job; unwraps ``asyncio.to_thread``'s ``partial(context.run, func)``."""
+    while isinstance(fn, functools.partial):
+        if fn.args and getattr(fn.func, "__name__", None) == "run" and not isinstance(fn.func, functools.partial):
+            fn = fn.args[0]
+        else:
+            fn = fn.func
+    return getattr(fn, "__qualname__", None) or repr(fn)
+
+
+class TimedExecutor(ThreadPoolExecutor):
+    """Thread pool installed as the loop's default executor to time ``asyncio.to_thread`` jobs.
+
+    For every job, the time from submission until a worker thread picks it up
+    is recorded as ``executor_wait`` and the time it then runs as
+    ``executor_run``, overall and per function.
+    """
+
+    def __init__(self, registry=metrics, **kwargs):
+        kwargs.setdefault("thread_name_prefix", "asyncio")
+        super().__init__(**kwargs)
+        self.registry = registry
+        self.jobs = {}  # Function name -> [jobs, total wait, longest wait, total run]
+        self._jobs_lock = threading.Lock()
+
+    def submit(self, fn, /, *args, **kwargs):
+        submitted = time.perf_counter()
+        name = _job_name(fn)
+
+        def timed():
+            started = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                self._record(name, started - submitted, time.perf_counter() - started)
+
+        return super().submit(timed)
+
+    def _record(self, name, wait, run):
+        self.registry.observe("executor_wait", wait)
+        self.registry.observe("executor_run", run)
+        with self._jobs_lock:
+            entry = self.jobs.setdefault(name, [0, 0.0, 0.0, 0.0])
+            entry[0] += 1
+            entry[1] += wait
+            entry[2] = max(entry[2], wait)
+            entry[3] += run
+
+    def summary(self):
+        wait = self.registry.histogram("executor_wait")
+        stats = wait.percentiles()
+        return (
+            f"{wait.count} jobs on {self._max_workers} threads, "
+            f"wait p50={1000 * stats[0.5]:.1f}ms p99={1000 * stats[0.99]:.1f}ms"
+        )
+
+
+class Diagnostics:
+    """Diagnostics mode: loop lag and blocking-stack capture, executor wait timing and a periodic report.
+
+    ``run`` installs a ``TimedExecutor`` as the default executor, so it should
+    start before anything is offloaded with ``asyncio.to_thread``. Every
+    ``report_interval`` seconds a one-line summary is logged and the full
+    report, including the blocking stacks and the executor jobs that waited
+    longest, is written to ``path``.
+    """
+
+    def __init__(self, logger=None, registry=metrics, report_interval=DIAGNOSTICS_REPORT_INTERVAL, path=DIAGNOSTICS_REPORT_PATH):
+        self.logger = logger
+        self.report_interval = report_interval
+        self.path = path
+        self.lag_monitor = LoopLagMonitor(registry, logger=logger)
+        self.executor = TimedExecutor(registry)
+
+    async def run(self):
+        asyncio.get_running_loop().set_default_executor(self.executor)
+        self.lag_monitor.start()
+        try:
+            while True:
+                await asyncio.sleep(self.report_interval)
+                await self.report()
+        finally:
+            self.lag_monitor.stop()
+            await self.report()
+
+    async def report(self):
+        try:
+            if self.logger:
+                self.logger.info(f"Diagnostics: event loop {self.lag_monitor.summary()}; executor {self.executor.summary()}")
+            if self.path:
+                await asyncio.to_thread(self._write_file, self.format_report())
+        except Exception as e:
+            (self.logger or get_logger()).exception("Error writing the diagnostics report")
+
+    def format_report(self):
+        lines = [
+            f"Event loop: {self.lag_monitor.summary()}",
+            f"Executor: {self.executor.summary()}",
+            "",
+            "Executor jobs by total wait:",
+        ]
+        with self.executor._jobs_lock:
+            jobs = sorted(self.executor.jobs.items(), key=lambda item: item[1][1], reverse=True)
+        for name, (count, wait, longest, run) in jobs:
+            lines.append(
+                f"  {name}: {count} jobs, mean wait {1000 * wait / count:.1f}ms, "
+                f"max wait {1000 * longest:.1f}ms, mean run {1000 * run / count:.1f}ms"
+            )
+        lines += ["", "Blocking stacks by total time:"]
+        stacks = sorted(self.lag_monitor.stacks.items(), key=lambda item: item[1][1], reverse=True)
+        for stack, (count, total, longest) in stacks:
+            lines.append(f"  {count} stalls, {1000 * total:.0f} ms in total, longest {1000 * longest:.0f} ms:")
+            lines.extend("    " + line for line in stack.rstrip().splitlines())
+        return "\n".join(lines) + "\n"
+
+    def _write_file(self, text):
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        temp_path = f"{self.path}.tmp"
+        with open(temp_path, "w") as f:
+            f.write(text)
+        os.replace(temp_path, self.path)
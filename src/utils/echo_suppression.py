@@ -0,0 +1,125 @@
+import numpy as np
+from src.config import (
+    SEND_SAMPLE_RATE,
+    RECEIVE_SAMPLE_RATE,
+    ECHO_MAX_DELAY_MS,
+    ECHO_REFERENCE_SILENCE_DBFS,
+    ECHO_SUPPRESSION_GAIN,
+    BARGE_IN_MIN_DBFS,
+    BARGE_IN_MARGIN_DB,
+    BARGE_IN_CHUNKS,
+)
+
+
+def _level_db(samples):
+    if samples.size == 0:
+        return -200.0
+    return 20.0 * np.log10(np.sqrt(np.mean(samples * samples)) + 1e-9)
+
+
+class EchoSuppressor:
+    """Removes the assistant's own voice from the microphone signal using the playback reference.
+
+    Everything written to the speaker is pushed as a reference, converted to the
+    microphone rate. For each microphone chunk the reference is cross-correlated
+    (via FFT) over the expected echo delay range; the best-aligned, least-squares
+    scaled reference is subtracted and the residual is what the user said. When
+    the residual stays comparable to the echo for a few chunks, the user is
+    talking over the assistant and a barge-in is reported.
+    """
+
+    def __init__(
+        self,
+        mic_rate=SEND_SAMPLE_RATE,
+        reference_rate=RECEIVE_SAMPLE_RATE,
+        max_delay_ms=ECHO_MAX_DELAY_MS,
+        reference_silence_dbfs=ECHO_REFERENCE_SILENCE_DBFS,
+        suppression_gain=ECHO_SUPPRESSION_GAIN,
+        barge_in_min_dbfs=BARGE_IN_MIN_DBFS,
+        barge_in_margin_db=BARGE_IN_MARGIN_DB,
+        barge_in_chunks=BARGE_IN_CHUNKS,
+    ):
+        self.mic_rate = mic_rate
+        self.reference_rate = reference_rate
+        self.max_delay = mic_rate * max_delay_ms // 1000
+        self.reference_silence_dbfs = reference_silence_dbfs
+        self.suppression_gain = suppression_gain
+        self.barge_in_min_dbfs = barge_in_min_dbfs
+        self.barge_in_margin_db = barge_in_margin_db
+        self.barge_in_chunks = barge_in_chunks
+        self.echo_chunks = 0
+        self.barge_ins = 0
+        self._reference = np.zeros(self.max_delay + mic_rate, dtype=np.float32)
+        self._pending = np.zeros(0, dtype=np.float32)
+        self._resample_phase = 0.0
+        self._speaking_run = 0
+
+    def push_reference(self, pcm):
+        """Records audio about to be played (int16 PCM at the reference rate)."""
+        samples = np.frombuffer(pcm, dtype=np.int16).astype(np.float32) / 32768.0
+        if self.reference_rate != self.mic_rate:
+            step = self.reference_rate / self.mic_rate
+            positions = np.arange(self._resample_phase, len(samples), step)
+            self._resample_phase = positions[-1] + step - len(samples) if positions.size else 0.0
+            samples = np.interp(positions, np.arange(len(samples)), samples).astype(np.float32)
+        # Playback runs ahead of the microphone by at most the device buffer; cap runaway growth
+        self._pending = np.concatenate((self._pending, samples))[-len(self._reference):]
+
+    def _advance_reference(self, frames):
+        """Moves ``frames`` samples of pending playback into the history, in step with the mic."""
+        taken = self._pending[:frames]
+        self._pending = self._pending[frames:]
+        self._reference[:-frames] = self._reference[frames:]
+        self._reference[-frames:] = 0.0
+        self._reference[len(self._reference) - frames : len(self._reference) - frames + len(taken)] = taken
+
+    def process(self, pcm):
+        """Returns ``(cleaned_pcm, barge_in)`` for one microphone chunk."""
+        mic = np.frombuffer(pcm, dtype=np.int16).astype(np.float32) / 32768.0
+        n = len(mic)
+        if n == 0:
+            return pcm, False
+        self._advance_reference(min(n, len(self._reference)))
+        window = self._reference[-(n + self.max_delay):]
+        if _level_db(window) < self.reference_silence_dbfs:
+            self._speaking_run = 0
+            return pcm, False
+
+        echo = self._estimate_echo(mic, window)
+        residual = mic - echo
+        residual_db = _level_db(residual)
+        user_speaking = (
+            residual_db > self.barge_in_min_dbfs
+            and residual_db > _level_db(echo) - self.barge_in_margin_db
+        )
+        if user_speaking:
+            self._speaking_run += 1
+        else:
+            self._speaking_run = 0
+            self.echo_chunks += 1
+            residual *= self.suppression_gain
+
+        barge_in = self._speaking_run == self.barge_in_chunks
+        if barge_in:
+            self.barge_ins += 1
+        cleaned = np.clip(residual * 32768.0, -32768, 32767).astype(np.int16)
+        return cleaned.tobytes(), barge_in
+
+    def _estimate_echo(self, mic, window):
+        n = len(mic)
+        size = 1 << int(np.ceil(np.log2(len(window) + n)))
+        # Cross-correlation of every reference alignment with the mic chunk in one FFT pass
+        spectrum = np.fft.rfft(window, size) * np.conj(np.fft.rfft(mic, size))
+        correlation = np.fft.irfft(spectrum, size)[: len(window) - n + 1]
+        cumulative = np.concatenate(([0.0], np.cumsum(window * window, dtype=np.float64)))
+        energies = cumulative[n:] - cumulative[:-n]
+        scores = correlation * np.abs(correlation) / (energies + 1e-9)
+        offset = int(np.argmax(scores))
+        aligned = window[offset : offset + n]
+        gain = correlation[offset] / (energies[offset] + 1e-9)
+        if gain <= 0:
+            return np.zeros_like(mic)
+        return gain * aligned
+
+    def summary(self):
+        return f"{self.echo_chunks} echo chunks suppressed, {self.barge_ins} barge-ins"
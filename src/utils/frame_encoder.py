@@ -0,0 +1,153 @@
+import io
+import time
+import cv2
+import numpy as np
+import PIL.Image
+from src.config import FRAME_ENCODER_BACKEND, FRAME_IMAGE_FORMAT
+from src.utils.metrics import metrics
+
+# libjpeg-turbo bindings are optional; fall back to OpenCV/PIL when missing
+try:
+    from turbojpeg import TurboJPEG, TJPF_BGR, TJPF_BGRA
+except ImportError:
+    TurboJPEG = None
+
+IMAGE_FORMATS = {
+    "jpeg": {"mime_type": "image/jpeg", "extension": ".jpg", "pil_format": "JPEG"},
+    "webp": {"mime_type": "image/webp", "extension": ".webp", "pil_format": "WEBP"},
+}
+
+
+class EncoderStats:
+    """Running per-frame encode time and output size for one encoder."""
+
+    def __init__(self):
+        self.frames = 0
+        self.total_seconds = 0.0
+        self.total_bytes = 0
+        self.last_seconds = 0.0
+        self.last_bytes = 0
+
+    def record(self, seconds, nbytes):
+        self.frames += 1
+        self.total_seconds += seconds
+        self.total_bytes += nbytes
+        self.last_seconds = seconds
+        self.last_bytes = nbytes
+
+    @property
+    def avg_ms(self):
+        return 1000.0 * self.total_seconds / self.frames if self.frames else 0.0
+
+    @property
+    def avg_bytes(self):
+        return self.total_bytes / self.frames if self.frames else 0.0
+
+    def summary(self):
+        return f"{self.frames} frames, {self.avg_ms:.1f} ms/frame, {self.avg_bytes / 1024:.1f} KiB/frame"
+
+
+def available_backends(image_format=FRAME_IMAGE_FORMAT):
+    """Lists the encoder backends usable on this host for ``image_format``, fastest first."""
+    backends = []
+    if TurboJPEG is not None and image_format == "jpeg":
+        backends.append("turbojpeg")
+    backends.extend(["opencv", "pil"])
+    return backends
+
+
+class FrameEncoder:
+    """Encodes BGR/BGRA NumPy frames straight to JPEG or WebP bytes.
+
+    Frames are resized directly from the capture buffer into a preallocated
+    destination array, and the output buffer is reused between frames, so a frame
+    is copied once by the resize and once by the codec.
+    """
+
+    def __init__(self, backend=FRAME_ENCODER_BACKEND, image_format=FRAME_IMAGE_FORMAT):
+        if image_format not in IMAGE_FORMATS:
+            raise ValueError(f"Unsupported image format: {image_format}")
+        supported = available_backends(image_format)
+        if backend == "auto":
+            backend = supported[0]
+        elif backend not in supported:
+            raise ValueError(f"Encoder backend '{backend}' is not available for {image_format}")
+        self.backend = backend
+        self.image_format = image_format
+        self.mime_type = IMAGE_FORMATS[image_format]["mime_type"]
+        self.stats = EncoderStats()
+        self._resize_buffer = None
+        self._output = io.BytesIO()
+        self._turbojpeg = TurboJPEG() if backend == "turbojpeg" else None
+        self._encode_frame = getattr(self, f"_encode_{backend}")
+
+    def encode(self, frame, max_size, quality):
+        """Encodes a HxWx3 (BGR) or HxWx4 (BGRA) uint8 frame. Returns a bytes-like object."""
+        started = time.perf_counter()
+        resized = self._resize(frame, max_size)
+        data = self._encode_frame(resized, quality)
+        elapsed = time.perf_counter() - started
+        self.stats.record(elapsed, len(data))
+        metrics.observe("frame_encode", elapsed)
+        return data
+
+    def _resize(self, frame, max_size):
+        height, width = frame.shape[:2]
+        scale = max_size / max(height, width)
+        if scale >= 1.0:
+            return frame
+        size = (max(1, round(width * scale)), max(1, round(height * scale)))
+        shape = (size[1], size[0]) + frame.shape[2:]
+        if self._resize_buffer is None or self._resize_buffer.shape != shape:
+            self._resize_buffer = np.empty(shape, dtype=frame.dtype)
+        cv2.resize(frame, size, dst=self._resize_buffer, interpolation=cv2.INTER_AREA)
+        return self._resize_buffer
+
+    def _encode_turbojpeg(self, frame, quality):
+        pixel_format = TJPF_BGRA if frame.shape[2] == 4 else TJPF_BGR
+        return self._turbojpeg.encode(frame, quality=quality, pixel_format=pixel_format)
+
+    def _encode_opencv(self, frame, quality):
+        if self.image_format == "jpeg":
+            params = [cv2.IMWRITE_JPEG_QUALITY, quality]
+        else:
+            params = [cv2.IMWRITE_WEBP_QUALITY, quality]
+        ok, encoded = cv2.imencode(IMAGE_FORMATS[self.image_format]["extension"], frame, params)
+        if not ok:
+            raise RuntimeError(f"OpenCV failed to encode frame as {self.image_format}")
+        return memoryview(encoded.reshape(-1))
+
+    def _encode_pil(self, frame, quality):
+        height, width = frame.shape[:2]
+        raw_mode = "BGRX" if frame.shape[2] == 4 else "BGR"
+        # frombuffer wraps the array without copying when it is contiguous
+        img = PIL.Image.frombuffer(
+            "RGB", (width, height), np.ascontiguousarray(frame), "raw", raw_mode, 0, 1
+        )
+        self._output.seek(0)
+        self._output.truncate()
+        img.save(self._output, format=IMAGE_FORMATS[self.image_format]["pil_format"], quality=quality)
+        return self._output.getvalue()
+
+
+def benchmark_backends(frame, max_size=1024, quality=75, repeats=20, image_format=FRAME_IMAGE_FORMAT):
+    """Encodes ``frame`` with every available backend and returns their stats by name."""
+    results = {}
+    for backend in available_backends(image_format):
+        encoder = FrameEncoder(backend, image_format)
+        for _ in range(repeats):
+            encoder.encode(frame, max_size, quality)
+        results[backend] = encoder.stats
+    return results
+
+
+if __name__ == "__main__":
+    # Compare backends on a synthetic 1080p BGRA frame: python -m src.utils.frame_encoder
+    rng = np.random.default_rng(0)
+    gradient = np.linspace(0, 255, 1920, dtype=np.uint8)
+    test_frame = np.empty((1080, 1920, 4), dtype=np.uint8)
+    test_frame[...] = gradient[None, :, None]
+    test_frame[200:600, 300:900] = rng.integers(0, 256, (400, 600, 4), dtype=np.uint8)
+    for image_format in IMAGE_FORMATS:
+        for name, stats in benchmark_backends(test_frame, image_format=image_format).items():
+            print(f"{image_format:5} {name:10} {stats.summary()}")
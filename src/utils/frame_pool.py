@@ -0,0 +1,156 @@
+import multiprocessing
+import signal
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+import numpy as np
+from src.config import FRAME_ENCODER_BACKEND, FRAME_IMAGE_FORMAT, FRAME_ENCODE_WORKERS
+from src.utils.frame_encoder import IMAGE_FORMATS, EncoderStats, FrameEncoder, available_backends
+from src.utils.metrics import metrics
+
+# Per worker process: one FrameEncoder per (backend, format) and the shared memory block attached per source
+_worker_encoders = {}
+_worker_blocks = {}
+
+
+def _init_worker():
+    # Ctrl+C reaches the whole process group; the parent shuts the pool down in order instead
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+
+
+def _warm_up(backend, image_format):
+    """Imports the codecs and builds the encoder in a worker before the first frame arrives."""
+    _worker_encoder(backend, image_format)
+
+
+def _worker_encoder(backend, image_format):
+    encoder = _worker_encoders.get((backend, image_format))
+    if encoder is None:
+        encoder = _worker_encoders[(backend, image_format)] = FrameEncoder(backend, image_format)
+    return encoder
+
+
+def _encode_shared(source, block_name, shape, dtype, max_size, quality, backend, image_format):
+    """Runs in a worker process: encodes the frame staged in shared memory. Returns ``(bytes, cpu_seconds)``."""
+    cpu_started = time.process_time()
+    block = _worker_blocks.get(source)
+    if block is None or block.name != block_name:
+        if block is not None:
+            block.close()  # The source outgrew it and the parent has freed it
+        block = _worker_blocks[source] = shared_memory.SharedMemory(name=block_name)
+    frame = np.ndarray(shape, dtype=dtype, buffer=block.buf)
+    data = bytes(_worker_encoder(backend, image_format).encode(frame, max_size, quality))
+    del frame  # Release the view so the block can be closed when it is replaced
+    return data, time.process_time() - cpu_started
+
+
+class FrameEncodePool:
+    """Worker processes that JPEG/WebP-encode frames for several capture sources in parallel.
+
+    Encoding holds the GIL for most of its run, so two sources encoding on
+    threads of one process take turns. The pool spreads them over processes
+    (started with ``spawn``, which is safe next to the capture threads) so they
+    scale across cores. Use ``encoder`` to get a ``FrameEncoder`` stand-in for
+    each source.
+    """
+
+    def __init__(self, workers=FRAME_ENCODE_WORKERS, backend=FRAME_ENCODER_BACKEND, image_format=FRAME_IMAGE_FORMAT):
+        if image_format not in IMAGE_FORMATS:
+            raise ValueError(f"Unsupported image format: {image_format}")
+        supported = available_backends(image_format)
+        if backend == "auto":
+            backend = supported[0]
+        elif backend not in supported:
+            raise ValueError(f"Encoder backend '{backend}' is not available for {image_format}")
+        self.workers = workers
+        self.backend = backend
+        self.image_format = image_format
+        self.executor = None
+        self.encoders = []
+
+    def start(self):
+        """Starts the worker processes and loads the encoder in each, in the background."""
+        if self.executor is None:
+            self.executor = ProcessPoolExecutor(
+                self.workers, mp_context=multiprocessing.get_context("spawn"), initializer=_init_worker
+            )
+            for _ in range(self.workers):
+                self.executor.submit(_warm_up, self.backend, self.image_format)
+
+    def encoder(self, source):
+        """Returns a ``SharedMemoryEncoder`` for ``source`` that encodes in this pool."""
+        encoder = SharedMemoryEncoder(self, source)
+        self.encoders.append(encoder)
+        return encoder
+
+    def close(self):
+        if self.executor is not None:
+            self.executor.shutdown(wait=True, cancel_futures=True)
+            self.executor = None
+        for encoder in self.encoders:
+            encoder.close()
+
+
+class SharedMemoryEncoder:
+    """Stands in for ``FrameEncoder`` in a capture loop and encodes in a ``FrameEncodePool`` worker.
+
+    ``encode`` copies the frame once into a shared memory block owned by this
+    source, so only the block's name and the frame's shape cross the process
+    boundary; the encoded image comes back as ``bytes``. It blocks its caller
+    (a capture thread or a ``to_thread`` job) until the worker is done, and a
+    source has one frame in flight at a time, which is what makes reusing the
+    block safe. ``cpu_seconds`` totals the worker CPU time spent on this
+    source's frames.
+    """
+
+    def __init__(self, pool, source):
+        self.pool = pool
+        self.source = source
+        self.backend = f"{pool.backend}, {pool.workers} worker processes"
+        self.image_format = pool.image_format
+        self.mime_type = IMAGE_FORMATS[pool.image_format]["mime_type"]
+        self.stats = EncoderStats()
+        self.cpu_seconds = 0.0
+        self._block = None
+
+    def encode(self, frame, max_size, quality):
+        """Encodes a HxWx3 (BGR) or HxWx4 (BGRA) uint8 frame in a worker process. Returns ``bytes``."""
+        started = time.perf_counter()
+        if self._block is None or self._block.size < frame.nbytes:
+            self._grow_block(frame.nbytes)
+        staged = np.ndarray(frame.shape, dtype=frame.dtype, buffer=self._block.buf)
+        staged[...] = frame
+        del staged
+        future = self.pool.executor.submit(
+            _encode_shared,
+            self.source,
+            self._block.name,
+            frame.shape,
+            frame.dtype.str,
+            max_size,
+            quality,
+            self.pool.backend,
+            self.pool.image_format,
+        )
+        data, cpu_seconds = future.result()
+        elapsed = time.perf_counter() - started
+        self.cpu_seconds += cpu_seconds
+        self.stats.record(elapsed, len(data))
+        metrics.observe("frame_encode", elapsed)
+        return data
+
+    def _grow_block(self, size):
+        # Cropped screen regions vary in size; doubling keeps reallocations rare
+        if self._block is not None:
+            size = max(size, 2 * self._block.size)
+            self._free_block()
+        self._block = shared_memory.SharedMemory(create=True, size=size)
+
+    def _free_block(self):
+        self._block.close()
+        self._block.unlink()
+        self._block = None
+
+    def close(self):
+        if self._block is not None:
+            self._free_block()
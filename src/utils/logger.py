@@ -1,14 +1,83 @@
+import atexit
+import json
 import logging
+import queue
 import sys
 import os
-from logging.handlers import RotatingFileHandler
-from src.config import LOG_FILE_PATH, DEFAULT_LOG_LEVEL
+import threading
+import time
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+from src.config import (
+    LOG_FILE_PATH,
+    DEFAULT_LOG_LEVEL,
+    LOG_QUEUE_SIZE,
+    LOG_EVENT_SAMPLE_EVERY,
+    LOG_EVENT_MAX_PER_SECOND,
+)
 
-def setup_logger(name, log_to_file=True, level=DEFAULT_LOG_LEVEL):
+_listeners = []
+
+
+class JsonLinesFormatter(logging.Formatter):
+    """Formats a record as one compact JSON object per line."""
+
+    def format(self, record):
+        entry = {
+            "ts": round(record.created, 6),
+            "level": record.levelname,
+            "logger": record.name,
+            "msg": record.getMessage(),
+        }
+        event = getattr(record, "event", None)
+        if event is not None:
+            entry["event"] = event
+            entry.update(record.fields)
+        if record.exc_info:
+            entry["exc"] = self.formatException(record.exc_info)
+        return json.dumps(entry, separators=(",", ":"), default=str)
+
+
+class NonBlockingQueueHandler(QueueHandler):
+    """Hands records to the listener thread without formatting them or ever blocking.
+
+    When the queue is full the record is dropped and counted in ``dropped``.
+    """
+
+    def __init__(self, log_queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record):
+        # Formatting happens on the listener thread; only resolve %-args here since
+        # they may refer to objects the caller mutates afterwards
+        if record.args:
+            record.msg = record.getMessage()
+            record.args = None
+        return record
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+def _is_console_record(record):
+    # Structured telemetry events go to the log file only
+    return getattr(record, "event", None) is None
+
+
+def setup_logger(name, log_to_file=True, level=DEFAULT_LOG_LEVEL, console=True):
+    """Returns a logger whose records are written by a background thread.
+
+    The log file gets JSON lines; the console gets plain messages, excluding
+    telemetry events logged with ``log_event``.
+    """
     logger = logging.getLogger(name)
     logger.setLevel(getattr(logging, level.upper(), logging.INFO))
     logger.propagate = False  # Prevent duplicate log messages
 
+    handlers = []
     if log_to_file:
         # Ensure the directory for the log file exists
         log_dir = os.path.dirname(LOG_FILE_PATH)
@@ -19,11 +88,91 @@ def setup_logger(name, log_to_file=True, level=DEFAULT_LOG_LEVEL):
             sys.exit(1)  # Exit if the log directory cannot be created
 
         file_handler = RotatingFileHandler(LOG_FILE_PATH, maxBytes=5*1024*1024, backupCount=2)
-        file_formatter = logging.Formatter(
-            "[%(asctime)s] [%(levelname)s] %(message)s",
-            datefmt="%Y-%m-%d %H:%M:%S"
-        )
-        file_handler.setFormatter(file_formatter)
-        logger.addHandler(file_handler)
-
-    return logger
\ No newline at end of file
+        file_handler.setFormatter(JsonLinesFormatter())
+        handlers.append(file_handler)
+
+    if console:
+        console_handler = logging.StreamHandler(sys.stdout)
+        console_handler.setFormatter(logging.Formatter("%(message)s"))
+        console_handler.addFilter(_is_console_record)
+        handlers.append(console_handler)
+
+    log_queue = queue.Queue(maxsize=LOG_QUEUE_SIZE)
+    listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+    listener.start()
+    _listeners.append(listener)
+    logger.addHandler(NonBlockingQueueHandler(log_queue))
+
+    return logger
+
+
+def get_logger(name="GeminiLive"):
+    """Returns ``name`` as configured by ``setup_logger``, or a console-only logger if it was not."""
+    logger = logging.getLogger(name)
+    if not logger.handlers:
+        logger = setup_logger(name, log_to_file=False)
+    return logger
+
+
+def shutdown_logging():
+    """Writes out queued records and stops the listener threads."""
+    while _listeners:
+        _listeners.pop().stop()
+
+
+atexit.register(shutdown_logging)
+
+
+class EventLimiter:
+    """Decides which telemetry events to log, before a record is even created.
+
+    Events listed in ``sample_every`` keep one occurrence in N. Every event name
+    is further capped at ``max_per_second``; the number of events skipped since
+    the last logged one is reported in its ``suppressed`` field.
+    """
+
+    def __init__(self, sample_every=LOG_EVENT_SAMPLE_EVERY, max_per_second=LOG_EVENT_MAX_PER_SECOND):
+        self.sample_every = sample_every
+        self.max_per_second = max_per_second
+        self._seen = {}
+        self._suppressed = {}
+        self._window = {}  # Event name -> (window start, events logged in window)
+        self._lock = threading.Lock()
+
+    def allow(self, event):
+        """Returns the number of suppressed events to report, or None to skip this one."""
+        with self._lock:
+            seen = self._seen.get(event, 0)
+            self._seen[event] = seen + 1
+            every = self.sample_every.get(event, 1)
+            if seen % every == 0 and self._within_rate(event):
+                return self._suppressed.pop(event, 0)
+            self._suppressed[event] = self._suppressed.get(event, 0) + 1
+            return None
+
+    def _within_rate(self, event):
+        if not self.max_per_second:
+            return True
+        now = time.monotonic()
+        start, count = self._window.get(event, (now, 0))
+        if now - start >= 1.0:
+            start, count = now, 0
+        if count >= self.max_per_second:
+            return False
+        self._window[event] = (start, count + 1)
+        return True
+
+
+event_limiter = EventLimiter()
+
+
+def log_event(logger, event, level=logging.INFO, **fields):
+    """Logs a structured telemetry event, sampled and rate limited per event name."""
+    if not logger.isEnabledFor(level):
+        return
+    suppressed = event_limiter.allow(event)
+    if suppressed is None:
+        return
+    if suppressed:
+        fields["suppressed"] = suppressed
+    logger.log(level, event, extra={"event": event, "fields": fields})
@@ -0,0 +1,61 @@
+AUDIO_MIME_TYPE = "audio/pcm"
+
+
+class MediaStats:
+    """Counts media messages sent and the payload copies made on their way to ``session.send``."""
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.messages = 0
+        self.payload_bytes = 0
+        self.copies = 0
+        self.copied_bytes = 0
+
+    def summary(self):
+        per_message = self.copies / self.messages if self.messages else 0.0
+        return (
+            f"{self.messages} media messages, {self.payload_bytes / 1024:.1f} KiB, "
+            f"{self.copies} payload copies ({per_message:.2f}/message, {self.copied_bytes / 1024:.1f} KiB)"
+        )
+
+
+media_stats = MediaStats()
+
+
+class MediaMessage:
+    """An audio chunk or encoded image on its way to the Live session, kept as raw bytes.
+
+    ``payload`` is any bytes-like object: ``bytes`` from the microphone, or a
+    ``memoryview`` of the encoder's output. It is passed through queues untouched;
+    ``to_input`` is the single point where it is turned into what the session
+    accepts, and the Live client base64-encodes it once when it serialises the
+    message.
+    """
+
+    __slots__ = ("mime_type", "payload")
+
+    def __init__(self, mime_type, payload):
+        self.mime_type = mime_type
+        self.payload = payload
+
+    @property
+    def nbytes(self):
+        return memoryview(self.payload).nbytes
+
+    def to_input(self):
+        """Returns the ``session.send`` input, copying the payload only if it is not ``bytes``."""
+        payload = self.payload
+        if not isinstance(payload, bytes):
+            payload = bytes(payload)
+            media_stats.copies += 1
+            media_stats.copied_bytes += len(payload)
+        media_stats.messages += 1
+        media_stats.payload_bytes += len(payload)
+        return {"mime_type": self.mime_type, "data": payload}
+
+
+def audio_message(data):
+    """Wraps a chunk of 16 kHz PCM from the microphone."""
+    return MediaMessage(AUDIO_MIME_TYPE, data)
@@ -0,0 +1,162 @@
+import asyncio
+import collections
+import os
+import threading
+import time
+from src.config import (
+    METRICS_RESERVOIR_SIZE,
+    METRICS_EXPORT_INTERVAL,
+    METRICS_FILE_PATH,
+)
+from src.utils.logger import get_logger
+
+QUANTILES = (0.5, 0.95, 0.99)
+
+
+class Histogram:
+    """Latency distribution over the most recent observations.
+
+    Keeps a fixed-size reservoir of the latest samples for percentiles, plus
+    lifetime count and sum. Observations may come from any thread.
+    """
+
+    def __init__(self, size=METRICS_RESERVOIR_SIZE):
+        self.count = 0
+        self.total = 0.0
+        self._samples = collections.deque(maxlen=size)
+        self._lock = threading.Lock()
+
+    def observe(self, seconds):
+        with self._lock:
+            self.count += 1
+            self.total += seconds
+            self._samples.append(seconds)
+
+    def percentiles(self, quantiles=QUANTILES):
+        with self._lock:
+            ordered = sorted(self._samples)
+        if not ordered:
+            return {q: 0.0 for q in quantiles}
+        last = len(ordered) - 1
+        return {q: ordered[min(last, int(q * len(ordered)))] for q in quantiles}
+
+
+class MetricsRegistry:
+    """Named latency histograms for the capture, send, response and playback stages."""
+
+    def __init__(self):
+        self._histograms = {}
+        self._lock = threading.Lock()
+
+    def histogram(self, name):
+        histogram = self._histograms.get(name)
+        if histogram is None:
+            with self._lock:
+                histogram = self._histograms.setdefault(name, Histogram())
+        return histogram
+
+    def observe(self, name, seconds):
+        self.histogram(name).observe(seconds)
+
+    def observe_since(self, name, started):
+        """Records the time elapsed since ``started`` (a ``time.perf_counter()`` value)."""
+        self.histogram(name).observe(time.perf_counter() - started)
+
+    def snapshot(self):
+        with self._lock:
+            histograms = dict(self._histograms)
+        return {
+            name: {"count": h.count, "sum": h.total, **h.percentiles()}
+            for name, h in sorted(histograms.items())
+        }
+
+    def format_log(self):
+        lines = []
+        for name, stats in self.snapshot().items():
+            lines.append(
+                f"{name}: n={stats['count']} p50={1000 * stats[0.5]:.1f}ms "
+                f"p95={1000 * stats[0.95]:.1f}ms p99={1000 * stats[0.99]:.1f}ms"
+            )
+        return "; ".join(lines)
+
+    def format_prometheus(self):
+        """Renders every histogram as a Prometheus summary in the text exposition format."""
+        lines = []
+        for name, stats in self.snapshot().items():
+            metric = f"gemini_live_{name}_seconds"
+            lines.append(f"# TYPE {metric} summary")
+            for q in QUANTILES:
+                lines.append(f'{metric}{{quantile="{q}"}} {stats[q]:.6f}')
+            lines.append(f"{metric}_sum {stats['sum']:.6f}")
+            lines.append(f"{metric}_count {stats['count']}")
+        return "\n".join(lines) + "\n"
+
+
+# Process-wide registry shared by all handlers
+metrics = MetricsRegistry()
+
+
+class TurnTimer:
+    """Times one conversation turn: last send -> first response -> first audio played."""
+
+    def __init__(self, registry=metrics):
+        self.registry = registry
+        self._last_sent = None
+        self._in_turn = False
+        self._first_audio = None
+
+    def mark_sent(self):
+        self._last_sent = time.perf_counter()
+
+    def mark_response(self, has_audio):
+        now = time.perf_counter()
+        if not self._in_turn:
+            self._in_turn = True
+            if self._last_sent is not None:
+                self.registry.observe("send_to_first_response", now - self._last_sent)
+        if has_audio and self._first_audio is None:
+            self._first_audio = now
+
+    def mark_played(self):
+        if self._first_audio is not None:
+            self.registry.observe_since("first_response_to_playback", self._first_audio)
+            self._first_audio = None
+
+    def end_turn(self):
+        self._in_turn = False
+
+
+class MetricsExporter:
+    """Periodically writes the registry to the log and to a Prometheus text file."""
+
+    def __init__(self, registry=metrics, logger=None, path=METRICS_FILE_PATH, interval=METRICS_EXPORT_INTERVAL):
+        self.registry = registry
+        self.logger = logger
+        self.path = path
+        self.interval = interval
+
+    async def run(self):
+        try:
+            while True:
+                await asyncio.sleep(self.interval)
+                await self.export()
+        finally:
+            await self.export()
+
+    async def export(self):
+        try:
+            if self.logger:
+                summary = self.registry.format_log()
+                if summary:
+                    self.logger.info(f"Latency {summary}")
+            if self.path:
+                await asyncio.to_thread(self._write_file, self.registry.format_prometheus())
+        except Exception as e:
+            (self.logger or get_logger()).exception("Error exporting metrics")
+
+    def _write_file(self, text):
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        temp_path = f"{self.path}.tmp"
+        with open(temp_path, "w") as f:
+            f.write(text)
+        os.replace(temp_path, self.path)  # Scrapers never see a half-written file
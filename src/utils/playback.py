@@ -0,0 +1,214 @@
+import asyncio
+import time
+import numpy as np
+from src.config import (
+    CHANNELS,
+    RECEIVE_SAMPLE_RATE,
+    PLAYBACK_BUFFER_SECONDS,
+    PLAYBACK_JITTER_TARGET_MS,
+    PLAYBACK_FRAMES_PER_BUFFER,
+)
+from src.utils.audio_devices import open_stream
+from src.utils.metrics import metrics
+from src.utils.resample import StreamingResampler
+
+PA_CONTINUE = 0  # pyaudio.paContinue, spelled out so text mode never loads PortAudio
+
+
+class SampleRingBuffer:
+    """Preallocated single-producer, single-consumer ring of int16 samples.
+
+    The producer only ever advances ``_write_index`` and the consumer only ever
+    advances ``_read_index``. Both are monotonically increasing counters, so each
+    side can read the other's index without a lock. A flush is requested by the
+    producer and applied by the consumer, keeping that rule intact.
+    """
+
+    def __init__(self, capacity):
+        self.capacity = capacity
+        self._buffer = np.zeros(capacity, dtype=np.int16)
+        self._write_index = 0
+        self._read_index = 0
+        self._flush_to = 0
+
+    def available(self):
+        return self._write_index - max(self._read_index, self._flush_to)
+
+    def free(self):
+        return self.capacity - self.available()
+
+    def write(self, samples):
+        """Copies as many samples as fit. Returns the number written. Producer side."""
+        count = min(len(samples), self.free())
+        start = self._write_index % self.capacity
+        first = min(count, self.capacity - start)
+        self._buffer[start : start + first] = samples[:first]
+        self._buffer[: count - first] = samples[first:count]
+        self._write_index += count
+        return count
+
+    def read_into(self, out):
+        """Fills ``out`` from the buffer. Returns the number of samples read. Consumer side."""
+        if self._flush_to > self._read_index:
+            self._read_index = self._flush_to
+        count = min(len(out), self._write_index - self._read_index)
+        start = self._read_index % self.capacity
+        first = min(count, self.capacity - start)
+        out[:first] = self._buffer[start : start + first]
+        out[first:count] = self._buffer[: count - first]
+        self._read_index += count
+        return count
+
+    def flush(self):
+        """Discards everything written so far. Producer side; applied on the next read."""
+        self._flush_to = self._write_index
+
+
+class PlaybackEngine:
+    """Plays 24 kHz int16 audio from a ring buffer using PyAudio's callback mode.
+
+    The PortAudio thread pulls samples straight from the ring buffer, so playback
+    does not depend on the event loop being free. Playback starts once
+    ``jitter_target_ms`` of audio is buffered (or the producer has gone quiet).
+    Running dry mid-response is counted as an underrun and buffering starts
+    again. ``flush`` silences the output within one device buffer.
+
+    The device is opened in its native rate and channel count; the callback
+    converts each device buffer from the ring's 24 kHz mono as it is pulled.
+    """
+
+    def __init__(
+        self,
+        pya,
+        rate=RECEIVE_SAMPLE_RATE,
+        buffer_seconds=PLAYBACK_BUFFER_SECONDS,
+        jitter_target_ms=PLAYBACK_JITTER_TARGET_MS,
+        frames_per_buffer=PLAYBACK_FRAMES_PER_BUFFER,
+    ):
+        self.pya = pya
+        self.rate = rate
+        self.frames_per_buffer = frames_per_buffer
+        self.jitter_target = rate * jitter_target_ms // 1000
+        self.ring = SampleRingBuffer(int(rate * buffer_seconds))
+        self.underruns = 0
+        self.producer_waits = 0  # Times write() waited for room; backpressure, no audio is lost
+        self.on_played = None  # Called on the event loop with each block sent to the device
+        self.on_drained = None  # Called on the event loop when buffered audio runs out
+        self._loop = None
+        self._stream = None
+        self._primed = False
+        self._playing = False
+        self._last_write = 0.0
+        self._flushes = 0
+        self._flush_requested_at = None
+        self.device_rate = rate
+        self.device_channels = CHANNELS
+        self.converter = None  # Set when the device runs at another rate or channel count
+        self._out = np.zeros(frames_per_buffer, dtype=np.int16)
+        self._samples = np.zeros(0, dtype=np.int16)
+
+    async def start(self):
+        """Initialises PortAudio off the event loop, then opens the stream."""
+        await asyncio.to_thread(self.pya.get)
+        self.open()
+
+    def open(self):
+        """Opens the output device in its native format and starts the stream."""
+        self._loop = asyncio.get_running_loop()
+        self._stream, self.device_rate, self.device_channels = open_stream(
+            self.pya, self.rate, self.frames_per_buffer, output=True, stream_callback=self._callback
+        )
+        if (self.device_rate, self.device_channels) != (self.rate, CHANNELS):
+            self.converter = StreamingResampler(self.rate, self.device_rate, CHANNELS, self.device_channels)
+        self._stream.start_stream()
+
+    def close(self):
+        if self._stream is not None:
+            self._stream.stop_stream()
+            self._stream.close()
+            self._stream = None
+
+    @property
+    def buffered_seconds(self):
+        return self.ring.available() / self.rate
+
+    async def write(self, data):
+        """Queues PCM for playback, waiting while the ring buffer is full.
+
+        A ``flush`` while waiting abandons the rest of ``data``.
+        """
+        samples = np.frombuffer(data, dtype=np.int16)
+        flushes = self._flushes
+        while len(samples) and flushes == self._flushes:
+            written = self.ring.write(samples)
+            self._last_write = time.monotonic()
+            samples = samples[written:]
+            if len(samples):
+                self.producer_waits += 1
+                await asyncio.sleep(len(samples) / self.rate)
+
+    def flush(self):
+        """Drops all buffered audio; the device goes quiet after its current buffer."""
+        self.ring.flush()
+        self._flushes += 1
+        self._flush_requested_at = time.perf_counter()
+        self._last_write = 0.0  # Running dry after a flush is not an underrun
+
+    def _callback(self, in_data, frame_count, time_info, status):
+        # Runs on the PortAudio thread. The ring holds audio at ``rate``; when the
+        # device runs in another format, just enough of it is converted per buffer.
+        requested = self._flush_requested_at
+        if requested is not None:
+            # Audio stops once this buffer replaces the last one queued before the flush
+            self._flush_requested_at = None
+            metrics.observe("playback_flush", time.perf_counter() - requested)
+        converter = self.converter
+        out_size = frame_count * self.device_channels
+        if len(self._out) != out_size:
+            self._out = np.zeros(out_size, dtype=np.int16)
+        out = self._out
+        wanted = frame_count if converter is None else converter.input_frames_for(frame_count)
+        available = self.ring.available()
+        producer_idle = time.monotonic() - self._last_write > self.jitter_target / self.rate
+
+        if not self._primed:
+            if available >= self.jitter_target or (available and producer_idle):
+                self._primed = True
+            else:
+                out[:] = 0
+                if self._playing and producer_idle:
+                    self._set_drained()
+                return (out.tobytes(), PA_CONTINUE)
+
+        self._playing = True
+        if converter is None:
+            samples = out
+        else:
+            if len(self._samples) < wanted:
+                self._samples = np.zeros(wanted, dtype=np.int16)
+            samples = self._samples[:wanted]
+        count = self.ring.read_into(samples)
+        if converter is not None:
+            converted = converter.process(samples[:count], max_frames=frame_count)
+            out[: len(converted)] = converted
+            out[len(converted) :] = 0
+        elif count < frame_count:
+            out[count:] = 0
+        if count < wanted:
+            self._primed = False
+            if producer_idle:
+                self._set_drained()
+            else:
+                self.underruns += 1
+        if self.on_played is not None and count:
+            self._loop.call_soon_threadsafe(self.on_played, samples[:count].tobytes())
+        return (out.tobytes(), PA_CONTINUE)
+
+    def _set_drained(self):
+        self._playing = False
+        if self.on_drained is not None:
+            self._loop.call_soon_threadsafe(self.on_drained)
+
+    def summary(self):
+        device = f"{self.device_rate} Hz, {self.device_channels} channel(s)"
+        return f"{self.underruns} underruns, {self.producer_waits} producer waits ({device})"
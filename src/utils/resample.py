@@ -0,0 +1,84 @@
+import math
+import numpy as np
+from src.config import RESAMPLE_FILTER_TAPS
+
+
+def _lowpass_taps(cutoff, taps):
+    """Windowed-sinc low-pass FIR; ``cutoff`` is in cycles per input sample."""
+    n = np.arange(taps) - (taps - 1) / 2.0
+    h = 2.0 * cutoff * np.sinc(2.0 * cutoff * n) * np.hamming(taps)
+    return (h / h.sum()).astype(np.float32)
+
+
+class StreamingResampler:
+    """Converts interleaved int16 PCM between sample rates and channel counts, chunk by chunk.
+
+    Input channels are averaged to mono, resampled by linear interpolation and
+    copied to every output channel. When downsampling, a short low-pass FIR runs
+    first so content above the new Nyquist frequency does not alias. The filter
+    history and the interpolation phase carry over between calls, so splitting a
+    stream into chunks of any size gives the same output as converting it whole.
+    """
+
+    def __init__(self, in_rate, out_rate, in_channels=1, out_channels=1, filter_taps=RESAMPLE_FILTER_TAPS):
+        self.in_rate = in_rate
+        self.out_rate = out_rate
+        self.in_channels = in_channels
+        self.out_channels = out_channels
+        self.step = in_rate / out_rate  # Input samples advanced per output sample
+        self._taps = _lowpass_taps(0.45 * out_rate / in_rate, filter_taps) if out_rate < in_rate else None
+        self._filter_history = np.zeros(0 if self._taps is None else filter_taps - 1, dtype=np.float32)
+        # The last two input samples; positions below are indices into history + new samples
+        self._history = np.zeros(2, dtype=np.float32)
+        self._position = 2.0
+
+    @property
+    def passthrough(self):
+        return self.in_rate == self.out_rate and self.in_channels == self.out_channels
+
+    def input_frames_for(self, out_frames):
+        """Input frames ``process`` needs to return at least ``out_frames`` frames."""
+        if self.in_rate == self.out_rate:
+            return out_frames
+        return max(0, math.ceil(self._position + (out_frames - 1) * self.step - 1 - 1e-9))
+
+    def process(self, data, max_frames=None):
+        """Converts one chunk (``bytes`` or an int16 array). Returns an interleaved int16 array.
+
+        ``max_frames`` caps the output, e.g. to fill exactly one device buffer after
+        asking ``input_frames_for`` how much input that takes.
+        """
+        samples = np.frombuffer(data, dtype=np.int16) if isinstance(data, (bytes, bytearray, memoryview)) else data
+        if self.passthrough:
+            return samples if max_frames is None else samples[: max_frames * self.out_channels]
+
+        mono = samples.astype(np.float32)
+        if self.in_channels > 1:
+            frames = len(mono) // self.in_channels
+            mono = mono[: frames * self.in_channels].reshape(frames, self.in_channels).mean(axis=1)
+        if self._taps is not None:
+            padded = np.concatenate((self._filter_history, mono))
+            self._filter_history = padded[len(padded) - len(self._filter_history) :]
+            mono = np.convolve(padded, self._taps, mode="valid").astype(np.float32)
+
+        if self.in_rate != self.out_rate:
+            n = len(mono)
+            extended = np.concatenate((self._history, mono))
+            last = n + 1
+            count = int((last - self._position) // self.step) + 1 if last >= self._position else 0
+            if max_frames is not None:
+                count = min(count, max_frames)
+            positions = self._position + np.arange(count) * self.step
+            index = positions.astype(np.int64)
+            frac = (positions - index).astype(np.float32)
+            upper = np.minimum(index + 1, last)
+            mono = extended[index] * (1.0 - frac) + extended[upper] * frac
+            self._position += count * self.step - n
+            self._history = extended[-2:]
+        elif max_frames is not None:
+            mono = mono[:max_frames]
+
+        out = np.clip(np.rint(mono), -32768, 32767).astype(np.int16)
+        if self.out_channels > 1:
+            out = np.repeat(out, self.out_channels)
+        return out
@@ -0,0 +1,192 @@
+import hashlib
+import json
+import os
+import struct
+import threading
+import time
+from collections import OrderedDict
+from src.config import (
+    MODEL,
+    LIVE_CONFIG,
+    RESPONSE_CACHE_DIR,
+    RESPONSE_CACHE_MAX_BYTES,
+    RESPONSE_CACHE_TTL,
+)
+from src.utils.logger import get_logger
+
+ENTRY_MAGIC = b"GLRC"
+ENTRY_HEADER = struct.Struct("<4sI")  # Magic, UTF-8 text length; the text and then the PCM follow
+ENTRY_SUFFIX = ".resp"
+INDEX_NAME = "index.json"
+
+
+def normalize_prompt(text):
+    """Case-folds ``text`` and collapses whitespace and trailing punctuation, so trivial variants share an entry."""
+    return " ".join(text.casefold().split()).rstrip(" .!?")
+
+
+class CachedResponse:
+    __slots__ = ("text", "audio")
+
+    def __init__(self, text, audio):
+        self.text = text
+        self.audio = audio
+
+
+class ResponseCache:
+    """Size-bounded on-disk LRU store of complete answers (24 kHz PCM and text) to prompts.
+
+    Each answer is one file in ``directory``, named by the SHA-256 of the
+    normalised prompt, the model and the Live config, so changing either never
+    serves an answer produced under the old settings. ``index.json`` keeps the
+    entries in least-recently-used order with their size and creation time, and
+    survives restarts. Entries older than ``ttl`` seconds are misses and are
+    deleted; once the entries exceed ``max_bytes``, the least recently used are
+    evicted.
+
+    ``get`` and ``put`` do file I/O and are called through ``asyncio.to_thread``.
+    """
+
+    def __init__(self, directory, max_bytes=RESPONSE_CACHE_MAX_BYTES, ttl=RESPONSE_CACHE_TTL, model=MODEL, config=LIVE_CONFIG, logger=None):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.logger = logger or get_logger()
+        self._namespace = json.dumps([model, config], sort_keys=True, default=str)
+        self._entries = OrderedDict()  # key -> (size, created); least recently used first
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.evictions = 0
+        self.expirations = 0
+        os.makedirs(directory, exist_ok=True)
+        self._load_index()
+
+    @property
+    def nbytes(self):
+        return sum(size for size, _ in self._entries.values())
+
+    def __len__(self):
+        return len(self._entries)
+
+    def key(self, prompt):
+        """Cache key of ``prompt``, or None for an empty prompt."""
+        normalized = normalize_prompt(prompt)
+        if not normalized:
+            return None
+        return hashlib.sha256(f"{self._namespace}\n{normalized}".encode("utf-8")).hexdigest()
+
+    def get(self, key):
+        """Returns the ``CachedResponse`` stored under ``key``, or None on a miss."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and time.time() - entry[1] > self.ttl:
+                self._remove(key)
+                self.expirations += 1
+                self._save_index()
+                entry = None
+            response = self._read(key) if entry is not None else None
+            if response is None:
+                if entry is not None:
+                    self._remove(key)  # Unreadable entry file
+                    self._save_index()
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self._save_index()
+            self.hits += 1
+            return response
+
+    def put(self, key, audio, text=""):
+        """Stores an answer under ``key``, evicting least recently used entries to stay within ``max_bytes``."""
+        encoded = text.encode("utf-8")
+        size = ENTRY_HEADER.size + len(encoded) + len(audio)
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            path = self._path(key)
+            with open(path + ".tmp", "wb") as f:
+                f.write(ENTRY_HEADER.pack(ENTRY_MAGIC, len(encoded)))
+                f.write(encoded)
+                f.write(audio)
+            os.replace(path + ".tmp", path)
+            self._entries.pop(key, None)
+            self._entries[key] = (size, time.time())
+            self.stores += 1
+            total = self.nbytes
+            while total > self.max_bytes:
+                oldest = next(iter(self._entries))
+                total -= self._entries[oldest][0]
+                self._remove(oldest)
+                self.evictions += 1
+            self._save_index()
+
+    def clear(self):
+        with self._lock:
+            for key in list(self._entries):
+                self._remove(key)
+            self._save_index()
+
+    def _path(self, key):
+        return os.path.join(self.directory, key + ENTRY_SUFFIX)
+
+    def _read(self, key):
+        try:
+            with open(self._path(key), "rb") as f:
+                data = f.read()
+        except OSError:
+            return None
+        if len(data) < ENTRY_HEADER.size:
+            return None
+        magic, text_length = ENTRY_HEADER.unpack_from(data)
+        start = ENTRY_HEADER.size + text_length
+        if magic != ENTRY_MAGIC or start > len(data):
+            return None
+        return CachedResponse(data[ENTRY_HEADER.size : start].decode("utf-8"), memoryview(data)[start:])
+
+    def _remove(self, key):
+        self._entries.pop(key, None)
+        try:
+            os.remove(self._path(key))
+        except OSError:
+            pass
+
+    def _load_index(self):
+        try:
+            with open(os.path.join(self.directory, INDEX_NAME), encoding="utf-8") as f:
+                rows = json.load(f)
+        except (OSError, ValueError):
+            rows = []
+        now = time.time()
+        for key, size, created in rows:
+            if now - created > self.ttl or not os.path.exists(self._path(key)):
+                self._remove(key)
+                continue
+            self._entries[key] = (size, created)
+        # Entry files the index does not know about (e.g. written just before a crash) are dropped
+        for name in os.listdir(self.directory):
+            if name.endswith(ENTRY_SUFFIX) and name[: -len(ENTRY_SUFFIX)] not in self._entries:
+                self._remove(name[: -len(ENTRY_SUFFIX)])
+
+    def _save_index(self):
+        path = os.path.join(self.directory, INDEX_NAME)
+        with open(path + ".tmp", "w", encoding="utf-8") as f:
+            json.dump([[key, size, created] for key, (size, created) in self._entries.items()], f)
+        os.replace(path + ".tmp", path)
+
+    def summary(self):
+        lookups = self.hits + self.misses
+        hit_rate = 100.0 * self.hits / lookups if lookups else 0.0
+        return (
+            f"{self.hits} hits, {self.misses} misses ({hit_rate:.0f}% hit rate), {self.stores} stored, "
+            f"{self.evictions} evicted, {self.expirations} expired; "
+            f"{len(self._entries)} entries, {self.nbytes / 1024 / 1024:.1f} of {self.max_bytes / 1024 / 1024:.0f} MiB"
+        )
+
+
+def create_response_cache(directory=RESPONSE_CACHE_DIR, **kwargs):
+    """Returns the response cache configured by ``RESPONSE_CACHE_DIR``, or None when caching is off."""
+    if not directory:
+        return None
+    return ResponseCache(directory, **kwargs)
@@ -0,0 +1,366 @@
+import asyncio
+import ctypes
+import sys
+import threading
+import time
+import mss
+import numpy as np
+from src.config import (
+    SCREEN_CAPTURE_INTERVAL,
+    SCREEN_DIFF_SAMPLE_STEP,
+    SCREEN_DIFF_PIXEL_TOLERANCE,
+    SCREEN_CHANGE_THRESHOLD,
+    SCREEN_CAPTURE_MODE,
+    SCREEN_REGION,
+    SCREEN_TILE_SIZE,
+    SCREEN_TILE_SAMPLE_STEP,
+    SCREEN_TILE_CHANGE_THRESHOLD,
+    SCREEN_DIRTY_FULL_FRACTION,
+    SCREEN_FULL_FRAME_INTERVAL,
+    SCREEN_FULL_FRAME_MAX_SIZE,
+)
+from src.utils.frame_encoder import FrameEncoder
+from src.utils.logger import get_logger
+from src.utils.media import MediaMessage
+
+
+def active_window_rect():
+    """Bounds of the focused window as an mss region, or None where that is not supported (non-Windows)."""
+    if sys.platform != "win32":
+        return None
+    from ctypes import wintypes
+
+    user32 = ctypes.windll.user32
+    hwnd = user32.GetForegroundWindow()
+    rect = wintypes.RECT()
+    if not hwnd or not user32.GetWindowRect(hwnd, ctypes.byref(rect)):
+        return None
+    return {"left": rect.left, "top": rect.top, "width": rect.right - rect.left, "height": rect.bottom - rect.top}
+
+
+def _clip_to_monitor(region, monitor):
+    left = max(region["left"], monitor["left"])
+    top = max(region["top"], monitor["top"])
+    right = min(region["left"] + region["width"], monitor["left"] + monitor["width"])
+    bottom = min(region["top"] + region["height"], monitor["top"] + monitor["height"])
+    if right - left < 16 or bottom - top < 16:
+        return None  # Off screen or minimised
+    return {"left": left, "top": top, "width": right - left, "height": bottom - top}
+
+
+class ScreenCaptureEngine:
+    """Grabs a monitor on a dedicated worker thread and publishes only frames that changed.
+
+    A single ``mss`` grabber is kept alive for the lifetime of the worker thread
+    (mss instances are not shareable across threads). Every grab is compared with
+    the previous one using a strided, downsampled view of the raw BGRA buffer, so an
+    unchanged desktop costs one grab and a small NumPy comparison per interval.
+    ``interval`` is the shortest time between grabs; a ``quality_controller``
+    can only lengthen it.
+
+    ``mode`` chooses what is sent:
+
+    - ``"full"``: the whole monitor whenever at least ``change_threshold`` of
+      the sampled pixels changed.
+    - ``"dirty"``: the monitor is split into ``tile_size`` tiles and only the
+      bounding box of the tiles that changed is encoded, unless more than
+      ``dirty_full_fraction`` of them did.
+    - ``"region"``: only ``region`` (``left, top, width, height`` relative to the
+      monitor) is grabbed and sent.
+    - ``"window"``: only the focused window is grabbed and sent (Windows; other
+      platforms fall back to ``"dirty"``).
+
+    Outside ``"full"``, changes are tracked per tile on a finer grid of every
+    ``tile_sample_step``-th pixel, and a single tile with ``tile_change_threshold``
+    changed samples is enough to send, so a cursor move or a few typed
+    characters are not lost in a whole-screen fraction.
+
+    Outside ``"full"``, a whole-monitor frame downscaled to ``full_frame_max_size``
+    is sent every ``full_frame_interval`` seconds (if anything changed) so the
+    model keeps the surrounding context.
+    """
+
+    def __init__(
+        self,
+        monitor_index=1,
+        interval=SCREEN_CAPTURE_INTERVAL,
+        sample_step=SCREEN_DIFF_SAMPLE_STEP,
+        pixel_tolerance=SCREEN_DIFF_PIXEL_TOLERANCE,
+        change_threshold=SCREEN_CHANGE_THRESHOLD,
+        quality_controller=None,
+        encoder=None,
+        mode=SCREEN_CAPTURE_MODE,
+        region=SCREEN_REGION,
+        tile_size=SCREEN_TILE_SIZE,
+        tile_sample_step=SCREEN_TILE_SAMPLE_STEP,
+        tile_change_threshold=SCREEN_TILE_CHANGE_THRESHOLD,
+        dirty_full_fraction=SCREEN_DIRTY_FULL_FRACTION,
+        full_frame_interval=SCREEN_FULL_FRAME_INTERVAL,
+        full_frame_max_size=SCREEN_FULL_FRAME_MAX_SIZE,
+        logger=None,
+    ):
+        if mode not in ("full", "dirty", "region", "window"):
+            raise ValueError(f"Unsupported screen capture mode: {mode}")
+        self.logger = logger or get_logger()
+        self.monitor_index = monitor_index
+        self.mode = mode
+        self.region = region
+        self.tile_size = tile_size
+        self.tile_sample_step = tile_sample_step
+        self.tile_change_threshold = tile_change_threshold
+        self.dirty_full_fraction = dirty_full_fraction
+        self.full_frame_interval = full_frame_interval
+        self.full_frame_max_size = full_frame_max_size
+        self.interval = interval
+        self.sample_step = sample_step
+        self.pixel_tolerance = pixel_tolerance
+        self.change_threshold = change_threshold
+        self.quality_controller = quality_controller
+        self.encoder = encoder or FrameEncoder()
+        self.frames_grabbed = 0
+        self.frames_skipped = 0
+        self.frames_published = 0
+        self.frames_cropped = 0
+        self.pixels_grabbed = 0
+        self.pixels_encoded = 0
+        self.cpu_seconds = 0.0  # CPU time of the capture thread, including encoding unless it is offloaded
+        self.last_region = None  # (left, top, width, height) of the last published frame, monitor-relative
+        self._previous = None
+        self._full_previous = None
+        self._monitor_size = None
+        self._last_full_frame = 0.0
+        self._loop = None
+        self._queue = None
+        self._thread = None
+        self._stop_event = threading.Event()
+
+    def start(self, loop=None):
+        """Starts the capture thread, publishing frames onto ``loop``."""
+        self._loop = loop or asyncio.get_running_loop()
+        self._queue = asyncio.Queue(maxsize=1)
+        self._stop_event.clear()
+        self._thread = threading.Thread(
+            target=self._run, name="ScreenCaptureEngine", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self):
+        """Signals the capture thread to exit and waits for it."""
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join(timeout=2.0)
+            self._thread = None
+
+    async def next_frame(self):
+        """Waits for the next changed frame and its capture time (``time.perf_counter()``).
+
+        Re-raises errors from the capture thread.
+        """
+        item = await self._queue.get()
+        if isinstance(item, BaseException):
+            raise item
+        return item
+
+    def _publish(self, item):
+        # Runs on the event loop. Only the newest frame is worth sending.
+        if self._queue.full():
+            self._queue.get_nowait()
+        self._queue.put_nowait(item)
+
+    def _run(self):
+        cpu_started = time.thread_time()
+        try:
+            with mss.mss() as sct:
+                monitor = self._select_monitor(sct.monitors)
+                self._monitor_size = (monitor["width"], monitor["height"])
+                if self.mode == "window" and active_window_rect() is None:
+                    self.logger.warning("Active-window capture is not supported here; capturing changed regions instead.")
+                    self.mode = "dirty"
+                while not self._stop_event.is_set():
+                    started = time.perf_counter()
+                    frame = self._capture(sct, monitor, started)
+                    if frame is not None:
+                        self.frames_published += 1
+                        self._loop.call_soon_threadsafe(self._publish, (frame, started))
+                    else:
+                        self.frames_skipped += 1
+                    elapsed = time.perf_counter() - started
+                    self.cpu_seconds = time.thread_time() - cpu_started
+                    self._stop_event.wait(max(0.0, self._current_interval() - elapsed))
+        except Exception as e:
+            # next_frame re-raises it with this traceback, and the handler logs it there
+            if self._loop.is_closed():
+                self.logger.exception("Error in screen capture")
+            else:
+                self._loop.call_soon_threadsafe(self._publish, e)
+
+    def _grab(self, sct, region):
+        sct_img = sct.grab(region)
+        self.frames_grabbed += 1
+        width, height = sct_img.size
+        self.pixels_grabbed += width * height
+        # View the BGRA grab as an array without copying it
+        return np.frombuffer(sct_img.raw, dtype=np.uint8).reshape(height, width, 4)
+
+    def _capture(self, sct, monitor, now):
+        """Grabs according to ``mode``; returns the encoded frame to publish, or None."""
+        if self.mode == "full":
+            pixels = self._grab(sct, monitor)
+            return self._send(pixels, (0, 0) + self._monitor_size) if self._has_changed(pixels) else None
+
+        full_due = self.full_frame_interval and now - self._last_full_frame >= self.full_frame_interval
+        if self.mode == "dirty":
+            pixels = self._grab(sct, monitor)
+            box, fraction = self._dirty_box(pixels)
+            if box is None:
+                return None
+            if fraction > self.dirty_full_fraction:
+                return self._send_full(pixels, now)  # Most of the screen changed; send it at full quality
+            if full_due:
+                return self._send_full(pixels, now, self.full_frame_max_size)
+            left, top, width, height = box
+            return self._send(pixels[top : top + height, left : left + width], box)
+
+        if full_due:
+            pixels = self._grab(sct, monitor)
+            self._last_full_frame = now
+            if self._full_frame_changed(pixels):
+                return self._send_full(pixels, now, self.full_frame_max_size)
+        region = self._region(monitor)
+        pixels = self._grab(sct, region)
+        if not self._region_changed(pixels):
+            return None
+        box = (region["left"] - monitor["left"], region["top"] - monitor["top"], pixels.shape[1], pixels.shape[0])
+        return self._send(pixels, box)
+
+    def _region(self, monitor):
+        if self.mode == "window":
+            rect = active_window_rect()
+        else:
+            left, top, width, height = self.region
+            rect = {"left": monitor["left"] + left, "top": monitor["top"] + top, "width": width, "height": height}
+        return (rect and _clip_to_monitor(rect, monitor)) or monitor
+
+    def _send(self, pixels, box, max_size=None):
+        """Encodes ``pixels``, which show ``box`` (``left, top, width, height``) of the monitor."""
+        if tuple(box[2:]) != self._monitor_size:
+            self.frames_cropped += 1
+        self.pixels_encoded += pixels.shape[0] * pixels.shape[1]
+        self.last_region = box
+        return self._encode(np.ascontiguousarray(pixels), max_size)
+
+    def _send_full(self, pixels, now, max_size=None):
+        self._last_full_frame = now
+        self._full_previous = self._sample(pixels)
+        return self._send(pixels, (0, 0) + self._monitor_size, max_size)
+
+    def _sample(self, pixels):
+        return pixels[:: self.sample_step, :: self.sample_step, :3].astype(np.int16)
+
+    def _full_frame_changed(self, pixels):
+        """Whether the monitor changed since the last whole-monitor frame was sent."""
+        previous = self._full_previous
+        sample = self._sample(pixels)
+        if previous is None or previous.shape != sample.shape:
+            return True
+        changed = (np.abs(sample - previous) > self.pixel_tolerance).any(axis=2)
+        return changed.mean() >= self.change_threshold
+
+    def _tile_sample(self, pixels):
+        return pixels[:: self.tile_sample_step, :: self.tile_sample_step, :3].astype(np.int16)
+
+    def _changed_tiles(self, sample, previous):
+        """Returns which tiles have at least ``tile_change_threshold`` changed samples, and samples per tile edge."""
+        changed = (np.abs(sample - previous) > self.pixel_tolerance).any(axis=2)
+        per_tile = max(1, self.tile_size // self.tile_sample_step)
+        rows = -(-changed.shape[0] // per_tile)
+        cols = -(-changed.shape[1] // per_tile)
+        padded = np.zeros((rows * per_tile, cols * per_tile), dtype=np.int32)
+        padded[: changed.shape[0], : changed.shape[1]] = changed
+        counts = padded.reshape(rows, per_tile, cols, per_tile).sum(axis=(1, 3))
+        return counts >= self.tile_change_threshold, per_tile
+
+    def _region_changed(self, pixels):
+        """Whether any tile of the region or window changed since the last frame sent from it."""
+        sample = self._tile_sample(pixels)
+        previous = self._previous
+        if previous is None or previous.shape != sample.shape:
+            self._previous = sample
+            return True
+        if np.array_equal(previous, sample) or not self._changed_tiles(sample, previous)[0].any():
+            return False
+        self._previous = sample
+        return True
+
+    def _dirty_box(self, pixels):
+        """Returns the pixel bounding box of changed tiles and the fraction of tiles changed.
+
+        ``(None, 0.0)`` when no tile changed. Only the part of the reference that is
+        sent moves forward, so slow drift elsewhere still accumulates.
+        """
+        sample = self._tile_sample(pixels)
+        previous = self._previous
+        height, width = pixels.shape[:2]
+        if previous is None or previous.shape != sample.shape:
+            self._previous = sample
+            return (0, 0, width, height), 1.0
+        if np.array_equal(previous, sample):
+            return None, 0.0
+        tiles, per_tile = self._changed_tiles(sample, previous)
+        if not tiles.any():
+            return None, 0.0
+        tile_rows = np.flatnonzero(tiles.any(axis=1))
+        tile_cols = np.flatnonzero(tiles.any(axis=0))
+        r0, r1 = tile_rows[0] * per_tile, (tile_rows[-1] + 1) * per_tile
+        c0, c1 = tile_cols[0] * per_tile, (tile_cols[-1] + 1) * per_tile
+        previous[r0:r1, c0:c1] = sample[r0:r1, c0:c1]
+        # Widen by one sample step: a change can start up to a step before the first sample that saw it
+        step = self.tile_sample_step
+        top, left = max(0, (r0 - 1) * step), max(0, (c0 - 1) * step)
+        box = (int(left), int(top), int(min(width, c1 * step) - left), int(min(height, r1 * step) - top))
+        return box, float(tiles.mean())
+
+    def _current_interval(self):
+        if self.quality_controller is not None:
+            return max(self.interval, self.quality_controller.interval)
+        return self.interval
+
+    def _select_monitor(self, monitors):
+        if self.monitor_index < 1 or self.monitor_index >= len(monitors):
+            self.logger.error(f"Monitor index {self.monitor_index} is out of range. Available monitors:")
+            for idx, monitor in enumerate(monitors[1:], start=1):
+                self.logger.error(f"Monitor {idx}: {monitor}")
+            raise ValueError(f"Invalid monitor index: {self.monitor_index}")
+        return monitors[self.monitor_index]
+
+    def _has_changed(self, pixels):
+        """Compares a downsampled view of the grab against the last published frame."""
+        sample = pixels[:: self.sample_step, :: self.sample_step, :3].astype(np.int16)
+        previous = self._previous
+        if previous is None or previous.shape != sample.shape:
+            self._previous = sample
+            return True
+        if np.array_equal(previous, sample):
+            return False
+        changed = (np.abs(sample - previous) > self.pixel_tolerance).any(axis=2)
+        if changed.mean() < self.change_threshold:
+            return False
+        # Only move the reference when a frame is sent, so slow drift still accumulates.
+        self._previous = sample
+        return True
+
+    def _encode(self, pixels, max_size=None):
+        if self.quality_controller is not None:
+            quality = self.quality_controller.jpeg_quality
+            max_size = min(max_size or self.quality_controller.max_size, self.quality_controller.max_size)
+        else:
+            max_size, quality = max_size or 1024, 75
+        image_bytes = self.encoder.encode(pixels, max_size, quality)
+        return MediaMessage(self.encoder.mime_type, image_bytes)
+
+    def summary(self):
+        encoded = 100.0 * self.pixels_encoded / self.pixels_grabbed if self.pixels_grabbed else 0.0
+        return (
+            f"{self.mode} mode: {self.frames_grabbed} grabs, {self.frames_published} frames sent "
+            f"({self.frames_cropped} cropped), {encoded:.0f}% of grabbed pixels encoded"
+        )
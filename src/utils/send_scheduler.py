@@ -0,0 +1,111 @@
+import asyncio
+import collections
+import time
+from src.config import AUDIO_SEND_LATENCY_BUDGET
+
+
+class LaneStats:
+    """Counters and queueing delay for one lane of the send scheduler."""
+
+    def __init__(self):
+        self.sent = 0
+        self.dropped = 0
+        self.total_delay = 0.0
+        self.max_delay = 0.0
+
+    def record_sent(self, delay):
+        self.sent += 1
+        self.total_delay += delay
+        self.max_delay = max(self.max_delay, delay)
+
+    @property
+    def avg_delay_ms(self):
+        return 1000.0 * self.total_delay / self.sent if self.sent else 0.0
+
+    def summary(self):
+        return (
+            f"{self.sent} sent, {self.dropped} dropped, "
+            f"avg wait {self.avg_delay_ms:.1f} ms, max wait {1000.0 * self.max_delay:.1f} ms"
+        )
+
+
+class SendScheduler:
+    """Outgoing message scheduler with a priority audio lane and a latest-only video lane.
+
+    Audio chunks are always sent before frames. The audio lane never blocks the
+    microphone reader; chunks that have waited longer than the latency budget are
+    dropped because the model would hear them too late anyway. The video lane holds
+    a single frame per source, and a newer frame replaces one of the same source
+    that has not been sent yet. With several sources (camera and screen), pending
+    frames are sent round-robin, starting with the source sent least recently, so
+    a fast source cannot starve a slow one.
+    """
+
+    def __init__(self, audio_latency_budget=AUDIO_SEND_LATENCY_BUDGET):
+        self.audio_latency_budget = audio_latency_budget
+        self.audio = LaneStats()
+        self.video = LaneStats()
+        self.sources = {}  # Source name -> LaneStats of its frames
+        self._audio_lane = collections.deque()
+        self._video_slots = {}  # Source name -> (msg, enqueued_at, captured_at)
+        self._video_turns = {}  # Source name -> when its last frame was sent, in frames sent overall
+        self._ready = asyncio.Event()
+        self.last_lane = None
+        self.last_source = None
+        self.last_captured_at = None
+
+    def put_audio(self, msg, captured_at=None):
+        """Queues a microphone chunk. Never blocks."""
+        now = time.perf_counter()
+        self._audio_lane.append((msg, now, captured_at or now))
+        self._ready.set()
+
+    def put_video(self, msg, captured_at=None, source="video"):
+        """Offers a frame, replacing any frame of the same ``source`` that has not been sent yet."""
+        stats = self.sources.get(source)
+        if stats is None:
+            stats = self.sources[source] = LaneStats()
+            self._video_turns[source] = -1
+        if source in self._video_slots:
+            self.video.dropped += 1  # Superseded before it could be sent
+            stats.dropped += 1
+        now = time.perf_counter()
+        self._video_slots[source] = (msg, now, captured_at or now)
+        self._ready.set()
+
+    def qsize(self):
+        return len(self._audio_lane) + len(self._video_slots)
+
+    async def get(self):
+        """Returns the next message to send, audio first.
+
+        ``last_lane`` and ``last_captured_at`` describe the returned message.
+        """
+        while True:
+            now = time.perf_counter()
+            while self._audio_lane:
+                msg, enqueued_at, self.last_captured_at = self._audio_lane.popleft()
+                delay = now - enqueued_at
+                if delay > self.audio_latency_budget:
+                    self.audio.dropped += 1
+                    continue
+                self.audio.record_sent(delay)
+                self.last_lane = "audio"
+                return msg
+            if self._video_slots:
+                source = min(self._video_slots, key=self._video_turns.__getitem__)
+                msg, enqueued_at, self.last_captured_at = self._video_slots.pop(source)
+                self._video_turns[source] = self.video.sent
+                self.video.record_sent(now - enqueued_at)
+                self.sources[source].record_sent(now - enqueued_at)
+                self.last_lane = "video"
+                self.last_source = source
+                return msg
+            self._ready.clear()
+            await self._ready.wait()
+
+    def summary(self):
+        summary = f"audio: {self.audio.summary()}; video: {self.video.summary()}"
+        if len(self.sources) > 1:
+            summary += "".join(f"; {source}: {stats.summary()}" for source, stats in self.sources.items())
+        return summary
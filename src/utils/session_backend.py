@@ -0,0 +1,256 @@
+import asyncio
+import base64
+import contextlib
+import json
+import math
+import os
+import struct
+from src.config import (
+    MODEL,
+    API_VERSION,
+    SEND_SAMPLE_RATE,
+    RECEIVE_SAMPLE_RATE,
+    SESSION_BACKEND,
+    MOCK_SCRIPT_PATH,
+    MOCK_FIRST_RESPONSE_DELAY,
+    MOCK_THROUGHPUT_BYTES_PER_SECOND,
+    MOCK_AUDIO_SECONDS_PER_TURN,
+    SESSION_RECORD_PATH,
+    SESSION_CAPTURE_PATH,
+)
+
+
+class GenAISessionBackend:
+    """Opens real Live API sessions through google-genai."""
+
+    def __init__(self, model=MODEL, api_version=API_VERSION):
+        # Imported here so the mock backend works without the SDK or network access
+        from google import genai
+
+        self.model = model
+        self.client = genai.Client(http_options={"api_version": api_version})
+
+    def connect(self, config):
+        return self.client.aio.live.connect(model=self.model, config=config)
+
+
+class MockServerContent:
+    def __init__(self, turn_complete=False, interrupted=False):
+        self.turn_complete = turn_complete
+        self.interrupted = interrupted
+
+
+class MockResponse:
+    """The subset of ``LiveServerMessage`` the handlers read."""
+
+    def __init__(self, data=None, text=None, turn_complete=False):
+        self.data = data
+        self.text = text
+        self.server_content = MockServerContent(turn_complete=turn_complete)
+
+
+def _tone_script(seconds=1.0, frequency=440.0, chunk_seconds=0.04):
+    """A one-turn script: a short sine tone in 24 kHz PCM chunks plus a line of text."""
+    chunk_frames = int(RECEIVE_SAMPLE_RATE * chunk_seconds)
+    events = []
+    total = int(RECEIVE_SAMPLE_RATE * seconds)
+    for start in range(0, total, chunk_frames):
+        samples = [
+            int(8000 * math.sin(2 * math.pi * frequency * n / RECEIVE_SAMPLE_RATE))
+            for n in range(start, min(start + chunk_frames, total))
+        ]
+        events.append({"type": "audio", "data": struct.pack(f"<{len(samples)}h", *samples)})
+    events.append({"type": "text", "text": "This is a mock response."})
+    return [events]
+
+
+def load_script(path):
+    """Loads recorded turns from JSON. Audio payloads are base64 encoded on disk."""
+    with open(path) as f:
+        raw = json.load(f)
+    turns = []
+    for turn in raw["turns"]:
+        events = []
+        for event in turn:
+            if event["type"] == "audio":
+                events.append({"type": "audio", "data": base64.b64decode(event["data"])})
+            else:
+                events.append({"type": "text", "text": event["text"]})
+        turns.append(events)
+    return turns
+
+
+def save_script(path, turns):
+    serialisable = []
+    for turn in turns:
+        events = []
+        for event in turn:
+            if event["type"] == "audio":
+                events.append({"type": "audio", "data": base64.b64encode(event["data"]).decode()})
+            else:
+                events.append(event)
+        serialisable.append(events)
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(path, "w") as f:
+        json.dump({"turns": serialisable}, f)
+
+
+class MockLiveSession:
+    """Accepts the same ``send``/``receive`` calls as a Live session and replays scripted turns.
+
+    A turn is answered after an ``end_of_turn`` send, a text input, or once
+    ``audio_seconds_per_turn`` of microphone audio has been received (standing in
+    for the server's own voice activity detection in camera/screen modes).
+    """
+
+    def __init__(self, server):
+        self.server = server
+        self.messages_received = 0
+        self.bytes_received = 0
+        self._audio_bytes_since_turn = 0
+        self._pending_turns = asyncio.Queue()
+
+    async def send(self, input=None, end_of_turn=False):
+        self.messages_received += 1
+        if isinstance(input, dict):
+            data = input.get("data") or b""
+            self.bytes_received += len(data)
+            if input.get("mime_type", "").startswith("audio/"):
+                self._audio_bytes_since_turn += len(data)
+        elif isinstance(input, str):
+            self.bytes_received += len(input)
+            end_of_turn = True
+        audio_threshold = self.server.audio_seconds_per_turn * SEND_SAMPLE_RATE * 2
+        if end_of_turn or (audio_threshold and self._audio_bytes_since_turn >= audio_threshold):
+            self._audio_bytes_since_turn = 0
+            self._pending_turns.put_nowait(None)
+
+    async def receive(self):
+        """Yields the responses of the next turn, ending with a turn-complete message."""
+        await self._pending_turns.get()
+        events = self.server.next_turn()
+        await asyncio.sleep(self.server.first_response_delay)
+        for event in events:
+            if event["type"] == "audio":
+                if self.server.throughput:
+                    await asyncio.sleep(len(event["data"]) / self.server.throughput)
+                yield MockResponse(data=event["data"])
+            else:
+                yield MockResponse(text=event["text"])
+        yield MockResponse(turn_complete=True)
+
+
+class MockLiveServer:
+    """Local stand-in for the Live API that replays recorded turns with configurable timing.
+
+    ``first_response_delay`` is the think time before a turn's first message and
+    ``throughput`` (bytes per second, 0 for unlimited) paces audio chunks the way
+    a network link would.
+    """
+
+    def __init__(
+        self,
+        turns=None,
+        first_response_delay=MOCK_FIRST_RESPONSE_DELAY,
+        throughput=MOCK_THROUGHPUT_BYTES_PER_SECOND,
+        audio_seconds_per_turn=MOCK_AUDIO_SECONDS_PER_TURN,
+    ):
+        self.turns = turns or _tone_script()
+        self.first_response_delay = first_response_delay
+        self.throughput = throughput
+        self.audio_seconds_per_turn = audio_seconds_per_turn
+        self.sessions = []
+        self._turn_index = 0
+
+    @classmethod
+    def from_file(cls, path, **kwargs):
+        return cls(load_script(path), **kwargs)
+
+    @classmethod
+    def from_recording(cls, path, **kwargs):
+        """Replays the responses received in a session capture (see ``session_recording``)."""
+        from src.utils.session_recording import SessionRecording
+
+        return cls(SessionRecording(path).response_turns(), **kwargs)
+
+    def next_turn(self):
+        events = self.turns[self._turn_index % len(self.turns)]
+        self._turn_index += 1
+        return events
+
+    @contextlib.asynccontextmanager
+    async def connect(self, config=None):
+        session = MockLiveSession(self)
+        self.sessions.append(session)
+        yield session
+
+
+class RecordingSession:
+    """Wraps a live session and records every turn it receives."""
+
+    def __init__(self, session, turns):
+        self.session = session
+        self.turns = turns
+
+    async def send(self, *args, **kwargs):
+        await self.session.send(*args, **kwargs)
+
+    async def receive(self):
+        events = []
+        self.turns.append(events)
+        async for response in self.session.receive():
+            if response.data:
+                events.append({"type": "audio", "data": response.data})
+            if response.text:
+                events.append({"type": "text", "text": response.text})
+            yield response
+
+
+class RecordingBackend:
+    """Records the responses of another backend into a script ``MockLiveServer`` can replay.
+
+    Turns from every session opened through it, including standbys swapped in
+    after a reconnect, go into one script that ``close`` writes.
+    """
+
+    def __init__(self, backend, path):
+        self.backend = backend
+        self.path = path
+        self.turns = []
+
+    @contextlib.asynccontextmanager
+    async def connect(self, config):
+        async with self.backend.connect(config=config) as session:
+            yield RecordingSession(session, self.turns)
+
+    def close(self):
+        turns = [turn for turn in self.turns if turn]
+        if turns:
+            save_script(self.path, turns)
+        close_backend = getattr(self.backend, "close", None)
+        if close_backend is not None:
+            close_backend()
+
+
+def create_backend(kind=SESSION_BACKEND):
+    """Builds the configured session backend ("genai" or "mock")."""
+    if kind == "genai":
+        backend = GenAISessionBackend()
+    elif kind == "mock":
+        if MOCK_SCRIPT_PATH and MOCK_SCRIPT_PATH.endswith(".glrec"):
+            backend = MockLiveServer.from_recording(MOCK_SCRIPT_PATH)
+        elif MOCK_SCRIPT_PATH:
+            backend = MockLiveServer.from_file(MOCK_SCRIPT_PATH)
+        else:
+            backend = MockLiveServer()
+    else:
+        raise ValueError(f"Unsupported session backend: {kind}")
+    if SESSION_RECORD_PATH:
+        backend = RecordingBackend(backend, SESSION_RECORD_PATH)
+    if SESSION_CAPTURE_PATH:
+        from src.utils.session_recording import CaptureBackend
+
+        backend = CaptureBackend(backend, SESSION_CAPTURE_PATH)
+    return backend
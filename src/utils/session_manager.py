@@ -0,0 +1,162 @@
+import asyncio
+import collections
+import contextlib
+import time
+from src.config import (
+    SESSION_STANDBY_COUNT,
+    SESSION_RECONNECT_DELAY,
+    SESSION_RECONNECT_MAX_DELAY,
+    SESSION_HEALTHY_SECONDS,
+)
+from src.utils.logger import get_logger
+from src.utils.metrics import metrics
+
+
+class SessionManager:
+    """Keeps one active Live session plus warm standbys that are already connected.
+
+    Connecting starts as soon as ``start`` is called, so the WebSocket/TLS handshake
+    overlaps with device initialisation. When the active session ends, ``serve``
+    swaps to a standby that is already open and starts warming a replacement in
+    the background, so a reconnect costs no handshake. Sessions that end within
+    ``healthy_seconds`` of starting back off before the next swap, the same way
+    failed connects do.
+    """
+
+    def __init__(
+        self,
+        backend,
+        config,
+        standby_count=SESSION_STANDBY_COUNT,
+        reconnect_delay=SESSION_RECONNECT_DELAY,
+        reconnect_max_delay=SESSION_RECONNECT_MAX_DELAY,
+        healthy_seconds=SESSION_HEALTHY_SECONDS,
+        logger=None,
+    ):
+        self.logger = logger or get_logger()
+        self.backend = backend
+        self.config = config
+        self.standby_count = standby_count
+        self.reconnect_delay = reconnect_delay
+        self.reconnect_max_delay = reconnect_max_delay
+        self.healthy_seconds = healthy_seconds
+        self.active = None
+        self.swaps = 0
+        self._warming = collections.deque()  # Tasks resolving to (session, exit stack)
+        self._stacks = {}
+        self._stopping = False
+        self._started = False
+
+    def start(self):
+        """Begins connecting the first session and the standbys. Safe to call twice."""
+        if not self._started:
+            self._started = True
+            self._refill(self.standby_count + 1)
+
+    def stop(self):
+        """Makes ``serve`` return once the current session's tasks finish."""
+        self._stopping = True
+
+    def _refill(self, target):
+        while len(self._warming) < target:
+            self._warming.append(asyncio.create_task(self._open()))
+
+    async def _open(self):
+        started = time.perf_counter()
+        stack = contextlib.AsyncExitStack()
+        try:
+            session = await stack.enter_async_context(self.backend.connect(config=self.config))
+        except BaseException:
+            await stack.aclose()
+            raise
+        metrics.observe("session_connect", time.perf_counter() - started)
+        return session, stack
+
+    async def acquire(self):
+        """Returns a connected session, preferring a standby that is already open."""
+        started = time.perf_counter()
+        delay = self.reconnect_delay
+        while True:
+            self._refill(1)
+            # A finished standby is ready now; otherwise wait for the oldest attempt
+            task = next((t for t in self._warming if t.done()), self._warming[0])
+            self._warming.remove(task)
+            self._refill(self.standby_count)
+            try:
+                session, stack = await task
+            except Exception as e:
+                self.logger.warning(f"Failed to connect Live session: {e!r}. Retrying in {delay:.1f}s.")
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, self.reconnect_max_delay)
+                continue
+            self._stacks[id(session)] = stack
+            self.active = session
+            metrics.observe("session_acquire", time.perf_counter() - started)
+            return session
+
+    async def release(self, session):
+        """Closes a session that has ended or failed."""
+        stack = self._stacks.pop(id(session), None)
+        if self.active is session:
+            self.active = None
+        if stack is not None:
+            try:
+                await stack.aclose()
+            except Exception as e:
+                self.logger.exception("Error closing Live session")
+
+    async def serve(self, session_tasks, stopped=None):
+        """Runs ``session_tasks(session)`` coroutines, swapping sessions whenever one of them ends.
+
+        Returns after ``stop`` has been called, or the optional ``stopped`` event is
+        set, and the current tasks have finished. Several ``serve`` calls may share
+        one manager, each with its own ``stopped`` event.
+        """
+        delay = self.reconnect_delay
+        while True:
+            session = await self.acquire()
+            started = time.perf_counter()
+            tasks = [asyncio.create_task(coro) for coro in session_tasks(session)]
+            try:
+                await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+            finally:
+                for task in tasks:
+                    task.cancel()
+                for result in await asyncio.gather(*tasks, return_exceptions=True):
+                    if isinstance(result, Exception):
+                        self.logger.error(f"Session task failed: {result!r}")
+                await self.release(session)
+            if self._stopping or (stopped is not None and stopped.is_set()):
+                return
+            self.swaps += 1
+            lasted = time.perf_counter() - started
+            if lasted >= self.healthy_seconds:
+                delay = self.reconnect_delay
+                self.logger.info("Live session ended. Switching to a standby session...")
+            else:
+                # Ending straight away (e.g. a rejected setup) would otherwise burn through standbys in a loop
+                self.logger.warning(
+                    f"Live session ended after {lasted:.1f}s. Switching to a standby session in {delay:.1f}s."
+                )
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, self.reconnect_max_delay)
+
+    async def close(self):
+        """Closes every acquired session and every standby, then the backend."""
+        self._stopping = True
+        stacks, self._stacks = list(self._stacks.values()), {}
+        self.active = None
+        for stack in stacks:
+            try:
+                await stack.aclose()
+            except Exception as e:
+                self.logger.exception("Error closing Live session")
+        warming, self._warming = list(self._warming), collections.deque()
+        for task in warming:
+            task.cancel()
+        for result in await asyncio.gather(*warming, return_exceptions=True):
+            if isinstance(result, tuple):
+                await result[1].aclose()
+        close_backend = getattr(self.backend, "close", None)
+        if close_backend is not None:
+            close_backend()  # Backends that write files, like CaptureBackend, finish them here
@@ -0,0 +1,334 @@
+"""Binary capture of everything a Live session sends and receives.
+
+A recording is one file::
+
+    header   magic, version, wall-clock start time
+    records  per record: 16-byte header (time, length, kind, stream) + payload
+    index    one 24-byte entry per record (time, offset, length, kind, stream)
+    footer   index offset, record count, magic
+
+Payloads are stored raw (PCM, JPEG/WebP bytes, UTF-8 text). The index is written
+when the recorder is closed; if the process died first, the reader rebuilds it by
+walking the record headers. Files are read through ``mmap``: the index is a NumPy
+view of the mapped file and payloads are ``memoryview`` slices of it, so nothing
+is loaded until it is touched.
+
+    python -m src.utils.session_recording info capture.glrec
+    python -m src.utils.session_recording slice capture.glrec part.glrec --start 60 --end 120
+"""
+import argparse
+import base64
+import contextlib
+import mmap
+import struct
+import sys
+import time
+import numpy as np
+from src.config import RECORDING_BUFFER_BYTES
+
+MAGIC = b"GLREC\x00\x01\x00"
+FOOTER_MAGIC = b"GLRECIDX"
+HEADER = struct.Struct("<8sd")  # Magic (with version), wall-clock start time
+RECORD_HEADER = struct.Struct("<dIBxH")  # Seconds since start, payload length, kind, stream
+FOOTER = struct.Struct("<QQ8s")  # Index offset, record count, magic
+INDEX_DTYPE = np.dtype(
+    [("time", "<f8"), ("offset", "<u8"), ("length", "<u4"), ("kind", "u1"), ("pad", "u1"), ("stream", "<u2")]
+)
+
+MIC_AUDIO = 1  # PCM sent to the session
+FRAME = 2  # Encoded image sent to the session
+TEXT_SENT = 3  # Typed user turn
+TURN_END_SENT = 4  # end_of_turn sent after audio; no payload
+RESPONSE_AUDIO = 5
+RESPONSE_TEXT = 6
+TURN_COMPLETE = 7  # No payload
+
+KIND_NAMES = {
+    MIC_AUDIO: "mic_audio",
+    FRAME: "frame",
+    TEXT_SENT: "text_sent",
+    TURN_END_SENT: "turn_end_sent",
+    RESPONSE_AUDIO: "response_audio",
+    RESPONSE_TEXT: "response_text",
+    TURN_COMPLETE: "turn_complete",
+}
+
+
+class SessionRecorder:
+    """Appends timestamped records through a large write buffer.
+
+    The file is created on the first record. ``close`` writes the index; recording
+    may continue after it, and the next ``close`` rewrites the index.
+    """
+
+    def __init__(self, path, buffer_bytes=RECORDING_BUFFER_BYTES):
+        self.path = path
+        self.buffer_bytes = buffer_bytes
+        self.records = 0
+        self.bytes_written = 0
+        self._file = None
+        self._index = []
+        self._data_end = HEADER.size
+        self._started = time.perf_counter()
+        self._started_wall = time.time()
+        self._streams = 0
+
+    def new_stream(self):
+        """Returns an id that tags the records of one session."""
+        self._streams += 1
+        return self._streams
+
+    def record(self, kind, payload=b"", stream=0, timestamp=None):
+        if self._file is None:
+            self._open()
+        if timestamp is None:
+            timestamp = time.perf_counter() - self._started
+        length = len(payload)
+        self._file.write(RECORD_HEADER.pack(timestamp, length, kind, stream))
+        if length:
+            self._file.write(payload)
+        self._index.append((timestamp, self._data_end + RECORD_HEADER.size, length, kind, 0, stream))
+        self._data_end += RECORD_HEADER.size + length
+        self.records += 1
+        self.bytes_written += length
+
+    def record_input(self, input, end_of_turn=False, stream=0):
+        """Records one ``session.send`` call as the handlers make it."""
+        if isinstance(input, dict):
+            mime_type = input.get("mime_type", "")
+            data = input.get("data") or b""
+            if mime_type.startswith("image/"):
+                self.record(FRAME, base64.b64decode(data) if isinstance(data, str) else data, stream)
+            else:
+                self.record(MIC_AUDIO, data, stream)
+        elif isinstance(input, str):
+            self.record(TEXT_SENT, input.encode(), stream)
+            return  # A text input always ends the turn
+        if end_of_turn:
+            self.record(TURN_END_SENT, b"", stream)
+
+    def _open(self):
+        if self._index:
+            # Reopened after close: continue over the old index and footer
+            self._file = open(self.path, "r+b", buffering=self.buffer_bytes)
+            self._file.seek(self._data_end)
+            self._file.truncate()
+        else:
+            self._file = open(self.path, "wb", buffering=self.buffer_bytes)
+            self._file.write(HEADER.pack(MAGIC, self._started_wall))
+
+    def flush(self):
+        if self._file is not None:
+            self._file.flush()
+
+    def close(self):
+        """Writes the index and footer and closes the file."""
+        if self._file is None:
+            return
+        index = np.array(self._index, dtype=INDEX_DTYPE)
+        self._file.write(index.tobytes())
+        self._file.write(FOOTER.pack(self._data_end, len(index), FOOTER_MAGIC))
+        self._file.close()
+        self._file = None
+
+
+class Record:
+    __slots__ = ("time", "kind", "stream", "payload")
+
+    def __init__(self, time, kind, stream, payload):
+        self.time = time
+        self.kind = kind
+        self.stream = stream
+        self.payload = payload  # memoryview into the mapped file
+
+    @property
+    def kind_name(self):
+        return KIND_NAMES.get(self.kind, str(self.kind))
+
+
+class SessionRecording:
+    """Read-only, memory-mapped view of a recording, optionally limited to a time range."""
+
+    def __init__(self, path, _source=None, _index=None):
+        if _source is not None:
+            self.path, self.started_wall, self._mm, self._view = (
+                _source.path, _source.started_wall, _source._mm, _source._view
+            )
+            self.index = _index
+            self.complete = _source.complete
+            return
+        self.path = path
+        with open(path, "rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self._view = memoryview(self._mm)
+        magic, self.started_wall = HEADER.unpack_from(self._mm, 0)
+        if magic != MAGIC:
+            raise ValueError(f"{path} is not a session recording")
+        self.complete = False  # Whether the recorder was closed and wrote the index
+        if len(self._mm) >= HEADER.size + FOOTER.size:
+            offset, count, footer_magic = FOOTER.unpack_from(self._mm, len(self._mm) - FOOTER.size)
+            self.complete = footer_magic == FOOTER_MAGIC
+        if self.complete:
+            self.index = np.frombuffer(self._mm, dtype=INDEX_DTYPE, count=count, offset=offset)
+        else:
+            self.index = self._scan()
+
+    def _scan(self):
+        entries = []
+        position = HEADER.size
+        end = len(self._mm)
+        while position + RECORD_HEADER.size <= end:
+            timestamp, length, kind, stream = RECORD_HEADER.unpack_from(self._mm, position)
+            payload_at = position + RECORD_HEADER.size
+            if payload_at + length > end:
+                break  # Truncated final record
+            entries.append((timestamp, payload_at, length, kind, 0, stream))
+            position = payload_at + length
+        return np.array(entries, dtype=INDEX_DTYPE)
+
+    def __len__(self):
+        return len(self.index)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    @property
+    def duration(self):
+        return float(self.index["time"][-1] - self.index["time"][0]) if len(self.index) else 0.0
+
+    def between(self, start=None, end=None):
+        """Returns a view of the records with ``start <= time < end`` (seconds since start)."""
+        times = self.index["time"]
+        lo = 0 if start is None else int(np.searchsorted(times, start, side="left"))
+        hi = len(times) if end is None else int(np.searchsorted(times, end, side="left"))
+        return SessionRecording(None, _source=self, _index=self.index[lo:hi])
+
+    def records(self, kinds=None, stream=None):
+        """Yields records in time order; payloads are zero-copy slices of the file."""
+        index = self.index
+        if kinds is not None:
+            index = index[np.isin(index["kind"], list(kinds))]
+        if stream is not None:
+            index = index[index["stream"] == stream]
+        view = self._view
+        for timestamp, offset, length, kind, _, stream_id in index.tolist():
+            yield Record(timestamp, kind, stream_id, view[offset : offset + length])
+
+    def stats(self):
+        """Record count and payload bytes per kind."""
+        result = {}
+        for kind in np.unique(self.index["kind"]).tolist():
+            selected = self.index["kind"] == kind
+            result[KIND_NAMES.get(kind, str(kind))] = (
+                int(selected.sum()),
+                int(self.index["length"][selected].sum(dtype=np.uint64)),
+            )
+        return result
+
+    def response_turns(self, stream=None):
+        """Received turns as event lists ``MockLiveServer`` can replay."""
+        turns, events = [], []
+        for record in self.records((RESPONSE_AUDIO, RESPONSE_TEXT, TURN_COMPLETE), stream):
+            if record.kind == RESPONSE_AUDIO:
+                events.append({"type": "audio", "data": record.payload})
+            elif record.kind == RESPONSE_TEXT:
+                events.append({"type": "text", "text": str(record.payload, "utf-8")})
+            elif events:
+                turns.append(events)
+                events = []
+        if events:
+            turns.append(events)
+        return turns
+
+    def save(self, path):
+        """Writes this view (for example a time slice) to a new recording."""
+        recorder = SessionRecorder(path)
+        recorder._started_wall = self.started_wall
+        for record in self.records():
+            recorder.record(record.kind, record.payload, record.stream, timestamp=record.time)
+        recorder.close()
+
+    def close(self):
+        self.index = None
+        with contextlib.suppress(BufferError):
+            # Fails while payload views are still referenced; the map is then
+            # released once they are garbage collected
+            self._view.release()
+            self._mm.close()
+
+
+class CaptureSession:
+    """Wraps a Live session and records everything sent and received."""
+
+    def __init__(self, session, recorder, stream):
+        self.session = session
+        self.recorder = recorder
+        self.stream = stream
+
+    async def send(self, input=None, end_of_turn=False):
+        self.recorder.record_input(input, end_of_turn, self.stream)
+        await self.session.send(input, end_of_turn=end_of_turn)
+
+    async def receive(self):
+        async for response in self.session.receive():
+            if response.data:
+                self.recorder.record(RESPONSE_AUDIO, response.data, self.stream)
+            if response.text:
+                self.recorder.record(RESPONSE_TEXT, response.text.encode(), self.stream)
+            yield response
+        self.recorder.record(TURN_COMPLETE, b"", self.stream)
+
+
+class CaptureBackend:
+    """Records the traffic of every session opened through another backend into one file."""
+
+    def __init__(self, backend, path):
+        self.backend = backend
+        self.recorder = SessionRecorder(path)
+
+    @contextlib.asynccontextmanager
+    async def connect(self, config):
+        async with self.backend.connect(config=config) as session:
+            try:
+                yield CaptureSession(session, self.recorder, self.recorder.new_stream())
+            finally:
+                self.recorder.flush()
+
+    def close(self):
+        self.recorder.close()
+        close_backend = getattr(self.backend, "close", None)
+        if close_backend is not None:
+            close_backend()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Inspect or slice a session recording.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    info = commands.add_parser("info", help="Print duration and per-kind totals")
+    info.add_argument("path")
+    cut = commands.add_parser("slice", help="Copy a time range to a new recording")
+    cut.add_argument("path")
+    cut.add_argument("output")
+    cut.add_argument("--start", type=float, help="Seconds since the recording started")
+    cut.add_argument("--end", type=float)
+    args = parser.parse_args(argv)
+
+    with SessionRecording(args.path) as recording:
+        if args.command == "info":
+            started = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(recording.started_wall))
+            state = "" if recording.complete else " (index rebuilt; recorder was not closed)"
+            print(f"{args.path}: {len(recording)} records, {recording.duration:.1f} s, started {started}{state}")
+            for name, (count, nbytes) in recording.stats().items():
+                print(f"  {name:15} {count:8} records {nbytes / 1024:12.1f} KiB")
+        else:
+            part = recording.between(args.start, args.end)
+            part.save(args.output)
+            print(f"Wrote {len(part)} records to {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
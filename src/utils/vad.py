@@ -0,0 +1,148 @@
+import collections
+import numpy as np
+from src.config import (
+    SEND_SAMPLE_RATE,
+    VAD_FRAME_MS,
+    VAD_SPEECH_MARGIN_DB,
+    VAD_MIN_SPEECH_DBFS,
+    VAD_NOISE_ADAPT_RATE,
+    VAD_SEGMENT_MS,
+    VAD_PRE_ROLL_MS,
+    VAD_TRAILING_SILENCE_MS,
+)
+
+
+class VoiceActivityDetector:
+    """Energy-based voice activity detector with an adaptive noise floor.
+
+    A chunk of 16-bit PCM is split into short frames and the level of every frame
+    is computed in one vectorized pass. A frame is speech when it is both above an
+    absolute level and a margin above the tracked background noise.
+    """
+
+    def __init__(
+        self,
+        sample_rate=SEND_SAMPLE_RATE,
+        frame_ms=VAD_FRAME_MS,
+        speech_margin_db=VAD_SPEECH_MARGIN_DB,
+        min_speech_dbfs=VAD_MIN_SPEECH_DBFS,
+        noise_adapt_rate=VAD_NOISE_ADAPT_RATE,
+    ):
+        self.frame_length = max(1, sample_rate * frame_ms // 1000)
+        self.speech_margin_db = speech_margin_db
+        self.min_speech_dbfs = min_speech_dbfs
+        self.noise_adapt_rate = noise_adapt_rate
+        self.noise_floor_db = None
+
+    def frame_levels(self, pcm):
+        """Returns the level of every complete frame in ``pcm`` in dBFS."""
+        samples = np.frombuffer(pcm, dtype=np.int16)
+        usable = len(samples) - len(samples) % self.frame_length
+        if usable == 0:
+            samples = samples[None, :]
+        else:
+            samples = samples[:usable].reshape(-1, self.frame_length)
+        frames = samples.astype(np.float32) / 32768.0
+        rms = np.sqrt(np.mean(frames * frames, axis=1))
+        return 20.0 * np.log10(rms + 1e-9)
+
+    def is_speech(self, pcm):
+        """Classifies a chunk as speech when any of its frames is speech."""
+        levels = self.frame_levels(pcm)
+        if self.noise_floor_db is None:
+            self.noise_floor_db = float(levels.min())
+        speech = (levels > self.min_speech_dbfs) & (
+            levels > self.noise_floor_db + self.speech_margin_db
+        )
+        quiet = levels[~speech]
+        if quiet.size:
+            # Follow the background level, dropping immediately when it gets quieter
+            target = float(quiet.mean())
+            if target < self.noise_floor_db:
+                self.noise_floor_db = target
+            else:
+                self.noise_floor_db += self.noise_adapt_rate * (target - self.noise_floor_db)
+        return bool(speech.any())
+
+
+class TurnSegmenter:
+    """Turns a stream of microphone chunks into speech segments and turn boundaries.
+
+    Silence outside of speech is dropped, except for a short pre-roll that is sent
+    in front of the next utterance so its onset is not clipped. Speech is coalesced
+    into segments of about ``segment_ms``, and the turn ends once
+    ``trailing_silence_ms`` of silence has followed the last speech.
+    """
+
+    def __init__(
+        self,
+        vad=None,
+        sample_rate=SEND_SAMPLE_RATE,
+        segment_ms=VAD_SEGMENT_MS,
+        pre_roll_ms=VAD_PRE_ROLL_MS,
+        trailing_silence_ms=VAD_TRAILING_SILENCE_MS,
+    ):
+        self.vad = vad or VoiceActivityDetector(sample_rate)
+        self.bytes_per_ms = sample_rate * 2 / 1000.0
+        self.segment_bytes = int(segment_ms * self.bytes_per_ms)
+        self.pre_roll_bytes = int(pre_roll_ms * self.bytes_per_ms)
+        self.trailing_silence_bytes = int(trailing_silence_ms * self.bytes_per_ms)
+        self.in_speech = False
+        self.chunks_in = 0
+        self.chunks_dropped = 0
+        self.segments_out = 0
+        self.turns = 0
+        self.bytes_in = 0
+        self.bytes_out = 0
+        self._pre_roll = collections.deque()
+        self._pre_roll_size = 0
+        self._buffer = bytearray()
+        self._silence_run = 0
+
+    def process(self, chunk):
+        """Feeds one PCM chunk. Returns a list of ``(data, end_of_turn)`` to send."""
+        self.chunks_in += 1
+        self.bytes_in += len(chunk)
+        speech = self.vad.is_speech(chunk)
+
+        if not self.in_speech:
+            if not speech:
+                self._remember_pre_roll(chunk)
+                return []
+            self.in_speech = True
+            for held in self._pre_roll:
+                self._buffer += held
+            self._pre_roll.clear()
+            self._pre_roll_size = 0
+
+        self._buffer += chunk
+        self._silence_run = 0 if speech else self._silence_run + len(chunk)
+        if self._silence_run >= self.trailing_silence_bytes:
+            self.in_speech = False
+            self._silence_run = 0
+            self.turns += 1
+            return [self._take(end_of_turn=True)]
+        if len(self._buffer) >= self.segment_bytes:
+            return [self._take(end_of_turn=False)]
+        return []
+
+    def _remember_pre_roll(self, chunk):
+        self._pre_roll.append(chunk)
+        self._pre_roll_size += len(chunk)
+        while self._pre_roll and self._pre_roll_size - len(self._pre_roll[0]) >= self.pre_roll_bytes:
+            self._pre_roll_size -= len(self._pre_roll.popleft())
+            self.chunks_dropped += 1
+
+    def _take(self, end_of_turn):
+        data = bytes(self._buffer)
+        self._buffer.clear()
+        self.segments_out += 1
+        self.bytes_out += len(data)
+        return data, end_of_turn
+
+    def summary(self):
+        saved = 100.0 * (1 - self.bytes_out / self.bytes_in) if self.bytes_in else 0.0
+        return (
+            f"{self.chunks_in} chunks in, {self.segments_out} segments sent, "
+            f"{self.turns} turns, {saved:.0f}% of upstream audio bytes saved"
+        )